@@ -0,0 +1,66 @@
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+NORMALIZATION = os.path.join(ROOT, "preprocessing-and-normalization")
+
+# (stage, modules to import, budget in milliseconds). Every stage pulls in
+# numpy (normalization through verbalize and incremental), which accounts for
+# most of its budget.
+IMPORT_BUDGETS = [
+    ("normalization", ["preprocessor", "abbreviations", "normalizer", "batch", "streaming", "verbalize",
+                       "alignment", "incremental", "cache", "instrumentation"], 300),
+    ("tokenization", ["tokenization"], 300),
+    ("G2P", ["grapheme2phoneme"], 350),
+    ("prosody", ["prosody"], 300),
+    ("waveform", ["waveform_generation.concat_with_prosody", "waveform_generation.concatenative_approach_random"], 350),
+]
+
+# Audio libraries the waveform modules may only load when synthesizing.
+DEFERRED_MODULES = ("librosa", "scipy", "soundfile")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+for module in sys.argv[1:]:
+    __import__(module)
+elapsed = time.perf_counter() - start
+loaded = [name for name in {deferred!r} if name in sys.modules]
+sys.stderr.write(repr((elapsed, loaded)))
+"""
+
+def import_time(modules):
+    # A fresh interpreter per run, so nothing is already in sys.modules.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, NORMALIZATION]))
+    result = subprocess.run([sys.executable, "-c", PROBE.format(deferred=DEFERRED_MODULES), *modules],
+                            capture_output=True, text=True, env=env, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {modules} failed:\n{result.stderr}")
+    elapsed, loaded = ast.literal_eval(result.stderr.strip().splitlines()[-1])
+    return elapsed, loaded, result.stdout
+
+def bench_imports(repeat=5):
+    print("=== Import time per pipeline stage (fresh interpreter, median) ===")
+    failures = []
+    for stage, modules, budget in IMPORT_BUDGETS:
+        runs = [import_time(modules) for _ in range(repeat)]
+        median = statistics.median(elapsed for elapsed, _, _ in runs) * 1e3
+        _, loaded, output = runs[0]
+        status = "ok" if median <= budget else "OVER BUDGET"
+        print(f"{stage:>14}: {median:7.1f} ms (budget {budget} ms) {status}")
+        if median > budget:
+            failures.append(f"{stage} took {median:.1f} ms to import, budget is {budget} ms")
+        if output:
+            failures.append(f"{stage} printed {len(output.splitlines())} lines on import")
+        if loaded:
+            failures.append(f"{stage} loaded {', '.join(loaded)} on import")
+    assert not failures, "\n".join(failures)
+
+def main():
+    bench_imports()
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,4 @@
-from .g2p import *
\ No newline at end of file
+from .g2p import *
+from .fused import *
+from .compiled import *
+from .lexicon import *
\ No newline at end of file
@@ -0,0 +1,166 @@
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from compiled import g2p_batch, decode_phonemes
+from fused import FusedScanner
+from g2p import grapheme2phoneme, memoized_grapheme2phoneme
+from lexicon import LexiconG2P, PronunciationLexicon, compile_lexicon, read_lexicon_tsv
+from gujarati.memo import WordMemo
+from prosody.prosody import GujaratiPhonemeDictionary, extract_phonemes, process_gujarati_text, word_memo
+from tokenization.gujarati_tokenizer import AdvancedGujaratiTokenizer
+
+PROSE = (
+    "ગુજરાતી ભાષા સરળ અને મધુર છે. તમે ગુજરાતી શીખી રહ્યા છો! "
+    "સ્વપ્ન જોયું! પક્ષી ઊડ્યું? વૃક્ષ ઊગ્યું. જ્ઞાન પ્રાપ્તિ માટે શ્રદ્ધા જરૂરી છે. "
+    "કૃષ્ણ અને રાધા નૃત્ય કરે છે. વ્યાકરણ શીખવું સહેલું છે. ચિત્તલ પ્રાચી યશ ક્રીશ. "
+)
+
+def best_time(func, arg, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def chained(text, tokenizer, with_prosody):
+    # Tokenizer, then G2P on every word, then prosody's own phoneme walk.
+    results = []
+    dictionary = GujaratiPhonemeDictionary()
+    for record in tokenizer.iter_tokenize(text):
+        phonemes = [grapheme2phoneme(word) for word in record['words']]
+        if with_prosody:
+            extract_phonemes(record['sentence'], dictionary)
+        results.append((record['phonemes'], phonemes))
+    return results
+
+def bench_fused(paragraphs=(10, 100)):
+    tokenizer = AdvancedGujaratiTokenizer()
+    scanner = FusedScanner(tokenizer)
+
+    print("=== Fused tokenizer + G2P scan vs chained stages ===")
+    for count in paragraphs:
+        text = PROSE * count
+        fused = [(record['graphemes'], record['phonemes']) for record in scanner.iter_scan(text)]
+        assert fused == chained(text, tokenizer, False)
+
+        two_stages = best_time(lambda t: chained(t, tokenizer, False), text)
+        three_stages = best_time(lambda t: chained(t, tokenizer, True), text)
+        single = best_time(scanner.scan, text)
+        print(f"{len(text):>7} chars: tokenizer+G2P {two_stages * 1e3:7.1f} ms, +prosody walk {three_stages * 1e3:7.1f} ms, "
+              f"fused {single * 1e3:7.1f} ms ({two_stages / single:.1f}x / {three_stages / single:.1f}x)")
+
+def bench_batch(sizes=(1000, 10000, 100000)):
+    words = PROSE.replace(".", " ").replace("!", " ").replace("?", " ").split()
+
+    print("=== g2p_batch vs grapheme2phoneme per word ===")
+    for size in sizes:
+        batch = (words * (size // len(words) + 1))[:size]
+        assert decode_phonemes(*g2p_batch(batch)) == [grapheme2phoneme(word) for word in batch]
+
+        loop = best_time(lambda b: [grapheme2phoneme(word) for word in b], batch)
+        vectorized = best_time(g2p_batch, batch)
+        print(f"{size:>7} words: loop {loop * 1e3:8.1f} ms, batch {vectorized * 1e3:7.1f} ms ({loop / vectorized:.1f}x)")
+
+def synthetic_words(count, seed=0):
+    # Distinct consonant/matra strings, as stand-ins for a large lexicon's words.
+    rng = random.Random(seed)
+    letters = "કખગઘચછજઝટઠડઢણતથદધનપફબભમયરલવશષસહળ"
+    signs = ["", "", "ા", "િ", "ી", "ુ", "ે", "ો", "્"]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(letters) + rng.choice(signs) for _ in range(rng.randint(2, 6))))
+    return sorted(words)
+
+def bench_lexicon(sizes=(10000, 1000000), lookups=20000):
+    print("=== Memory-mapped pronunciation lexicon ===")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            words = synthetic_words(size)
+            phonemes = decode_phonemes(*g2p_batch(words))
+            tsv = os.path.join(directory, f"{size}.tsv")
+            path = os.path.join(directory, f"{size}.lex")
+            with open(tsv, "w", encoding="utf-8") as f:
+                f.writelines(f"{word}\t{' '.join(symbols)}\n" for word, symbols in zip(words, phonemes))
+
+            start = time.perf_counter()
+            compile_lexicon(tsv, path)
+            compiled = time.perf_counter() - start
+            start = time.perf_counter()
+            lexicon = PronunciationLexicon(path)
+            opened = time.perf_counter() - start
+            # What loading the TSV into a dict at startup would cost instead.
+            start = time.perf_counter()
+            table = dict(read_lexicon_tsv(tsv))
+            as_dict = time.perf_counter() - start
+
+            rng = random.Random(1)
+            hits = [rng.choice(words) for _ in range(lookups)]
+            misses = [word + "ૌ" for word in hits]
+            assert all(lexicon.lookup(word) == table[word] for word in hits[:1000])
+            assert all(lexicon.lookup(word) is None for word in misses[:1000])
+            hit = best_time(lambda batch: [lexicon.lookup(word) for word in batch], hits) / lookups
+            miss = best_time(lambda batch: [lexicon.lookup(word) for word in batch], misses) / lookups
+            g2p = LexiconG2P([lexicon])
+            fallback = best_time(lambda batch: [g2p(word) for word in batch], misses) / lookups
+            print(f"{size:>8} entries: {os.path.getsize(path) / 1e6:6.1f} MB, compile {compiled:6.2f} s, "
+                  f"open {opened * 1e3:6.2f} ms (TSV into a dict {as_dict * 1e3:7.1f} ms), hit {hit * 1e6:5.1f} us, "
+                  f"miss {miss * 1e6:5.1f} us, miss + rules {fallback * 1e6:5.1f} us")
+            lexicon.close()
+
+def zipf_paragraphs(count, vocabulary_size=20000, seed=0):
+    # Paragraphs of 5-15 word sentences whose words follow a Zipf curve:
+    # the prose's own words are the most frequent, then synthetic ones.
+    rng = random.Random(seed)
+    prose_words = list(dict.fromkeys(PROSE.replace(".", " ").replace("!", " ").replace("?", " ").split()))
+    vocabulary = prose_words + synthetic_words(vocabulary_size - len(prose_words), seed)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    paragraphs = []
+    for _ in range(count):
+        sentences = [" ".join(rng.choices(vocabulary, weights, k=rng.randint(5, 15))) + rng.choice(".?!")
+                     for _ in range(rng.randint(3, 8))]
+        paragraphs.append(" ".join(sentences))
+    return paragraphs
+
+def bench_memo(paragraphs=2000, capacities=(1000, 10000)):
+    corpus = zipf_paragraphs(paragraphs)
+    words = " ".join(corpus).replace(".", " ").replace("!", " ").replace("?", " ").split()
+
+    print(f"=== Word memo in front of G2P ({len(words)} words, {len(set(words))} distinct) ===")
+    assert [memoized_grapheme2phoneme(word) for word in words[:5000]] == [grapheme2phoneme(word) for word in words[:5000]]
+    plain = best_time(lambda batch: [grapheme2phoneme(word) for word in batch], words)
+    print(f"  no memo: {plain * 1e3:7.1f} ms")
+    for capacity in capacities:
+        memo = WordMemo(grapheme2phoneme, capacity=capacity, copy=list)
+        cached = best_time(lambda batch: [memo(word) for word in batch], words)
+        memo.reset_stats()
+        [memo(word) for word in words]
+        stats = memo.stats()
+        print(f"{capacity:>9}: {cached * 1e3:7.1f} ms ({plain / cached:.1f}x), hit rate {stats['hit_rate']:.1%}, "
+              f"{stats['evictions']} evictions")
+
+    sentences = [sentence for paragraph in corpus[:200] for sentence in re.split(r"(?<=[.?!]) ", paragraph)]
+    plain = best_time(lambda batch: [extract_phonemes(sentence, GujaratiPhonemeDictionary()) for sentence in batch],
+                      sentences)
+    cached = best_time(lambda batch: [[word_memo(word) for word in sentence.split(" ")] for sentence in batch],
+                       sentences)
+    print(f"prosody phoneme extraction over {len(sentences)} sentences: no memo {plain * 1e3:.1f} ms, "
+          f"memo {cached * 1e3:.1f} ms ({plain / cached:.1f}x)")
+    plain = best_time(lambda batch: [process_gujarati_text(sentence, memo=None) for sentence in batch], sentences)
+    cached = best_time(lambda batch: [process_gujarati_text(sentence) for sentence in batch], sentences)
+    print(f"process_gujarati_text: no memo {plain * 1e3:.1f} ms, memo {cached * 1e3:.1f} ms ({plain / cached:.1f}x), "
+          f"hit rate {word_memo.stats()['hit_rate']:.1%}")
+
+def main():
+    bench_fused()
+    bench_batch()
+    bench_lexicon()
+    bench_memo()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+from typing import Iterable, List, Tuple
+import numpy as np
+from gujarati.charclass import (CHAR_CLASSES, CONSONANT, DIGIT, IGNORE_PUNCT, INDEPENDENT_VOWEL, MATRA, NASAL,
+                                OUTPUT_PUNCT, SPACE, VIRAMA)
+from gujarati.inventory import INVENTORY, ipa_table
+
+ERROR_SYMBOL = "[Error: Invalid characters]"
+SCHWA = '/ə/'
+
+def _phoneme_symbols():
+    symbols = ['<pad>', ERROR_SYMBOL, SCHWA]
+    for entry in INVENTORY:
+        for symbol in entry.readings:
+            if symbol not in symbols:
+                symbols.append(symbol)
+    return tuple(symbols + ['/', '-'])
+
+# Output vocabulary of g2p_batch: every phoneme grapheme2phoneme can emit,
+# plus the passed-through punctuation and the error marker.
+PHONEME_SYMBOLS = _phoneme_symbols()
+PHONEME_SYMBOL_IDS = {symbol: index for index, symbol in enumerate(PHONEME_SYMBOLS)}
+_SYMBOL_ARRAY = np.array(PHONEME_SYMBOLS, dtype=object)
+
+# Character kinds, in the order grapheme2phoneme tests them; the "ધ્ધ" cluster
+# is matched on code points.
+INVALID, SILENT, PUNCT, HALANT, VOWEL, VOWEL_SIGN, NASALIZATION, CONSONANT_KIND = range(8)
+KIND_FLAGS = [
+    (SILENT, SPACE | IGNORE_PUNCT),
+    (PUNCT, OUTPUT_PUNCT),
+    (HALANT, VIRAMA),
+    (VOWEL, INDEPENDENT_VOWEL | DIGIT),
+    (VOWEL_SIGN, MATRA),
+    (NASALIZATION, NASAL),
+    (CONSONANT_KIND, CONSONANT),
+]
+# Tokens each kind emits on its own; consonants may add a schwa.
+KIND_COUNTS = np.array([0, 0, 1, 0, 1, 1, 1, 1], dtype=np.int8)
+
+# Per-code-point tables. Every classified character lies below U+3001, which
+# is unclassified itself, so larger code points are clipped onto it.
+TABLE_SIZE = 0x3002
+
+def _build_tables():
+    kinds = np.zeros(TABLE_SIZE, dtype=np.uint8)
+    symbols = np.zeros(TABLE_SIZE, dtype=np.uint16)
+    ipa = ipa_table()
+    for char, flags in CHAR_CLASSES.items():
+        code = ord(char)
+        if code >= TABLE_SIZE:
+            continue
+        for kind, kind_flags in KIND_FLAGS:
+            if flags & kind_flags:
+                kinds[code] = kind
+                break
+        mapping = ipa.get(char, char if flags & OUTPUT_PUNCT else None)
+        if mapping is not None:
+            symbols[code] = PHONEME_SYMBOL_IDS[mapping]
+    return kinds, symbols
+
+KIND_TABLE, SYMBOL_TABLE = _build_tables()
+DHA = ord('ધ')
+VIRAMA_CODE = ord('્')
+
+def _run_index(linked):
+    """For each position, how many positions before it are linked to it in a row."""
+    index = np.arange(len(linked))
+    return index - np.maximum.accumulate(np.where(linked, -1, index))
+
+def g2p_batch(words: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    grapheme2phoneme for a whole list of words at once.
+
+    Returns (ids, offsets): uint16 PHONEME_SYMBOL_IDS for all words, with
+    word i at ids[offsets[i]:offsets[i + 1]]; decode_phonemes turns them
+    back into grapheme2phoneme's lists. The words are concatenated into one
+    code point array and every rule is applied with vectorized table lookups.
+    The only state, is_new_group, matters for consonants: it is set again by
+    every other character except a virama, so along a run of adjacent
+    consonants it alternates from true, and a consonant takes a schwa
+    exactly when it is at an even place in its run and another consonant
+    follows. Overlapping "ધ્ધ" clusters are resolved the same way.
+    """
+    words = list(words)
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    bounds = np.zeros(len(words) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=bounds[1:])
+    codes = np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32)
+    size = len(codes)
+    if size == 0:
+        return np.zeros(0, dtype=np.uint16), np.zeros(len(words) + 1, dtype=np.int64)
+    clipped = np.minimum(codes, TABLE_SIZE - 1)
+    kinds = char_kinds = KIND_TABLE[clipped]
+
+    # last[i]: character i ends its word, so character i + 1 is not its neighbour.
+    last = np.zeros(size, dtype=bool)
+    last[bounds[1:][lengths > 0] - 1] = True
+    next_kinds = np.empty(size, dtype=np.uint8)
+    next_kinds[:-1] = kinds[1:]
+    next_kinds[last] = INVALID
+    counts = KIND_COUNTS[kinds]
+
+    # "ધ્ધ": candidates two apart overlap, and only every other one of a chain is read.
+    cluster = np.flatnonzero((codes[:-2] == DHA) & (codes[1:-1] == VIRAMA_CODE) & (codes[2:] == DHA)
+                             & ~last[:-2] & ~last[1:-1])
+    if len(cluster):
+        chained = np.zeros(len(cluster), dtype=bool)
+        chained[1:] = np.diff(cluster) == 2
+        cluster = cluster[_run_index(chained) % 2 == 0]
+        counts[cluster] = 2
+        counts[cluster + 1] = counts[cluster + 2] = 0
+        # Neither ધ takes part in a consonant run.
+        kinds = kinds.copy()
+        kinds[cluster] = kinds[cluster + 2] = INVALID
+
+    consonants = np.flatnonzero(kinds == CONSONANT_KIND)
+    adjacent = np.zeros(len(consonants), dtype=bool)
+    adjacent[1:] = (np.diff(consonants) == 1) & ~last[consonants[:-1]]
+    counts[consonants[(_run_index(adjacent) % 2 == 0) & (next_kinds[consonants] == CONSONANT_KIND)]] = 2
+
+    # A nasal closing the word after a matra is not pronounced separately.
+    nasals = np.flatnonzero(last & (kinds == NASALIZATION))
+    nasals = nasals[nasals > 0]
+    counts[nasals[(kinds[nasals - 1] == VOWEL_SIGN) & ~last[nasals - 1]]] = 0
+
+    # A word with any invalid character becomes the single error marker.
+    error_at = np.flatnonzero(char_kinds == INVALID)
+    if len(error_at):
+        invalid_words = np.zeros(len(words), dtype=bool)
+        invalid_words[np.searchsorted(bounds, error_at, side="right") - 1] = True
+        counts[np.repeat(invalid_words, lengths)] = 0
+        error_at = bounds[:-1][invalid_words]
+        counts[error_at] = 1
+        cluster = cluster[counts[cluster] == 2]
+
+    totals = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(counts, out=totals[1:])
+    starts = totals[:-1]
+    ids = np.empty(int(totals[-1]), dtype=np.uint16)
+    emitting = np.flatnonzero(counts)
+    ids[starts[emitting]] = SYMBOL_TABLE[clipped[emitting]]
+    ids[starts[counts == 2] + 1] = PHONEME_SYMBOL_IDS[SCHWA]
+    # Clusters and errors replace their characters' own symbols.
+    ids[starts[cluster]] = PHONEME_SYMBOL_IDS['/d̪/']
+    ids[starts[cluster] + 1] = PHONEME_SYMBOL_IDS['/d̪ʱ/']
+    ids[starts[error_at]] = PHONEME_SYMBOL_IDS[ERROR_SYMBOL]
+    return ids, totals[bounds]
+
+def decode_phonemes(ids: np.ndarray, offsets: np.ndarray) -> List[List[str]]:
+    symbols = _SYMBOL_ARRAY[np.asarray(ids, dtype=np.intp)].tolist()
+    bounds = np.asarray(offsets).tolist()
+    return [symbols[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
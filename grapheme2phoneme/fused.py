@@ -0,0 +1,164 @@
+import re
+import unicodedata
+from typing import Any, Dict, Iterator, List, Tuple
+from gujarati.charclass import (CHAR_CLASSES, CONSONANT, DIGIT, GRAPHEME, IGNORE_PUNCT, INDEPENDENT_VOWEL,
+                                MATRA, NASAL, OUTPUT_PUNCT, SPACE, VIRAMA)
+from gujarati.inventory import ipa_table
+from tokenization.gujarati_tokenizer import AdvancedGujaratiTokenizer
+
+INVALID_WORD = ["[Error: Invalid characters]"]
+SCHWA = '/ə/'
+IPA = ipa_table()
+G2P_INPUT = GRAPHEME | SPACE | OUTPUT_PUNCT | IGNORE_PUNCT
+
+class FusedScanner:
+    """
+    Tokenizer and grapheme-to-phoneme conversion in one scan of the text.
+
+    Chaining AdvancedGujaratiTokenizer and grapheme2phoneme walks every word
+    twice, classifying and allocating each time. iter_scan() finds sentence
+    and word boundaries with one regex pass and walks each word once,
+    emitting its grapheme tokens (the tokenizer's longest-match
+    combinations) and its IPA phonemes (schwa insertion, the "ધ્ધ" cluster)
+    from the same character classification.
+
+    Records are those of tokenizer.iter_tokenize with a 'graphemes' list
+    (what iter_tokenize calls 'phonemes') and a 'phonemes' list holding
+    grapheme2phoneme(word) for every word.
+    """
+    def __init__(self, tokenizer: AdvancedGujaratiTokenizer = None):
+        if tokenizer is None:
+            tokenizer = AdvancedGujaratiTokenizer()
+        self.tokenizer = tokenizer
+        delimiter = tokenizer.SENTENCE_DELIMITERS
+        if re.fullmatch(r'\[[^\]^\\]+\]', delimiter):
+            # A plain character class: words are runs outside it and whitespace.
+            self.token_pattern = re.compile(rf'({delimiter})|[^\s{delimiter[1:-1]}]+')
+        else:
+            self.token_pattern = re.compile(rf'({delimiter})|(?:(?!{delimiter})\S)+')
+        self.ignore_pattern = re.compile(tokenizer.IGNORE_CHARS)
+
+    def iter_scan(self, text: str) -> Iterator[Dict[str, Any]]:
+        ignore = self.ignore_pattern
+        sentence_start = None
+        for match in self.token_pattern.finditer(text):
+            if match.group(1) is not None:
+                if sentence_start is not None:
+                    yield self._record(text, sentence_start, sentence_end, words, spans, graphemes, phonemes)
+                    sentence_start = None
+                continue
+            start, end = match.span()
+            if sentence_start is None:
+                sentence_start = start
+                words, spans, graphemes, phonemes = [], [], [], []
+            sentence_end = end
+            word = match.group()
+            if ignore.search(word):
+                word = ignore.sub('', word)
+                if not word:
+                    continue
+                # The span leaves out ignored characters at either end of the token.
+                while ignore.match(text, start, start + 1):
+                    start += 1
+                while ignore.match(text, end - 1, end):
+                    end -= 1
+            word_graphemes, word_phonemes = self.scan_word(word)
+            words.append(word)
+            spans.append((start, end))
+            graphemes.append(word_graphemes)
+            phonemes.append(word_phonemes)
+        if sentence_start is not None:
+            yield self._record(text, sentence_start, sentence_end, words, spans, graphemes, phonemes)
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        return list(self.iter_scan(text))
+
+    def _record(self, text, start, end, words, spans, graphemes, phonemes) -> Dict[str, Any]:
+        return {
+            'sentence': text[start:end],
+            'span': (start, end),
+            'words': words,
+            'word_spans': spans,
+            'graphemes': graphemes,
+            'phonemes': phonemes,
+        }
+
+    def scan_word(self, word: str) -> Tuple[List[str], List[str]]:
+        """(tokenizer.phoneme_tokenize(word), grapheme2phoneme(word)) in one walk over word."""
+        tokenizer = self.tokenizer
+        trie = tokenizer.combination_trie
+        if trie is None:
+            trie = tokenizer.compile_combinations()
+        get = CHAR_CLASSES.get
+        ipa = IPA
+        length = len(word)
+
+        graphemes = []
+        grapheme_next = 0
+        if not unicodedata.is_normalized('NFC', word):
+            # The tokenizer works on the NFC form; G2P on the word as given.
+            graphemes = tokenizer.phoneme_tokenize(word)
+            grapheme_next = length
+        phonemes = []
+        valid = True
+        new_group = True
+        skip = 0
+        previous = 0
+        for i, ch in enumerate(word):
+            flags = get(ch, 0)
+
+            if i >= grapheme_next:
+                node = trie.get(ch)
+                grapheme_next = i + 1
+                if node is None:
+                    graphemes.append(ch)
+                else:
+                    # Longest combination starting at i, as in phoneme_tokenize.
+                    components = None
+                    j = i
+                    while node is not None:
+                        j += 1
+                        if None in node:
+                            components, grapheme_next = node[None], j
+                        node = node.get(word[j]) if j < length else None
+                    if components is None:
+                        graphemes.append(ch)
+                    else:
+                        graphemes.extend(components)
+
+            if not valid:
+                pass
+            elif not flags & G2P_INPUT:
+                valid = False
+            elif skip:
+                skip -= 1
+            elif flags & (SPACE | IGNORE_PUNCT):
+                new_group = True
+            elif flags & OUTPUT_PUNCT:
+                phonemes.append(ch)
+                new_group = True
+            elif flags & VIRAMA:
+                pass
+            elif ch == 'ધ' and i + 2 < length and word[i + 1] == '્' and word[i + 2] == 'ધ':
+                phonemes.append('/d̪/')
+                phonemes.append('/d̪ʱ/')
+                skip = 2
+                new_group = True
+            elif flags & (INDEPENDENT_VOWEL | DIGIT):
+                phonemes.append(ipa[ch])
+                new_group = True
+            elif flags & (MATRA | NASAL):
+                # A nasal closing the word after a matra is not pronounced separately.
+                if not (flags & NASAL and i == length - 1 and i >= 1 and previous & MATRA):
+                    phonemes.append(ipa[ch])
+                    new_group = True
+            elif flags & CONSONANT:
+                phonemes.append(ipa[ch])
+                if new_group and i + 1 < length and get(word[i + 1], 0) & CONSONANT:
+                    phonemes.append(SCHWA)
+                    new_group = False
+                else:
+                    new_group = True
+            previous = flags
+
+        return graphemes, phonemes if valid else list(INVALID_WORD)
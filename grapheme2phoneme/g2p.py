@@ -1,64 +1,37 @@
+from gujarati.charclass import (CHAR_CLASSES, CONSONANT, DIGIT, GRAPHEME, IGNORE_PUNCT, INDEPENDENT_VOWEL,
+                                  MATRA, NASAL, OUTPUT_PUNCT, SPACE, VIRAMA)
+from gujarati.inventory import INVENTORY, graphemes, ipa_table
+from gujarati.memo import WordMemo
+
+# Bump whenever phoneme_set or the rules in grapheme2phoneme change what a
+# word converts to; memoized results from older rules are then dropped.
+RULES_VERSION = 1
+
+# IPA of every grapheme, from the shared inventory; "ફ" has two readings and
+# grapheme2phoneme uses the first.
+phoneme_set = {entry.grapheme: list(entry.readings) if len(entry.readings) > 1 else entry.ipa for entry in INVENTORY}
+IPA = ipa_table()
+
 def get_gujarati_phoneme_set():
-    phoneme_set = {
-        'અ': '/ə/', 'આ': '/aː/', 'ઇ': '/i/', 'ઈ': '/iː/',
-        'ઉ': '/u/', 'ઊ': '/uː/', 'ઋ': '/ɾ̩/', 'ૠ': '/ɾ̩ː/',
-        'એ': '/eː/', 'ઐ': '/əi/', 'ઓ': '/oː/', 'ઔ': '/əu/',
-        'અં': '/əŋ/', 
-        
-        'ા': '/aː/', 'િ': '/i/', 'ી': '/iː/', 'ુ': '/u/', 'ૂ': '/uː/',
-        'ૃ': '/ɾ̩/', 'ૄ': '/ɾ̩ː/', 'ે': '/eː/', 'ૈ': '/əi/',
-        'ો': '/oː/', 'ૌ': '/əu/',
-        'ં': '/ŋ/', 'ઃ': '/h/', 'ઁ': '/˜/',
-        
-        'ક': '/k/', 'ગ': '/ɡ/', 'ચ': '/tʃ/', 'જ': '/dʒ/',
-        'ટ': '/ʈ/', 'ડ': '/ɖ/', 
-        'ત': '/t/',
-        'દ': '/d̪/',
-        'પ': '/p/', 'બ': '/b/',
-        'ખ': '/kʰ/', 'ઘ': '/ɡʱ/',
-        'છ': '/tʃʰ/', 'ઝ': '/dʒʱ/',
-        'ઠ': '/ʈʰ/', 'ઢ': '/ɖʱ/', 'થ': '/t̪ʰ/', 'ધ': '/d̪ʱ/',
-        'ફ': ['/f/', '/pʰ/'],
-        'ભ': '/bʱ/',
-        'મ': '/m/', 'ન': '/n/', 'ણ': '/ɳ/', 'ઙ': '/ŋ/', 'ઞ': '/ɲ/',
-        'સ': '/s/', 'શ': '/ʃ/', 'હ': '/h/', 'ષ': '/ʂ/',
-        'ય': '/j/', 'ર': '/ɾ/', 'લ': '/l/', 'વ': '/ʋ/', 'ળ': '/ɭ/',
-        
-        '્': None,
-        
-        '૦': '0', '૧': '1', '૨': '2', '૩': '3', '૪': '4',
-        '૫': '5', '૬': '6', '૭': '7', '૮': '8', '૯': '9'
-    }
-    
+    return dict(phoneme_set)
+
+def print_phoneme_set():
     print("Comprehensive Gujarati Phoneme Set:")
     for grapheme, phoneme in phoneme_set.items():
         print(f"{grapheme}: {phoneme}")
-    
-    return phoneme_set
 
-phoneme_set = get_gujarati_phoneme_set()
-
-consonants = set([
-    'ક','ગ','ચ','જ','ટ','ડ','ત','દ','પ','બ',
-    'ખ','ઘ','છ','ઝ','ઠ','ઢ','થ','ધ','ફ','ભ',
-    'મ','ન','ણ','ઙ','ઞ','સ','શ','હ','ષ','ય','ર','લ','વ','ળ'
-])
-vowel_signs = set(['ા','િ','ી','ુ','ૂ','ૃ','ૄ','ે','ૈ','ો','ૌ'])
-independent_vowels = set(['અ','આ','ઇ','ઈ','ઉ','ઊ','ઋ','ૠ','એ','ઐ','ઓ','ઔ','અં'])
+consonants = set(graphemes("consonant"))
+vowel_signs = set(graphemes("matra"))
+independent_vowels = set(graphemes("vowel"))
 virama = '્'
-nasalization = set(['ં','ઃ','ઁ'])
+nasalization = set(graphemes("modifier"))
 allowed_output_punct = set(['/','-'])
 allowed_ignore_punct = set(["?", "!", ",", ".", ";", ":"])
 
 def grapheme2phoneme(word):
-    for ch in word:
-        if ch.isspace():
-            continue
-        if ch in phoneme_set:
-            continue
-        if ch in allowed_output_punct or ch in allowed_ignore_punct:
-            continue
-        else:
+    classes = [CHAR_CLASSES.get(ch, 0) for ch in word]
+    for flags in classes:
+        if not flags & (GRAPHEME | SPACE | OUTPUT_PUNCT | IGNORE_PUNCT):
             return ["[Error: Invalid characters]"]
     
     output = []
@@ -66,23 +39,19 @@ def grapheme2phoneme(word):
     i = 0
     while i < len(word):
         ch = word[i]
-        if ch.isspace():
+        flags = classes[i]
+        if flags & (SPACE | IGNORE_PUNCT):
             i += 1
             is_new_group = True
             continue
         
-        if ch in allowed_ignore_punct:
-            i += 1
-            is_new_group = True
-            continue
-        
-        if ch in allowed_output_punct:
+        if flags & OUTPUT_PUNCT:
             output.append(ch)
             i += 1
             is_new_group = True
             continue
         
-        if ch == virama:
+        if flags & VIRAMA:
             i += 1
             continue
         
@@ -93,16 +62,14 @@ def grapheme2phoneme(word):
             is_new_group = True
             continue
 
-        mapping = phoneme_set.get(ch)
-        if isinstance(mapping, list):
-            mapping = mapping[0]
-        if ch in independent_vowels or (ch.isdigit() and mapping is not None):
+        mapping = IPA.get(ch)
+        if flags & (INDEPENDENT_VOWEL | DIGIT):
             output.append(mapping)
             i += 1
             is_new_group = True
             continue
-        if ch in vowel_signs or ch in nasalization:
-            if ch in nasalization and i == len(word)-1 and i-1 >= 0 and word[i-1] in vowel_signs:
+        if flags & (MATRA | NASAL):
+            if flags & NASAL and i == len(word)-1 and i-1 >= 0 and classes[i-1] & MATRA:
                 i += 1
                 continue
             output.append(mapping)
@@ -110,12 +77,11 @@ def grapheme2phoneme(word):
             is_new_group = True
             continue
         
-        if ch in consonants:
+        if flags & CONSONANT:
             if is_new_group:
                 output.append(mapping)
                 if i+1 < len(word):
-                    next_ch = word[i+1]
-                    if next_ch != virama and next_ch in consonants:
+                    if classes[i+1] & CONSONANT:
                         output.append('/ə/')
                         is_new_group = False
                     else:
@@ -130,3 +96,7 @@ def grapheme2phoneme(word):
         output.append(ch)
         i += 1
     return output
+
+# grapheme2phoneme behind a shared word-level LRU memo; use it where the
+# same words are converted over and over.
+memoized_grapheme2phoneme = WordMemo(grapheme2phoneme, capacity=50000, version=lambda: RULES_VERSION, copy=list)
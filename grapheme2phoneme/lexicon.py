@@ -0,0 +1,209 @@
+import argparse
+import json
+import mmap
+import struct
+import unicodedata
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+from grapheme2phoneme.g2p import grapheme2phoneme
+
+# File layout, every section starting at a multiple of 8 bytes:
+#   header            LEXICON_HEADER below
+#   vocabulary        JSON list of the phoneme symbols, UTF-8
+#   key offsets       int64[entry_count + 1], into keys
+#   keys              NFC words, UTF-8, sorted bytewise
+#   phoneme offsets   int64[entry_count + 1], into phonemes
+#   phonemes          uint16[phoneme_count], into the vocabulary
+# All numbers are little-endian.
+LEXICON_MAGIC = b"GUJLEXCN"
+LEXICON_VERSION = 1
+LEXICON_HEADER = struct.Struct("<8sIIQQQQQQQQQ")
+_OFFSET_PAIR = struct.Struct("<qq")
+
+def _align(position: int) -> int:
+    return -position % 8
+
+def _key(word: str) -> bytes:
+    return unicodedata.normalize("NFC", word).encode("utf-8")
+
+def read_lexicon_tsv(path: str) -> Iterable[Tuple[str, List[str]]]:
+    """
+    (word, phonemes) for every entry of a lexicon TSV: one word per line, a
+    tab, then its phonemes separated by spaces. Blank lines and lines
+    starting with "#" are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            word, sep, phonemes = line.partition("\t")
+            if not sep or not word or not phonemes.split():
+                raise ValueError(f"{path}:{number}: expected 'word<TAB>phonemes', got {line!r}")
+            yield word, phonemes.split()
+
+def compile_lexicon(entries: Union[str, Iterable[Tuple[str, Sequence[str]]]], path: str) -> int:
+    """
+    Write entries (a TSV path, or (word, phonemes) pairs) as a binary lexicon
+    at path. Words are keyed on their NFC form; of repeated words the first
+    entry is kept. Returns the number of entries written.
+    """
+    if isinstance(entries, str):
+        entries = read_lexicon_tsv(entries)
+    vocabulary = {}
+    table = {}
+    for word, phonemes in entries:
+        key = _key(word)
+        if key not in table:
+            table[key] = [vocabulary.setdefault(symbol, len(vocabulary)) for symbol in phonemes]
+    if len(vocabulary) > 0xFFFF:
+        raise ValueError(f"Lexicon uses {len(vocabulary)} phoneme symbols, at most {0xFFFF + 1} fit")
+    keys = sorted(table)
+
+    symbols = json.dumps(list(vocabulary), ensure_ascii=False).encode("utf-8")
+    vocabulary_start = LEXICON_HEADER.size + _align(LEXICON_HEADER.size)
+    key_offsets_start = vocabulary_start + len(symbols) + _align(vocabulary_start + len(symbols))
+    keys_start = key_offsets_start + 8 * (len(keys) + 1)
+    keys_size = sum(map(len, keys))
+    phoneme_offsets_start = keys_start + keys_size + _align(keys_start + keys_size)
+    phonemes_start = phoneme_offsets_start + 8 * (len(keys) + 1)
+
+    with open(path, "wb") as out:
+        out.write(b"\0" * vocabulary_start)
+        out.write(symbols)
+        out.write(b"\0" * (key_offsets_start - out.tell()))
+        position = 0
+        key_offsets = [0]
+        for key in keys:
+            position += len(key)
+            key_offsets.append(position)
+        out.write(struct.pack(f"<{len(key_offsets)}q", *key_offsets))
+        out.write(b"".join(keys))
+        out.write(b"\0" * (phoneme_offsets_start - out.tell()))
+        position = 0
+        phoneme_offsets = [0]
+        for key in keys:
+            position += len(table[key])
+            phoneme_offsets.append(position)
+        out.write(struct.pack(f"<{len(phoneme_offsets)}q", *phoneme_offsets))
+        for key in keys:
+            ids = table[key]
+            out.write(struct.pack(f"<{len(ids)}H", *ids))
+
+        out.seek(0)
+        out.write(LEXICON_HEADER.pack(LEXICON_MAGIC, LEXICON_VERSION, 0, len(keys), vocabulary_start, len(symbols),
+                                      key_offsets_start, keys_start, keys_size, phoneme_offsets_start,
+                                      phonemes_start, position))
+    return len(keys)
+
+class PronunciationLexicon:
+    """
+    Read-only view of a lexicon written by compile_lexicon.
+
+    The file is memory-mapped: opening it reads only the header and the
+    phoneme vocabulary, lookup() binary-searches the sorted keys in
+    O(log n) reads of the map, and processes opening the same file share it
+    through the page cache.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(LEXICON_HEADER.size)
+            if len(header) < LEXICON_HEADER.size:
+                raise ValueError(f"{path} is not a pronunciation lexicon (file too short)")
+            (magic, version, _, self.entry_count, vocabulary_start, vocabulary_size, self._key_offsets_start,
+             self._keys_start, _, self._phoneme_offsets_start, self._phonemes_start, _) = LEXICON_HEADER.unpack(header)
+            if magic != LEXICON_MAGIC:
+                raise ValueError(f"{path} is not a pronunciation lexicon")
+            if version != LEXICON_VERSION:
+                raise ValueError(f"{path} has lexicon format version {version}, expected {LEXICON_VERSION}")
+            f.seek(vocabulary_start)
+            self.vocabulary = tuple(json.loads(f.read(vocabulary_size).decode("utf-8")))
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    def _find(self, key: bytes) -> int:
+        data = self._data
+        unpack = _OFFSET_PAIR.unpack_from
+        offsets, keys = self._key_offsets_start, self._keys_start
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            start, end = unpack(data, offsets + 8 * middle)
+            probe = data[keys + start:keys + end]
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def _phonemes(self, index: int) -> List[str]:
+        start, end = _OFFSET_PAIR.unpack_from(self._data, self._phoneme_offsets_start + 8 * index)
+        ids = struct.unpack_from(f"<{end - start}H", self._data, self._phonemes_start + 2 * start)
+        vocabulary = self.vocabulary
+        return [vocabulary[i] for i in ids]
+
+    def lookup(self, word: str) -> Optional[List[str]]:
+        """The phonemes of word (compared in NFC), or None if the lexicon does not have it."""
+        index = self._find(_key(word))
+        return None if index < 0 else self._phonemes(index)
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(_key(word)) >= 0
+
+class LexiconG2P:
+    """
+    grapheme2phoneme with pronunciation lexicons in front of the rules.
+
+    lexicons are PronunciationLexicon objects or paths to compiled lexicons,
+    highest precedence first: a word gets the phonemes of the first lexicon
+    that has it, and the fallback (the rule-based grapheme2phoneme) only
+    runs when none does.
+    """
+    def __init__(self, lexicons: Iterable[Union[str, PronunciationLexicon]] = (),
+                 fallback: Callable[[str], List[str]] = grapheme2phoneme):
+        self.lexicons = [PronunciationLexicon(lexicon) if isinstance(lexicon, str) else lexicon
+                         for lexicon in lexicons]
+        self.fallback = fallback
+
+    def lookup(self, word: str) -> Optional[List[str]]:
+        key = _key(word)
+        for lexicon in self.lexicons:
+            index = lexicon._find(key)
+            if index >= 0:
+                return lexicon._phonemes(index)
+        return None
+
+    def grapheme2phoneme(self, word: str) -> List[str]:
+        phonemes = self.lookup(word)
+        return self.fallback(word) if phonemes is None else phonemes
+
+    __call__ = grapheme2phoneme
+
+    def close(self):
+        for lexicon in self.lexicons:
+            lexicon.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a word<TAB>phonemes TSV into a binary pronunciation lexicon.")
+    parser.add_argument("input", help="UTF-8 TSV file: a word, a tab, then its phonemes separated by spaces")
+    parser.add_argument("output")
+    args = parser.parse_args(argv)
+
+    count = compile_lexicon(args.input, args.output)
+    print(f"Wrote {count} entries to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,14 @@
+import os
+import sys
+import tempfile
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import g2p
+from compiled import decode_phonemes, g2p_batch
+from fused import FusedScanner
 from g2p import grapheme2phoneme
+from gujarati.memo import WordMemo
+from lexicon import LexiconG2P, compile_lexicon
 
 test_cases = [
     ("કેમ", ['/k/', '/eː/', '/m/']),
@@ -32,18 +42,109 @@ test_cases = [
     ("વિદ્યાર્થી", ['/ʋ/', '/i/', '/d̪/', '/j/', '/aː/', '/ɾ/', '/t̪ʰ/', '/iː/'])
 ]
 
-total_cases = 0
-cases_passed = 0
-for idx, (inp, expected) in enumerate(test_cases, 1):
-    output = grapheme2phoneme(inp)
-    print(f"Test Case {idx}:")
-    print("Input:    ", repr(inp))
-    print("Output:   ", output)
-    print("Expected: ", expected)
-    result = "PASS" if output == expected else "FAIL"
-    print("Result:   ", result, "\n")
-    total_cases += 1
-    if result == "PASS":
-        cases_passed += 1
-
-print(f"Passed {cases_passed}/{total_cases} cases")
+def run_tests(convert, label, cases):
+    suffix = f" ({label})" if label else ""
+    total_cases = 0
+    cases_passed = 0
+    for idx, (inp, expected) in enumerate(cases, 1):
+        output = convert(inp)
+        print(f"Test Case {idx}{suffix}:")
+        print("Input:    ", repr(inp))
+        print("Output:   ", output)
+        print("Expected: ", expected)
+        result = "PASS" if output == expected else "FAIL"
+        print("Result:   ", result, "\n")
+        total_cases += 1
+        if result == "PASS":
+            cases_passed += 1
+    print(f"Passed {cases_passed}/{total_cases} cases{suffix}")
+
+run_tests(grapheme2phoneme, None, test_cases)
+
+# The fused scanner reads every word as the tokenizer followed by
+# grapheme2phoneme would: a nasal ending a word after a matra is dropped.
+fused_cases = [
+    ("તમે શ્રદ્ધા રાખો.", [
+        (["ત", "મ", "ે"], ['/t/', '/ə/', '/m/', '/eː/']),
+        (["શ", "્", "ર", "દ", "્", "ધ", "ા"], ['/ʃ/', '/ɾ/', '/ə/', '/d̪/', '/d̪ʱ/', '/aː/']),
+        (["ર", "ા", "ખ", "ો"], ['/ɾ/', '/aː/', '/kʰ/', '/oː/']),
+    ]),
+    ("શું કરવું છે? ૦૧/૦૧", [
+        (["શ", "ુ", "ં"], ['/ʃ/', '/u/']),
+        (["ક", "ર", "વ", "ુ", "ં"], ['/k/', '/ə/', '/ɾ/', '/ʋ/', '/u/']),
+        (["છ", "ે"], ['/tʃʰ/', '/eː/']),
+        (["૦", "૧", "/", "૦", "૧"], ['0', '1', '/', '0', '1']),
+    ]),
+    ("પ્રેમ §", [
+        (["પ", "્", "ર", "ે", "મ"], ['/p/', '/ɾ/', '/eː/', '/m/']),
+        (["§"], ["[Error: Invalid characters]"]),
+    ]),
+]
+
+scanner = FusedScanner()
+run_tests(lambda inp: [pair for record in scanner.iter_scan(inp) for pair in zip(record['graphemes'], record['phonemes'])],
+          "fused", fused_cases)
+
+# g2p_batch converts every case above in one call and must agree with grapheme2phoneme.
+batch_output = decode_phonemes(*g2p_batch([inp for inp, _ in test_cases]))
+run_tests(dict(zip([inp for inp, _ in test_cases], batch_output)).get, "batch", test_cases)
+
+# Lexicons override the rules, the first lexicon listed wins, and words in
+# no lexicon fall back to grapheme2phoneme.
+with tempfile.TemporaryDirectory() as directory:
+    names = os.path.join(directory, "names.lex")
+    loanwords = os.path.join(directory, "loanwords.lex")
+    compile_lexicon([("ફળ", ['/pʰ/', '/ə/', '/ɭ/']), ("કમલ", ['/k/', '/ə/', '/m/', '/ə/', '/l/'])], names)
+    compile_lexicon([("ફળ", ['/f/', '/ə/', '/ɭ/']), ("ફોન", ['/f/', '/oː/', '/n/', '/ə/'])], loanwords)
+    lexicon_g2p = LexiconG2P([names, loanwords])
+    lexicon_cases = [
+        ("ફળ", ['/pʰ/', '/ə/', '/ɭ/']),
+        ("કમલ", ['/k/', '/ə/', '/m/', '/ə/', '/l/']),
+        ("ફોન", ['/f/', '/oː/', '/n/', '/ə/']),
+        ("બસ", ['/b/', '/ə/', '/s/']),
+        ("§", ["[Error: Invalid characters]"]),
+    ]
+    run_tests(lexicon_g2p, "lexicon", lexicon_cases)
+    lexicon_g2p.close()
+
+# The memo answers like grapheme2phoneme, keeps at most capacity words, and
+# drops everything when the rules version changes.
+memo = WordMemo(grapheme2phoneme, capacity=2, version=lambda: g2p.RULES_VERSION, copy=list)
+for word in ["કેમ", "બસ", "કેમ", "ફોન", "બસ"]:
+    memo(word)
+memo("કેમ").append("changed")
+g2p.RULES_VERSION += 1
+try:
+    after_bump = memo("કેમ")
+finally:
+    g2p.RULES_VERSION -= 1
+
+threaded = WordMemo(grapheme2phoneme, capacity=8)
+words = [inp for inp, _ in test_cases] * 50
+def convert(chunk):
+    for word in chunk:
+        threaded(word)
+threads = [threading.Thread(target=convert, args=(words[i::4],)) for i in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+threaded_stats = threaded.stats()
+
+memo_outputs = {
+    "kept words": list(memo.entries),
+    "hits and evictions": (memo.hits, memo.evictions),
+    "output after the bump": after_bump,
+    "invalidations": memo.invalidations,
+    "threaded lookups": threaded_stats["hits"] + threaded_stats["misses"],
+    "threaded entries": threaded_stats["entries"],
+}
+memo_cases = [
+    ("kept words", ["કેમ"]),
+    ("hits and evictions", (1, 3)),
+    ("output after the bump", ['/k/', '/eː/', '/m/']),
+    ("invalidations", 1),
+    ("threaded lookups", len(words)),
+    ("threaded entries", 8),
+]
+run_tests(memo_outputs.get, "memo", memo_cases)
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .charclass import *
+from .memo import *
+from .inventory import *
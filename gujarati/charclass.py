@@ -0,0 +1,92 @@
+import re
+from gujarati.inventory import graphemes
+
+__all__ = [
+    "CONSONANT", "MATRA", "INDEPENDENT_VOWEL", "VIRAMA", "NASAL", "DIGIT", "OUTPUT_PUNCT", "IGNORE_PUNCT", "SPACE",
+    "LATIN", "GUJARATI", "ALLOWED", "GRAPHEME",
+    "CONSONANTS", "MATRAS", "INDEPENDENT_VOWELS", "VIRAMA_SIGN", "NASALS", "GUJARATI_DIGITS", "OUTPUT_PUNCTUATION",
+    "IGNORE_PUNCTUATION", "ALLOWED_SYMBOLS",
+    "CHAR_CLASSES", "char_class", "characters_with", "class_pattern",
+]
+
+# Character classes, as bit flags. One character can carry several
+# (e.g. "૧" is GUJARATI | DIGIT | ALLOWED).
+CONSONANT = 1
+MATRA = 2
+INDEPENDENT_VOWEL = 4
+VIRAMA = 8
+NASAL = 16              # anusvara, visarga and candrabindu
+DIGIT = 32              # Gujarati digits ૦-૯
+OUTPUT_PUNCT = 64       # punctuation G2P passes through
+IGNORE_PUNCT = 128      # punctuation G2P drops (it ends a group)
+SPACE = 256             # everything str.isspace() accepts
+LATIN = 512             # A-Z, a-z
+GUJARATI = 1024         # anything in the Gujarati block U+0A80-U+0AFF
+ALLOWED = 2048          # accepted by text validation before normalization
+
+# Characters that have a phoneme of their own in grapheme-to-phoneme.
+GRAPHEME = CONSONANT | MATRA | INDEPENDENT_VOWEL | VIRAMA | NASAL | DIGIT
+
+def _letters(kind):
+    # The single-character graphemes of one inventory kind, in code point order.
+    return "".join(sorted(grapheme for grapheme in graphemes(kind) if len(grapheme) == 1))
+
+CONSONANTS = _letters("consonant")
+MATRAS = _letters("matra")
+INDEPENDENT_VOWELS = _letters("vowel")
+VIRAMA_SIGN = _letters("virama")
+NASALS = _letters("modifier")
+GUJARATI_DIGITS = _letters("digit")
+OUTPUT_PUNCTUATION = "/-"
+IGNORE_PUNCTUATION = "?!,.;:"
+# Besides Gujarati, Latin letters, digits and whitespace.
+ALLOWED_SYMBOLS = "0123456789.,!?%₹:/-+×÷“”\"'₩©®™"
+
+def _build_table():
+    table = {}
+
+    def mark(chars, flags):
+        for char in chars:
+            table[char] = table.get(char, 0) | flags
+
+    mark(map(chr, range(0x0A80, 0x0B00)), GUJARATI | ALLOWED)
+    mark(map(chr, range(ord("A"), ord("Z") + 1)), LATIN | ALLOWED)
+    mark(map(chr, range(ord("a"), ord("z") + 1)), LATIN | ALLOWED)
+    # U+3000 is the last whitespace character.
+    mark((chr(code) for code in range(0x3001) if chr(code).isspace()), SPACE | ALLOWED)
+    mark(ALLOWED_SYMBOLS, ALLOWED)
+    mark(CONSONANTS, CONSONANT)
+    mark(MATRAS, MATRA)
+    mark(INDEPENDENT_VOWELS, INDEPENDENT_VOWEL)
+    mark(VIRAMA_SIGN, VIRAMA)
+    mark(NASALS, NASAL)
+    mark(GUJARATI_DIGITS, DIGIT)
+    mark(OUTPUT_PUNCTUATION, OUTPUT_PUNCT)
+    mark(IGNORE_PUNCTUATION, IGNORE_PUNCT)
+    return table
+
+# Flags of every classified character; CHAR_CLASSES.get(char, 0) is the
+# class of any character.
+CHAR_CLASSES = _build_table()
+
+def char_class(char):
+    return CHAR_CLASSES.get(char, 0)
+
+def characters_with(flags):
+    """Every classified character carrying any of flags, in code point order."""
+    return "".join(sorted(char for char, char_flags in CHAR_CLASSES.items() if char_flags & flags))
+
+def class_pattern(flags):
+    """A regex character class ("[...]") matching the characters carrying any of flags."""
+    codes = [ord(char) for char in characters_with(flags)]
+    ranges = []
+    start = previous = None
+    for code in codes + [None]:
+        if previous is not None and code == previous + 1:
+            previous = code
+            continue
+        if start is not None:
+            ranges.append(re.escape(chr(start)) if start == previous
+                          else re.escape(chr(start)) + "-" + re.escape(chr(previous)))
+        start = previous = code
+    return "[" + "".join(ranges) + "]"
@@ -0,0 +1,86 @@
+import itertools
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Tuple
+
+__all__ = [
+    "Grapheme", "KINDS", "PAD_ID", "UNKNOWN_ID", "TOKEN_VOCABULARY", "TOKEN_IDS", "INVENTORY", "BY_GRAPHEME",
+    "graphemes", "ipa_table",
+]
+
+class Grapheme(NamedTuple):
+    id: int
+    grapheme: str
+    ipa: Optional[str]              # the reading every stage uses; None for the virama
+    readings: Tuple[str, ...]       # every reading, ipa first
+    kind: str                       # one of KINDS
+
+KINDS = ("vowel", "matra", "consonant", "modifier", "virama", "digit")
+
+# Every grapheme with a phoneme, defined once: (grapheme, readings, kind).
+_GRAPHEMES = (
+    ('અ', ('/ə/',), "vowel"), ('આ', ('/aː/',), "vowel"), ('ઇ', ('/i/',), "vowel"), ('ઈ', ('/iː/',), "vowel"),
+    ('ઉ', ('/u/',), "vowel"), ('ઊ', ('/uː/',), "vowel"), ('ઋ', ('/ɾ̩/',), "vowel"), ('ૠ', ('/ɾ̩ː/',), "vowel"),
+    ('એ', ('/eː/',), "vowel"), ('ઐ', ('/əi/',), "vowel"), ('ઓ', ('/oː/',), "vowel"), ('ઔ', ('/əu/',), "vowel"),
+    ('અં', ('/əŋ/',), "vowel"),
+
+    ('ા', ('/aː/',), "matra"), ('િ', ('/i/',), "matra"), ('ી', ('/iː/',), "matra"), ('ુ', ('/u/',), "matra"),
+    ('ૂ', ('/uː/',), "matra"), ('ૃ', ('/ɾ̩/',), "matra"), ('ૄ', ('/ɾ̩ː/',), "matra"), ('ે', ('/eː/',), "matra"),
+    ('ૈ', ('/əi/',), "matra"), ('ો', ('/oː/',), "matra"), ('ૌ', ('/əu/',), "matra"),
+
+    ('ં', ('/ŋ/',), "modifier"), ('ઃ', ('/h/',), "modifier"), ('ઁ', ('/˜/',), "modifier"),
+    ('્', (), "virama"),
+
+    ('ક', ('/k/',), "consonant"), ('ખ', ('/kʰ/',), "consonant"), ('ગ', ('/ɡ/',), "consonant"),
+    ('ઘ', ('/ɡʱ/',), "consonant"), ('ઙ', ('/ŋ/',), "consonant"), ('ચ', ('/tʃ/',), "consonant"),
+    ('છ', ('/tʃʰ/',), "consonant"), ('જ', ('/dʒ/',), "consonant"), ('ઝ', ('/dʒʱ/',), "consonant"),
+    ('ઞ', ('/ɲ/',), "consonant"), ('ટ', ('/ʈ/',), "consonant"), ('ઠ', ('/ʈʰ/',), "consonant"),
+    ('ડ', ('/ɖ/',), "consonant"), ('ઢ', ('/ɖʱ/',), "consonant"), ('ણ', ('/ɳ/',), "consonant"),
+    ('ત', ('/t/',), "consonant"), ('થ', ('/t̪ʰ/',), "consonant"), ('દ', ('/d̪/',), "consonant"),
+    ('ધ', ('/d̪ʱ/',), "consonant"), ('ન', ('/n/',), "consonant"), ('પ', ('/p/',), "consonant"),
+    ('ફ', ('/f/', '/pʰ/'), "consonant"), ('બ', ('/b/',), "consonant"), ('ભ', ('/bʱ/',), "consonant"),
+    ('મ', ('/m/',), "consonant"), ('ય', ('/j/',), "consonant"), ('ર', ('/ɾ/',), "consonant"),
+    ('લ', ('/l/',), "consonant"), ('ળ', ('/ɭ/',), "consonant"), ('વ', ('/ʋ/',), "consonant"),
+    ('શ', ('/ʃ/',), "consonant"), ('ષ', ('/ʂ/',), "consonant"), ('સ', ('/s/',), "consonant"),
+    ('હ', ('/h/',), "consonant"),
+
+    ('૦', ('0',), "digit"), ('૧', ('1',), "digit"), ('૨', ('2',), "digit"), ('૩', ('3',), "digit"),
+    ('૪', ('4',), "digit"), ('૫', ('5',), "digit"), ('૬', ('6',), "digit"), ('૭', ('7',), "digit"),
+    ('૮', ('8',), "digit"), ('૯', ('9',), "digit"),
+)
+
+# Token IDs, shared by every stage. IDs never change: new entries may only be
+# appended. The tokenizer's original signs, vowels, matras and consonants
+# took the first IDs; the rest of the Gujarati block and printable ASCII
+# follow, so any token of normalized text has an ID, and graphemes of more
+# than one character come last. Anything else encodes as UNKNOWN_ID.
+PAD_ID = 0
+UNKNOWN_ID = 1
+_FIRST_TOKENS = ("ઁ", "ં", "ઃ", "્",
+                 "અ", "આ", "ઇ", "ઈ", "ઉ", "ઊ", "ઋ", "એ", "ઐ", "ઓ", "ઔ",
+                 "ા", "િ", "ી", "ુ", "ૂ", "ૃ", "ે", "ૈ", "ો", "ૌ",
+                 "ક", "ખ", "ગ", "ઘ", "ચ", "છ", "જ", "ઝ", "ટ", "ઠ", "ડ", "ઢ", "ણ", "ત", "થ", "દ", "ધ",
+                 "ન", "પ", "ફ", "બ", "ભ", "મ", "ય", "ર", "લ", "વ", "શ", "ષ", "સ", "હ", "ળ", "ઞ")
+
+def _token_vocabulary():
+    tokens = ["<pad>", "<unk>"] + list(_FIRST_TOKENS)
+    for token in itertools.chain(map(chr, range(0x0A80, 0x0B00)), map(chr, range(0x20, 0x7F)),
+                                 (grapheme for grapheme, _, _ in _GRAPHEMES)):
+        if token not in tokens:
+            tokens.append(token)
+    return tuple(tokens)
+
+TOKEN_VOCABULARY = _token_vocabulary()
+TOKEN_IDS = MappingProxyType({token: index for index, token in enumerate(TOKEN_VOCABULARY)})
+
+# The graphemes, in ID order, and by grapheme.
+INVENTORY = tuple(sorted((Grapheme(TOKEN_IDS[grapheme], grapheme, readings[0] if readings else None, readings, kind)
+                          for grapheme, readings, kind in _GRAPHEMES), key=lambda entry: entry.id))
+BY_GRAPHEME = MappingProxyType({entry.grapheme: entry for entry in INVENTORY})
+
+def graphemes(*kinds):
+    """The graphemes of the given kinds (all if none), in ID order."""
+    return tuple(entry.grapheme for entry in INVENTORY if not kinds or entry.kind in kinds)
+
+def ipa_table(*kinds):
+    """A read-only grapheme -> ipa mapping for the given kinds (all if none), in ID order."""
+    return MappingProxyType({entry.grapheme: entry.ipa for entry in INVENTORY if not kinds or entry.kind in kinds})
@@ -0,0 +1,79 @@
+import threading
+import unicodedata
+from collections import OrderedDict
+
+__all__ = ["WordMemo"]
+
+class WordMemo:
+    """
+    Bounded, thread-safe LRU memo of a per-word function.
+
+    Words are keyed, and converted, in NFC. Up to capacity results are kept,
+    the least recently used going first. version is called on every lookup
+    and returns the stamp of the rules behind func; when it changes, every
+    entry is dropped, so bumping a rules version never serves stale output.
+    Results are passed through copy (if given) on the way out, so callers
+    may modify what they get.
+
+    Hits, misses and evictions are counted; stats() reports them.
+    """
+    def __init__(self, func, capacity=10000, version=None, copy=None):
+        self.func = func
+        self.capacity = capacity
+        self.version = version
+        self.copy = copy
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stamp = version() if version is not None else None
+
+    def __call__(self, word):
+        key = unicodedata.normalize('NFC', word)
+        with self.lock:
+            if self.version is not None:
+                stamp = self.version()
+                if stamp != self.stamp:
+                    self.entries.clear()
+                    self.stamp = stamp
+                    self.invalidations += 1
+            stamp = self.stamp
+            result = self.entries.get(key, self)
+            if result is not self:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if result is self:
+            # Computed outside the lock; two threads missing the same word both compute it.
+            result = self.func(key)
+            with self.lock:
+                if stamp == self.stamp and key not in self.entries:
+                    self.entries[key] = result
+                    if len(self.entries) > self.capacity:
+                        self.entries.popitem(last=False)
+                        self.evictions += 1
+        return result if self.copy is None else self.copy(result)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "capacity": self.capacity,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -1,2 +1,10 @@
 from .preprocessor import *
-from .normalizer import *
\ No newline at end of file
+from .abbreviations import *
+from .normalizer import *
+from .batch import *
+from .streaming import *
+from .verbalize import *
+from .alignment import *
+from .incremental import *
+from .cache import *
+from .instrumentation import *
\ No newline at end of file
@@ -0,0 +1,94 @@
+import re
+import unicodedata
+
+class AbbreviationExpander:
+    """
+    Expand abbreviations in a single left-to-right pass.
+
+    The entries are stored in a character trie that is compiled into one
+    regular expression, so the cost of a scan grows with the text length and
+    the longest abbreviation rather than with the number of entries. At every
+    position the longest entry wins, e.g. "કિ.ગ્રા." is expanded as a whole
+    instead of its suffix "ગ્રા.".
+    """
+    def __init__(self, entries=None):
+        self.entries = {}
+        self.pattern = None
+        # Bumped on every change so caches of expanded text can tell they are stale.
+        self.version = 0
+        self.longest = 0
+        if entries is not None:
+            self.update(entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, abbreviation):
+        return unicodedata.normalize('NFC', abbreviation) in self.entries
+
+    def add(self, abbreviation, expansion):
+        abbreviation = unicodedata.normalize('NFC', abbreviation)
+        if not abbreviation:
+            raise ValueError("Abbreviation must not be empty")
+        self.entries[abbreviation] = expansion
+        self.longest = max(self.longest, len(abbreviation))
+        self.pattern = None
+        self.version += 1
+
+    def update(self, entries):
+        if hasattr(entries, "items"):
+            entries = entries.items()
+        for abbreviation, expansion in entries:
+            self.add(abbreviation, expansion)
+
+    def load_tsv(self, path, encoding="utf-8"):
+        """Load `abbreviation<TAB>expansion` lines; blank lines and # comments are skipped."""
+        count = 0
+        with open(path, encoding=encoding) as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.rstrip("\r\n")
+                if not line.strip() or line.startswith("#"):
+                    continue
+                if "\t" not in line:
+                    raise ValueError(f"{path}:{line_number}: expected 'abbreviation<TAB>expansion'")
+                abbreviation, expansion = line.split("\t", 1)
+                self.add(abbreviation, expansion)
+                count += 1
+        return count
+
+    @classmethod
+    def from_tsv(cls, *paths, entries=None):
+        expander = cls(entries)
+        for path in paths:
+            expander.load_tsv(path)
+        return expander
+
+    def compile(self):
+        trie = {}
+        for abbreviation in self.entries:
+            node = trie
+            for ch in abbreviation:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        # An empty lexicon compiles to a pattern that never matches.
+        self.pattern = re.compile(self._trie_to_regex(trie) or r'(?!)')
+        return self.pattern
+
+    def _trie_to_regex(self, node):
+        branches = [re.escape(ch) + self._trie_to_regex(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional tail: prefer the longer entry, fall back to this one.
+            return "(?:" + body + ")?"
+        return body
+
+    def _replace(self, match):
+        return self.entries[match.group()]
+
+    def expand(self, text):
+        pattern = self.pattern
+        if pattern is None:
+            pattern = self.compile()
+        return pattern.sub(self._replace, text)
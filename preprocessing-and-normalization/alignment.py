@@ -0,0 +1,147 @@
+import bisect
+import unicodedata
+
+class AlignedText:
+    """
+    Text being rewritten step by step, together with the source span behind
+    every character.
+
+    The text is kept as a list of (source_start, source_end, text, copied)
+    pieces. Copied pieces are unchanged slices of the source, so they map
+    character for character; every replacement becomes one piece that maps
+    as a whole to the source span of what it replaced.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.pieces = [(0, len(text), text, True)] if text else []
+
+    def _bounds(self):
+        bounds = [0]
+        for piece in self.pieces:
+            bounds.append(bounds[-1] + len(piece[2]))
+        return bounds
+
+    def _slice(self, bounds, start, end, out):
+        k = bisect.bisect_right(bounds, start) - 1
+        while start < end:
+            piece_start = bounds[k]
+            source_start, source_end, text, copied = self.pieces[k]
+            stop = min(end, bounds[k + 1])
+            if copied:
+                offset = source_start - piece_start
+                self._append(out, (start + offset, stop + offset, text[start - piece_start:stop - piece_start], True))
+            else:
+                self._append(out, (source_start, source_end, text[start - piece_start:stop - piece_start], False))
+            start = stop
+            k += 1
+
+    def _append(self, out, piece):
+        # Merge adjacent copies of contiguous source text to keep the list short.
+        if out and piece[3] and out[-1][3] and out[-1][1] == piece[0]:
+            previous = out[-1]
+            out[-1] = (previous[0], piece[1], previous[2] + piece[2], True)
+        else:
+            out.append(piece)
+
+    def _source_span(self, bounds, start, end):
+        if not self.pieces:
+            return 0, 0
+        k = bisect.bisect_right(bounds, start) - 1
+        if k >= len(self.pieces):
+            end_of_source = self.pieces[-1][1]
+            return end_of_source, end_of_source
+        source_start = self.pieces[k][0]
+        if self.pieces[k][3]:
+            source_start += start - bounds[k]
+        if start == end:
+            return source_start, source_start
+        k = bisect.bisect_left(bounds, end) - 1
+        source_end = self.pieces[k][1]
+        if self.pieces[k][3]:
+            source_end -= bounds[k + 1] - end
+        return source_start, source_end
+
+    def replace(self, edits):
+        """Apply sorted, non-overlapping (start, end, replacement) edits given in current-text offsets."""
+        bounds = self._bounds()
+        pieces = []
+        position = 0
+        for start, end, replacement in edits:
+            self._slice(bounds, position, start, pieces)
+            if replacement:
+                source_start, source_end = self._source_span(bounds, start, end)
+                pieces.append((source_start, source_end, replacement, False))
+            position = end
+        self._slice(bounds, position, bounds[-1], pieces)
+        self.pieces = pieces
+        self.text = "".join(piece[2] for piece in pieces)
+
+    def sub(self, pattern, repl):
+        """Same result as pattern.sub(repl, text), keeping the alignment."""
+        edits = []
+        literal = not callable(repl) and "\\" not in repl
+        for match in pattern.finditer(self.text):
+            if literal:
+                replacement = repl
+            elif callable(repl):
+                replacement = repl(match)
+            else:
+                replacement = match.expand(repl)
+            if replacement != match.group():
+                edits.append((match.start(), match.end(), replacement))
+        if edits:
+            self.replace(edits)
+
+    def normalize_unicode(self, form="NFC"):
+        """Same result as unicodedata.normalize(form, text), one combining sequence at a time."""
+        text = self.text
+        if unicodedata.is_normalized(form, text):
+            return
+        expected = unicodedata.normalize(form, text)
+        edits = []
+        start = 0
+        for end in range(1, len(text) + 1):
+            if end == len(text) or unicodedata.combining(text[end]) == 0:
+                normalized = unicodedata.normalize(form, text[start:end])
+                if normalized != text[start:end]:
+                    edits.append((start, end, normalized))
+                start = end
+        self.replace(edits)
+        if self.text != expected:
+            # A composition across sequences (rare outside Hangul); map it as one piece.
+            self.pieces = [(0, len(text), expected, False)] if expected else []
+            self.text = expected
+
+    def alignment(self):
+        """(source_start, source_end, output_start, output_end) spans covering the text in order."""
+        spans = []
+        position = 0
+        for source_start, source_end, text, _ in self.pieces:
+            spans.append((source_start, source_end, position, position + len(text)))
+            position += len(text)
+        return spans
+
+def source_span(alignment, start, end, source=None, output=None):
+    """
+    Map the output span [start, end) back to the source span it came from.
+
+    The result is the union of the source spans of the alignment spans it
+    overlaps, or None if it overlaps none. When source and output are given,
+    spans that are verbatim copies are mapped character for character.
+    """
+    source_start = source_end = None
+    for span_source_start, span_source_end, output_start, output_end in alignment:
+        if output_end <= start:
+            continue
+        if output_start >= end:
+            break
+        first, last = span_source_start, span_source_end
+        if (source is not None and output is not None
+                and source[span_source_start:span_source_end] == output[output_start:output_end]):
+            first += max(start - output_start, 0)
+            last -= max(output_end - end, 0)
+        source_start = first if source_start is None else min(source_start, first)
+        source_end = last if source_end is None else max(source_end, last)
+    if source_start is None:
+        return None
+    return source_start, source_end
@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from normalizer import GujaratiNormalizer, is_normalization_error
+
+# One normalizer per worker process, built once by the pool initializer.
+_worker_normalizer = None
+
+def _init_worker(normalizer_options):
+    global _worker_normalizer
+    _worker_normalizer = GujaratiNormalizer(**normalizer_options)
+
+def _normalize_item(normalizer, text):
+    try:
+        output = normalizer.normalize(text)
+    except Exception as e:
+        return {"output": None, "error": f"{type(e).__name__}: {e}"}
+    if is_normalization_error(output):
+        return {"output": None, "error": output}
+    return {"output": output, "error": None}
+
+def _normalize_chunk(texts):
+    return [_normalize_item(_worker_normalizer, text) for text in texts]
+
+def normalize_batch(texts, workers=None, chunksize=None, **normalizer_options):
+    """
+    Normalize many texts on a process pool.
+
+    Returns one {"output": ..., "error": ...} dict per input, in input order.
+    A text that fails (e.g. "[Error: Invalid characters]" or an exception in a
+    handler) gets output None and the error message; the rest of the batch is
+    unaffected. Work is sent to the workers in chunks of `chunksize` texts to
+    keep the inter-process overhead low. Extra keyword arguments are passed to
+    GujaratiNormalizer in every worker.
+    """
+    texts = list(texts)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, -(-len(texts) // (workers * 4)))
+
+    if workers <= 1 or len(texts) <= chunksize:
+        normalizer = GujaratiNormalizer(**normalizer_options)
+        return [_normalize_item(normalizer, text) for text in texts]
+
+    chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(normalizer_options,)) as executor:
+        for chunk_results in executor.map(_normalize_chunk, chunks):
+            results.extend(chunk_results)
+    return results
@@ -0,0 +1,328 @@
+import os
+import numpy as np
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from abbreviations import AbbreviationExpander
+from batch import normalize_batch
+from cache import CachedNormalizer
+from incremental import IncrementalNormalizer
+from instrumentation import NormalizationStats
+from normalizer import GujaratiNormalizer
+from preprocessor import GujaratiTextPreprocessor
+from streaming import iter_normalize, segment_spans
+from test import test_cases
+from verbalize import verbalize_numbers
+
+PROSE = (
+    "ગુજરાતી ભાષા સરળ અને મધુર છે. તમે ગુજરાતી શીખી રહ્યા છો! "
+    "આજે હવામાન સારું છે, ચાલો ફરવા જઈએ. જ્ઞાન પ્રાપ્તિ માટે શ્રદ્ધા જરૂરી છે. "
+    "કૃષ્ણ અને રાધા નૃત્ય કરે છે. વ્યાકરણ શીખવું સહેલું છે. "
+)
+
+def time_per_call(func, texts, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(texts))
+
+def bench_reused_normalizer(repeat=20):
+    texts = [inp for inp, _ in test_cases]
+    normalizer = GujaratiNormalizer()
+
+    for text in texts:
+        assert normalizer.normalize(text) == GujaratiNormalizer().normalize(text)
+
+    per_call_setup = time_per_call(lambda text: GujaratiNormalizer().normalize(text), texts, repeat)
+    reused = time_per_call(normalizer.normalize, texts, repeat)
+
+    print("=== Reused GujaratiNormalizer vs per-call setup ===")
+    print(f"Strings:               {len(texts)} (from test.py), {repeat} rounds")
+    print(f"Per-call setup:        {per_call_setup * 1e6:8.1f} us/call")
+    print(f"Reused instance:       {reused * 1e6:8.1f} us/call")
+    print(f"Speedup:               {per_call_setup / reused:8.2f}x")
+
+def sample_document(paragraphs):
+    # Test-case strings interleaved with ordinary prose, as in a long article.
+    paragraph = " ".join(
+        inp + " " + PROSE for inp, expected in test_cases
+        if inp.strip() and not expected.startswith("[Error")
+    )
+    return " ".join([paragraph] * paragraphs)
+
+def best_time(func, arg, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_single_pass(sizes=(1, 10, 100)):
+    sequential = GujaratiNormalizer()
+    single_pass = GujaratiNormalizer(single_pass=True)
+
+    print("\n=== Sequential stages vs single-pass scan ===")
+    print(f"{'chars':>10} | {'sequential ns/char':>18} | {'single-pass ns/char':>19} | {'speedup':>7}")
+    for paragraphs in sizes:
+        document = sample_document(paragraphs)
+        timings = [best_time(normalizer.normalize, document) / len(document) for normalizer in (sequential, single_pass)]
+        print(f"{len(document):>10} | {timings[0] * 1e9:>18.0f} | {timings[1] * 1e9:>19.0f} | {timings[0] / timings[1]:>6.2f}x")
+
+def synthetic_lexicon(size, seed=0):
+    letters = [chr(cp) for cp in range(0x0A95, 0x0AB9)] + ['ા', 'િ', 'ી', 'ુ', 'ો']
+    rng = random.Random(seed)
+    lexicon = dict(GujaratiTextPreprocessor.abbrev_dict)
+    while len(lexicon) < size:
+        parts = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(1, 3))]
+        lexicon[".".join(parts) + "."] = " ".join(parts)
+    return lexicon
+
+def expand_per_entry(lexicon, text):
+    for abbr, full in lexicon.items():
+        text = re.sub(re.escape(abbr), full, text)
+    return text
+
+def bench_abbreviations(sizes=(10000, 100000)):
+    text = sample_document(1)[:2000]
+
+    print("\n=== Abbreviation expansion: per-entry re.sub loop vs trie pattern ===")
+    print(f"Text: {len(text)} chars")
+    print(f"{'entries':>8} | {'build s':>7} | {'loop ms/text':>12} | {'trie ms/text':>12} | {'speedup':>8}")
+    for size in sizes:
+        lexicon = synthetic_lexicon(size)
+        start = time.perf_counter()
+        expander = AbbreviationExpander(lexicon)
+        expander.compile()
+        build = time.perf_counter() - start
+
+        loop = best_time(lambda t: expand_per_entry(lexicon, t), text, repeat=1)
+        trie = best_time(expander.expand, text, repeat=5)
+        print(f"{size:>8} | {build:>7.2f} | {loop * 1e3:>12.1f} | {trie * 1e3:>12.3f} | {loop / trie:>7.0f}x")
+
+def bench_batch(workers_list=(1, 2, 4, 8), items=20000):
+    texts = [inp + " " + PROSE for inp, _ in test_cases]
+    corpus = [texts[i % len(texts)] for i in range(items)]
+
+    print("\n=== normalize_batch scaling ===")
+    print(f"Items: {items}, CPUs available: {os.cpu_count()}")
+    print(f"{'workers':>7} | {'seconds':>7} | {'items/s':>9} | {'speedup':>7}")
+    baseline = None
+    for workers in workers_list:
+        start = time.perf_counter()
+        results = normalize_batch(corpus, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert len(results) == len(corpus)
+        baseline = baseline or elapsed
+        print(f"{workers:>7} | {elapsed:>7.2f} | {items / elapsed:>9.0f} | {baseline / elapsed:>6.2f}x")
+
+def bench_streaming(paragraph_counts=(10, 100)):
+    paragraph = sample_document(1) + "\n"
+
+    print("\n=== iter_normalize peak memory ===")
+    print(f"{'input chars':>12} | {'segments':>8} | {'seconds':>7} | {'peak KiB':>8}")
+    for count in paragraph_counts:
+        start = time.perf_counter()
+        segments = sum(1 for _ in iter_normalize(paragraph for _ in range(count)))
+        elapsed = time.perf_counter() - start
+
+        # Measured in a second run: tracemalloc itself slows the scan down considerably.
+        tracemalloc.start()
+        for _ in iter_normalize(paragraph for _ in range(count)):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{len(paragraph) * count:>12} | {segments:>8} | {elapsed:>7.2f} | {peak / 1024:>8.0f}")
+
+class UncachedPreprocessor(GujaratiTextPreprocessor):
+    def number_to_words_indian(self, n):
+        return self.compose_number_words(n)
+
+def numeric_corpus(sentences, seed=0):
+    # Financial/statistical text: a limited pool of recurring amounts, rates and dates.
+    rng = random.Random(seed)
+    digits = str.maketrans("0123456789", "૦૧૨૩૪૫૬૭૮૯")
+    amounts = [rng.choice([rng.randrange(100, 100000), rng.randrange(100000, 10 ** 9)]) for _ in range(300)]
+    templates = [
+        "કુલ આવક ₹{amount} થઈ, જે ગયા વર્ષ કરતાં {rate}.{fraction}% વધુ છે.",
+        "તા.{day}/{month}/૨૦૨૪ સુધીમાં {count} અરજીઓ મળી.",
+        "વસ્તી {count} અને સાક્ષરતા દર {rate}% છે.",
+        "ખર્ચ ₹{amount}.{fraction} અને બચત ₹{small} નોંધાઈ.",
+    ]
+    corpus = []
+    for _ in range(sentences):
+        corpus.append(rng.choice(templates).format(
+            amount=f"{rng.choice(amounts):,}", small=rng.randrange(1, 5000), count=rng.choice(amounts),
+            rate=rng.randrange(1, 100), fraction=rng.randrange(1, 99),
+            day=rng.randrange(1, 29), month=rng.randrange(1, 13)).translate(digits))
+    return corpus
+
+def bench_number_table(sentences=5000):
+    corpus = numeric_corpus(sentences)
+    cached = GujaratiNormalizer()
+    uncached = GujaratiNormalizer(preprocessor=UncachedPreprocessor())
+    for text in corpus[:200]:
+        assert cached.normalize(text) == uncached.normalize(text)
+
+    values = [int(v) for text in corpus for v in re.findall(r"[0-9]+", text.translate(GujaratiTextPreprocessor.digit_translation).replace(",", ""))]
+    preprocessor = cached.preprocessor
+    preprocessor.number_table()
+
+    print("\n=== Number verbalization table + LRU memo ===")
+    print(f"Corpus: {sentences} numeric-heavy sentences, {len(values)} numbers")
+    compose = best_time(lambda vs: [preprocessor.compose_number_words(v) for v in vs], values)
+    lookup = best_time(lambda vs: [preprocessor.number_to_words_indian(v) for v in vs], values)
+    print(f"number_to_words_indian: composed {compose / len(values) * 1e9:6.0f} ns/value, "
+          f"table/memo {lookup / len(values) * 1e9:6.0f} ns/value ({compose / lookup:.1f}x)")
+    before = best_time(lambda texts: [uncached.normalize(t) for t in texts], corpus)
+    after = best_time(lambda texts: [cached.normalize(t) for t in texts], corpus)
+    print(f"normalize():            composed {before / sentences * 1e6:6.1f} us/sentence, "
+          f"table/memo {after / sentences * 1e6:6.1f} us/sentence ({before / after:.2f}x)")
+    print(f"Large-value memo: {preprocessor.large_number_words.cache_info()}")
+
+def bench_verbalize(items=1000000, limits=(10 ** 5, 10 ** 7, 10 ** 10)):
+    preprocessor = GujaratiTextPreprocessor()
+    verbalize_numbers(np.arange(10), preprocessor)
+
+    print("\n=== verbalize_numbers vs number_to_words_indian per value ===")
+    print(f"Values: {items} random integers below the limit")
+    print(f"{'limit':>14} | {'per-value s':>11} | {'vectorized s':>12} | {'speedup':>7}")
+    rng = np.random.default_rng(0)
+    for limit in limits:
+        values = rng.integers(0, limit, items)
+        loop = best_time(lambda vs: [preprocessor.number_to_words_indian(v) for v in vs.tolist()], values, repeat=1)
+        vectorized = best_time(lambda vs: verbalize_numbers(vs, preprocessor), values)
+        print(f"{limit:>14} | {loop:>11.2f} | {vectorized:>12.2f} | {loop / vectorized:>6.1f}x")
+
+def bench_incremental(paragraph_counts=(1, 10, 100), keystrokes=200):
+    normalizer = GujaratiNormalizer()
+
+    print("\n=== Keystroke latency: full re-normalization vs IncrementalNormalizer ===")
+    print(f"{'chars':>10} | {'full ms/key':>11} | {'incremental ms/key':>18} | {'speedup':>8}")
+    for count in paragraph_counts:
+        document = sample_document(count)
+        full = best_time(normalizer.normalize, document)
+
+        editor = IncrementalNormalizer(document, normalizer)
+        middle = len(document) // 2
+        start = time.perf_counter()
+        for i in range(keystrokes):
+            # Type and delete a character mid-document; a front-end would apply the returned splice.
+            if i % 2 == 0:
+                editor.edit(middle, middle, "ક")
+            else:
+                editor.edit(middle, middle + 1)
+        incremental = (time.perf_counter() - start) / keystrokes
+        assert editor.output == " ".join(iter_normalize([document], normalizer))
+        print(f"{len(document):>10} | {full * 1e3:>11.2f} | {incremental * 1e3:>18.3f} | {full / incremental:>7.0f}x")
+
+def prompt_traffic(requests, distinct=2000, seed=0):
+    # IVR prompts and headlines: a Zipf-like mix where a few sentences dominate.
+    rng = random.Random(seed)
+    sentences = [f"{test_cases[i % len(test_cases)][0]} {PROSE.split('. ')[i % 4]} ક્રમ {i}." for i in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(sentences, weights, k=requests)
+
+def bench_cache(requests=50000):
+    traffic = prompt_traffic(requests)
+    normalizer = GujaratiNormalizer()
+
+    print("\n=== Normalization cache on repeated prompts ===")
+    print(f"Requests: {requests}, distinct: {len(set(traffic))}")
+    uncached = best_time(lambda texts: [normalizer.normalize(t) for t in texts], traffic, repeat=1)
+    print(f"{'uncached':<24} {uncached / requests * 1e6:7.1f} us/request")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        for label, options in (("memory LRU (1000)", {}), ("memory + sqlite, cold", {"path": path}),
+                               ("memory + sqlite, warm", {"path": path})):
+            with CachedNormalizer(normalizer, max_entries=1000, **options) as cache:
+                elapsed = best_time(lambda texts: [cache.normalize(t) for t in texts], traffic, repeat=1)
+                stats = cache.stats()
+            print(f"{label:<24} {elapsed / requests * 1e6:7.1f} us/request, hit rate {stats['hit_rate']:.1%} "
+                  f"({stats['disk_hits']} from disk), {uncached / elapsed:.1f}x")
+
+def bench_instrumentation(sentences=5000):
+    traffic = numeric_corpus(sentences // 2) + prompt_traffic(sentences // 2)
+    plain = GujaratiNormalizer()
+    stats = NormalizationStats()
+    instrumented = GujaratiNormalizer(stats=stats)
+
+    disabled = best_time(lambda texts: [plain.normalize(t) for t in texts], traffic)
+    enabled = best_time(lambda texts: [instrumented.normalize(t) for t in texts], traffic)
+    # The only cost left in normalize() when instrumentation is off.
+    check = best_time(lambda n: [plain.stats is not None for _ in range(n)], 1000000) / 1000000
+
+    print("\n=== Per-stage instrumentation ===")
+    print(f"Sentences: {len(traffic)} (numeric corpus + prompt traffic)")
+    print(f"stats=None:          {disabled / len(traffic) * 1e6:6.1f} us/sentence "
+          f"(stats check {check * 1e9:.0f} ns, {check / (disabled / len(traffic)):.3%})")
+    print(f"stats enabled:       {enabled / len(traffic) * 1e6:6.1f} us/sentence ({enabled / disabled - 1:+.0%})")
+    print("Slowest stages:")
+    for stage, seconds, share in stats.slowest(5):
+        print(f"  {stage:<16} {share:6.1%}")
+
+# Inputs aimed at regex backtracking: each builds a string of about n characters.
+ADVERSARIAL_INPUTS = {
+    "gujarati digits": lambda n: "૧" * n,
+    "ascii digits": lambda n: "1" * n,
+    "digit/comma run": lambda n: "૧," * (n // 2),
+    "double commas": lambda n: "૧,," * (n // 3),
+    "commas": lambda n: "ક" + "," * n,
+    "repeated /": lambda n: "૧/" * (n // 2),
+    "repeated :": lambda n: "૧:" * (n // 2),
+    "repeated .": lambda n: "ક" + "." * n + "ક",
+    "digit dots": lambda n: "૧." * (n // 2),
+    "digits then %": lambda n: "૧" * (n - 2) + ".%",
+    "digits then ordinal": lambda n: "૧" * (n - 2) + "મી",
+    "signs": lambda n: "+ " * (n // 2),
+    "inner whitespace": lambda n: "ક" + " " * n + "ક",
+    "spaced dots": lambda n: "ક" + " ." * (n // 2) + " ક",
+}
+
+def bench_adversarial(sizes=(12000, 48000, 192000), max_growth=2.0):
+    normalizers = {
+        "sequential": GujaratiNormalizer().normalize,
+        "single-pass": GujaratiNormalizer(single_pass=True).normalize,
+        "aligned": GujaratiNormalizer().normalize_with_alignment,
+    }
+    expander = GujaratiNormalizer().abbreviations
+    normalizers["segmenter"] = lambda text: segment_spans(text, final=True, abbreviations=expander)
+
+    print("\n=== Adversarial inputs: ns/char by input size ===")
+    print(f"{'input':<20} {'path':<12} " + " ".join(f"{size:>9}" for size in sizes))
+    superlinear = []
+    for name, build in ADVERSARIAL_INPUTS.items():
+        texts = [build(size) for size in sizes]
+        for label, normalize in normalizers.items():
+            per_char = [best_time(normalize, text, repeat=2) / len(text) for text in texts]
+            print(f"{name:<20} {label:<12} " + " ".join(f"{t * 1e9:>9.0f}" for t in per_char))
+            # Linear time keeps ns/char flat; quadratic grows it 4x per step. All sizes
+            # are above the streaming max_segment, so every run takes the same code paths.
+            if any(later > max_growth * earlier for earlier, later in zip(per_char, per_char[1:])):
+                superlinear.append(f"{name} ({label})")
+    if superlinear:
+        raise AssertionError("Superlinear time per character: " + ", ".join(superlinear))
+
+def main():
+    bench_reused_normalizer()
+    bench_single_pass()
+    bench_abbreviations()
+    bench_batch()
+    bench_streaming()
+    bench_number_table()
+    bench_verbalize()
+    bench_incremental()
+    bench_cache()
+    bench_instrumentation()
+    bench_adversarial()
+
+if __name__ == "__main__":
+    main()
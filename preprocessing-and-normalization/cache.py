@@ -0,0 +1,146 @@
+import hashlib
+import sqlite3
+import unicodedata
+from collections import OrderedDict
+from normalizer import GujaratiNormalizer
+
+class CachedNormalizer:
+    """
+    Two-tier cache of normalized sentences around a GujaratiNormalizer.
+
+    Outputs are keyed by a hash of the NFC-normalized input and the
+    normalizer's fingerprint(), so a change to the rules or the abbreviation
+    lexicon never serves stale output. The first tier is an in-memory LRU of
+    up to max_entries outputs. With a path, a sqlite file is the second tier:
+    it survives restarts and can be shared by processes, holds up to
+    max_disk_entries outputs and evicts the least recently used tenth when
+    full. Processes with different normalizers can share one file: their
+    keys differ, so entries written under another fingerprint are never
+    read and simply age out through the LRU eviction.
+
+    Drop-in for the normalizer in iter_normalize and IncrementalNormalizer.
+    """
+    def __init__(self, normalizer=None, max_entries=10000, path=None, max_disk_entries=1000000, commit_every=1000):
+        if normalizer is None:
+            normalizer = GujaratiNormalizer()
+        self.normalizer = normalizer
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.commit_every = commit_every
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._refresh_fingerprint()
+
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, fingerprint TEXT, output TEXT, used INTEGER)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+            self.disk_entries, self.clock = self.db.execute("SELECT COUNT(*), COALESCE(MAX(used), 0) FROM entries").fetchone()
+            self.pending = 0
+
+    @property
+    def abbreviations(self):
+        return self.normalizer.abbreviations
+
+    def _refresh_fingerprint(self):
+        self.fingerprint = self.normalizer.fingerprint()
+        self.abbreviations_version = self.normalizer.abbreviations.version
+        self.memory.clear()
+
+    def key(self, text):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.fingerprint.encode())
+        digest.update(unicodedata.normalize('NFC', text).encode("utf-8"))
+        return digest.digest()
+
+    def normalize(self, text):
+        if self.normalizer.abbreviations.version != self.abbreviations_version:
+            self._refresh_fingerprint()
+        key = self.key(text)
+
+        output = self.memory.get(key)
+        if output is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return output
+
+        if self.db is not None:
+            row = self.db.execute("SELECT output FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                output = row[0]
+                self.disk_hits += 1
+                self._touch(key)
+                self._remember(key, output)
+                return output
+
+        self.misses += 1
+        output = self.normalizer.normalize(text)
+        self._remember(key, output)
+        if self.db is not None:
+            self._store(key, output)
+        return output
+
+    def _remember(self, key, output):
+        self.memory[key] = output
+        if len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    def _touch(self, key):
+        self.clock += 1
+        self.db.execute("UPDATE entries SET used = ? WHERE key = ?", (self.clock, key))
+        self._written()
+
+    def _store(self, key, output):
+        self.clock += 1
+        # Another process may have stored the same key meanwhile; the output is the same.
+        inserted = self.db.execute("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?)", (key, self.fingerprint, output, self.clock)).rowcount
+        self.disk_entries += inserted
+        if self.disk_entries > self.max_disk_entries:
+            evict = max(self.max_disk_entries // 10, 1)
+            self.db.execute("DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used LIMIT ?)", (evict,))
+            self.disk_entries -= evict
+            self.disk_evictions += evict
+        self._written()
+
+    def _written(self):
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        if self.db is not None:
+            self.db.commit()
+            self.pending = 0
+
+    def close(self):
+        if self.db is not None:
+            self.flush()
+            self.db.close()
+            self.db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self.memory),
+            "disk_entries": self.disk_entries if self.db is not None else 0,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+        }
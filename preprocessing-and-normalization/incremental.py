@@ -0,0 +1,150 @@
+import numpy as np
+from normalizer import GujaratiNormalizer
+from streaming import DEFAULT_MAX_SEGMENT, segment_spans
+
+class IncrementalNormalizer:
+    """
+    Keep the normalized form of a document up to date while it is edited.
+
+    The document is split into segments (sentences) by the same rules as
+    iter_normalize, and each segment is normalized on its own with its
+    alignment. edit() re-segments and re-normalizes only the segments touched
+    by the edit plus one neighbour on each side, whose boundaries the edit may
+    move, and splices them into the stored result; the rest of the document
+    is only shifted. The source text is stored per segment as well, so an
+    edit does not copy the whole document. The output is the normalized
+    segments joined by spaces, i.e. what iter_normalize yields for the same
+    text.
+
+    Segment boundaries are found with segment_spans, so a sentence longer
+    than max_segment is cut from the start of the re-normalized window and
+    may be cut differently than in a fresh run.
+    """
+    def __init__(self, text="", normalizer=None, max_segment=DEFAULT_MAX_SEGMENT):
+        if normalizer is None:
+            normalizer = GujaratiNormalizer()
+        self.normalizer = normalizer
+        self.max_segment = max_segment
+        self.length = 0
+        # Per segment: the source from its start to the next segment's start,
+        # its source span, its output and alignment, and its share of the
+        # output (the output plus a separating space, or nothing if empty).
+        self.sources = []
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+        self.outputs = []
+        self.alignments = []
+        self.output_lengths = np.zeros(0, dtype=np.int64)
+        self._text = ""
+        self._output = ""
+        if text:
+            self.edit(0, 0, text)
+
+    def __len__(self):
+        return len(self.outputs)
+
+    def segment(self, index):
+        """(source_start, source_end, output, alignment) of one segment; alignment offsets are segment-relative."""
+        return int(self.starts[index]), int(self.ends[index]), self.outputs[index], self.alignments[index]
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = "".join(self.sources)
+        return self._text
+
+    @property
+    def output(self):
+        if self._output is None:
+            self._output = " ".join(output for output in self.outputs if output)
+        return self._output
+
+    def _normalize_window(self, window, offset, tail):
+        spans, _ = segment_spans(window, final=True, max_segment=self.max_segment,
+                                 abbreviations=self.normalizer.abbreviations)
+        sources = []
+        outputs = []
+        alignments = []
+        for index, (span_start, span_end) in enumerate(spans):
+            next_start = spans[index + 1][0] if index + 1 < len(spans) else len(window)
+            sources.append(window[span_start:next_start])
+            output, alignment = self.normalizer.normalize_with_alignment(window[span_start:span_end])
+            outputs.append(output)
+            alignments.append(alignment)
+        if sources:
+            sources[-1] += tail
+        starts = np.array([span_start for span_start, _ in spans], dtype=np.int64) + offset
+        ends = np.array([span_end for _, span_end in spans], dtype=np.int64) + offset
+        return sources, starts, ends, outputs, alignments
+
+    def edit(self, start, end, replacement=""):
+        """
+        Replace text[start:end] with replacement and update the normalized result.
+
+        Returns (output_start, output_end, text): the previous output with
+        output[output_start:output_end] replaced by text is the new output, so
+        a front-end can patch its view without copying the whole document.
+        """
+        if not 0 <= start <= end <= self.length:
+            raise ValueError(f"Edit span {start}:{end} is outside the document (length {self.length})")
+        delta = len(replacement) - (end - start)
+
+        count = len(self.outputs)
+        if count == 0:
+            first, last = 0, -1
+            window_start, window = 0, ""
+        else:
+            first = max(int(np.searchsorted(self.ends, start, "left")) - 1, 0)
+            last = min(int(np.searchsorted(self.starts, end, "right")), count - 1)
+            window_start = int(self.starts[first])
+            window = "".join(self.sources[first:last + 1])
+        # The window ends where the last segment ends; the whitespace after it
+        # (up to the next segment) is carried over unchanged.
+        tail = ""
+        if last < count - 1:
+            window_end = int(self.ends[last])
+            tail = window[window_end - window_start:]
+            window = window[:window_end - window_start]
+        window = window[:start - window_start] + replacement + window[end - window_start:]
+        sources, starts, ends, outputs, alignments = self._normalize_window(window, window_start, tail)
+
+        output_lengths = np.array([len(output) + 1 if output else 0 for output in outputs], dtype=np.int64)
+        total = int(self.output_lengths.sum())
+        splice_start = int(self.output_lengths[:first].sum())
+        splice_end = splice_start + int(self.output_lengths[first:last + 1].sum())
+        splice = "".join(output + " " for output in outputs if output)
+        if splice_end == total:
+            # The region ends the output, which has no trailing space: take in the
+            # separator before it instead.
+            old_length = max(total - 1, 0)
+            if splice_start > 0:
+                splice_start -= 1
+                splice = " " + splice[:-1] if splice else ""
+            else:
+                splice = splice[:-1]
+            splice_end = old_length
+
+        self.sources[first:last + 1] = sources
+        self.starts = np.concatenate([self.starts[:first], starts, self.starts[last + 1:] + delta])
+        self.ends = np.concatenate([self.ends[:first], ends, self.ends[last + 1:] + delta])
+        self.outputs[first:last + 1] = outputs
+        self.alignments[first:last + 1] = alignments
+        self.output_lengths = np.concatenate([self.output_lengths[:first], output_lengths, self.output_lengths[last + 1:]])
+        self.length += delta
+        self._text = None
+        self._output = None
+        return splice_start, splice_end, splice
+
+    def alignment(self):
+        """(source_start, source_end, output_start, output_end) spans of the whole document output."""
+        spans = []
+        position = 0
+        for start, output, alignment in zip(self.starts.tolist(), self.outputs, self.alignments):
+            if not output:
+                continue
+            if spans:
+                position += 1
+            for source_start, source_end, output_start, output_end in alignment:
+                spans.append((source_start + start, source_end + start, output_start + position, output_end + position))
+            position += len(output)
+        return spans
@@ -0,0 +1,75 @@
+import json
+
+STAGE_FIELDS = ("calls", "seconds", "matches", "bytes_in", "bytes_out")
+
+PROMETHEUS_METRICS = [
+    ("calls", "stage_calls_total", "Times each normalization stage ran."),
+    ("seconds", "stage_seconds_total", "Wall time spent in each normalization stage."),
+    ("matches", "stage_matches_total", "Replacements (or rejections) made by each normalization stage."),
+    ("bytes_in", "stage_input_bytes_total", "UTF-8 bytes fed into each normalization stage."),
+    ("bytes_out", "stage_output_bytes_total", "UTF-8 bytes produced by each normalization stage."),
+]
+
+class NormalizationStats:
+    """
+    Per-stage counters accumulated over normalize() calls.
+
+    Pass an instance as GujaratiNormalizer(stats=...) to switch
+    instrumentation on. Every stage records its calls, wall time, number of
+    matches and UTF-8 bytes in and out; the "total" stage covers the whole
+    call. Stages are kept in pipeline order. Stats from several normalizers
+    or processes can be combined with merge().
+    """
+    def __init__(self):
+        self.stages = {}
+
+    def record(self, stage, seconds, matches, text_in, text_out):
+        counters = self.stages.get(stage)
+        if counters is None:
+            counters = self.stages[stage] = dict.fromkeys(STAGE_FIELDS, 0)
+        counters["calls"] += 1
+        counters["seconds"] += seconds
+        counters["matches"] += matches
+        counters["bytes_in"] += len(text_in.encode("utf-8"))
+        counters["bytes_out"] += len(text_out.encode("utf-8"))
+
+    def merge(self, other):
+        for stage, other_counters in other.stages.items():
+            counters = self.stages.setdefault(stage, dict.fromkeys(STAGE_FIELDS, 0))
+            for field in STAGE_FIELDS:
+                counters[field] += other_counters[field]
+        return self
+
+    def reset(self):
+        self.stages.clear()
+
+    def to_dict(self):
+        return {stage: dict(counters) for stage, counters in self.stages.items()}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for stage, counters in data.items():
+            stats.stages[stage] = {field: counters.get(field, 0) for field in STAGE_FIELDS}
+        return stats
+
+    def to_prometheus(self, prefix="gujarati_normalizer"):
+        """Counters in the Prometheus text exposition format, one series per stage."""
+        lines = []
+        for field, name, help_text in PROMETHEUS_METRICS:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for stage, counters in self.stages.items():
+                lines.append(f'{metric}{{stage="{stage}"}} {counters[field]}')
+        return "\n".join(lines) + "\n"
+
+    def slowest(self, n=None):
+        """(stage, seconds, share of total time) for every stage but "total", slowest first."""
+        total = self.stages.get("total", {}).get("seconds") or sum(c["seconds"] for c in self.stages.values())
+        ranked = sorted(((stage, counters["seconds"]) for stage, counters in self.stages.items() if stage != "total"),
+                        key=lambda item: item[1], reverse=True)
+        return [(stage, seconds, seconds / total if total else 0.0) for stage, seconds in ranked[:n]]
@@ -1,157 +1,555 @@
+import hashlib
 import re
+import time
+import types
 import unicodedata
 from preprocessor import GujaratiTextPreprocessor
+from abbreviations import AbbreviationExpander
+from alignment import AlignedText
 
-def date_replace(match):
-    preprocessor = GujaratiTextPreprocessor()
-
-    day_str, month_str, year_str = match.groups()
-    day = int(preprocessor.convert_gujarati_to_arabic(day_str))
-    month = int(preprocessor.convert_gujarati_to_arabic(month_str))
-    year = int(preprocessor.convert_gujarati_to_arabic(year_str))
-
-    if day == 1:
-        day_words = "પહેલી"
-    elif day == 2:
-        day_words = "બીજી"
-    elif day == 3:
-        day_words = "ત્રીજી"
+INVALID_CHARACTERS_ERROR = "[Error: Invalid characters]"
+INPUT_TOO_LONG_ERROR = "[Error: Input too long]"
+
+def is_normalization_error(output):
+    return output.startswith("[Error:")
+
+MONTH_NAMES = {
+    1: "જાન્યુઆરી",
+    2: "ફેબ્રુઆરી",
+    3: "માર્ચ",
+    4: "એપ્રિલ",
+    5: "મે",
+    6: "જૂન",
+    7: "જુલાઈ",
+    8: "ઑગસ્ટ",
+    9: "સપ્ટેમ્બર",
+    10: "ઓક્ટોબર",
+    11: "નવેમ્બર",
+    12: "ડિસેમ્બર"
+}
+
+def _update_digest(digest, value):
+    # Code objects and bound methods have addresses in their repr, so hash their contents instead.
+    if isinstance(value, types.CodeType):
+        digest.update(value.co_code)
+        digest.update(repr(value.co_names).encode())
+        for const in value.co_consts:
+            _update_digest(digest, const)
+    elif isinstance(value, (staticmethod, classmethod)):
+        _update_digest(digest, value.__func__)
+    elif isinstance(value, types.FunctionType):
+        _update_digest(digest, value.__code__)
+    elif isinstance(value, property):
+        _update_digest(digest, value.fget)
+    elif isinstance(value, re.Pattern):
+        digest.update(repr((value.pattern, value.flags)).encode())
     else:
-        day_words = preprocessor.number_to_words_indian(day) + "મી"
-
-    month_map = {
-        1: "જાન્યુઆરી",
-        2: "ફેબ્રુઆરી",
-        3: "માર્ચ",
-        4: "એપ્રિલ",
-        5: "મે",
-        6: "જૂન",
-        7: "જુલાઈ",
-        8: "ઑગસ્ટ",
-        9: "સપ્ટેમ્બર",
-        10: "ઓક્ટોબર",
-        11: "નવેમ્બર",
-        12: "ડિસેમ્બર"
-    }
-    month_words = month_map.get(month, month_str)
-    year_words = preprocessor.number_to_words_indian(year)
-    return day_words + " " + month_words + " " + year_words
+        digest.update(repr(value).encode())
+
+def apply_edits(text, edits):
+    """text with sorted, non-overlapping (start, end, replacement) edits applied."""
+    pieces = []
+    end = 0
+    for start, stop, replacement in edits:
+        pieces.append(text[end:start])
+        pieces.append(replacement)
+        end = stop
+    pieces.append(text[end:])
+    return ''.join(pieces)
+
+class NormalizationRun:
+    """
+    The text of one GujaratiNormalizer.run() call, rewritten step by step.
+
+    run() decides which steps happen in which order; a run decides how each
+    one is applied. This one applies them plainly; InstrumentedRun also
+    records them in a NormalizationStats and AlignedRun keeps the alignment.
+    Every step gets the stage name it is recorded under.
+    """
+    def __init__(self, text):
+        self.source = text
+        self.text = text
+
+    def unicode(self, name, zero_width_table, zero_width_pattern):
+        """NFC normalization and removal of zero-width joiners."""
+        self.text = unicodedata.normalize('NFC', self.text).translate(zero_width_table)
+
+    def validate(self, name, is_valid):
+        return is_valid(self.text)
+
+    def sub(self, name, pattern, replacement):
+        self.text = pattern.sub(replacement, self.text)
+
+    def delete(self, name, pattern, table):
+        """Delete what pattern matches; table deletes the same characters with str.translate."""
+        self.text = self.text.translate(table)
+
+    def edit(self, name, edits):
+        self.text = apply_edits(self.text, edits)
+
+    def cut(self, name, end):
+        self.text = self.text[:end]
+
+    def squeeze(self, name, whitespace_pattern, edge_pattern):
+        """Collapse whitespace runs to one space and strip both ends."""
+        self.text = whitespace_pattern.sub(' ', self.text).strip()
+
+    def result(self, output=None):
+        """What run() returns: output when it stops early, else the rewritten text."""
+        return self.text if output is None else output
+
+class InstrumentedRun(NormalizationRun):
+    """A NormalizationRun recording every step's time, matches and bytes in stats."""
+    def __init__(self, text, stats):
+        super().__init__(text)
+        self.stats = stats
+        self.started = time.perf_counter()
+
+    def _record(self, name, start, matches, text_in):
+        self.stats.record(name, time.perf_counter() - start, matches, text_in, self.text)
+
+    def unicode(self, name, zero_width_table, zero_width_pattern):
+        start, text_in = time.perf_counter(), self.text
+        super().unicode(name, zero_width_table, zero_width_pattern)
+        self._record(name, start, int(self.text != text_in), text_in)
+
+    def validate(self, name, is_valid):
+        start = time.perf_counter()
+        valid = is_valid(self.text)
+        self._record(name, start, int(not valid), self.text)
+        return valid
+
+    def sub(self, name, pattern, replacement):
+        start, text_in = time.perf_counter(), self.text
+        self.text, matches = pattern.subn(replacement, text_in)
+        self._record(name, start, matches, text_in)
+
+    def delete(self, name, pattern, table):
+        start, text_in = time.perf_counter(), self.text
+        super().delete(name, pattern, table)
+        self._record(name, start, len(text_in) - len(self.text), text_in)
+
+    def edit(self, name, edits):
+        start, text_in = time.perf_counter(), self.text
+        super().edit(name, edits)
+        self._record(name, start, len(edits), text_in)
+
+    def cut(self, name, end):
+        start, text_in = time.perf_counter(), self.text
+        super().cut(name, end)
+        self._record(name, start, int(len(self.text) != len(text_in)), text_in)
+
+    def squeeze(self, name, whitespace_pattern, edge_pattern):
+        start, text_in = time.perf_counter(), self.text
+        super().squeeze(name, whitespace_pattern, edge_pattern)
+        self._record(name, start, len(text_in) - len(self.text), text_in)
+
+    def result(self, output=None):
+        output = super().result(output)
+        self.stats.record("total", time.perf_counter() - self.started, 0, self.source, output)
+        return output
+
+class AlignedRun(NormalizationRun):
+    """A NormalizationRun keeping an AlignedText; result() is (output, alignment)."""
+    def __init__(self, text):
+        super().__init__(text)
+        self.aligned = AlignedText(text)
+
+    def _apply(self, method, *args):
+        method(*args)
+        self.text = self.aligned.text
+
+    def unicode(self, name, zero_width_table, zero_width_pattern):
+        self._apply(self.aligned.normalize_unicode, 'NFC')
+        self._apply(self.aligned.sub, zero_width_pattern, '')
+
+    def sub(self, name, pattern, replacement):
+        self._apply(self.aligned.sub, pattern, replacement)
+
+    def delete(self, name, pattern, table):
+        self._apply(self.aligned.sub, pattern, '')
+
+    def edit(self, name, edits):
+        text = self.text
+        self._apply(self.aligned.replace, [edit for edit in edits if text[edit[0]:edit[1]] != edit[2]])
+
+    def cut(self, name, end):
+        if end < len(self.text):
+            self._apply(self.aligned.replace, [(end, len(self.text), '')])
+
+    def squeeze(self, name, whitespace_pattern, edge_pattern):
+        self._apply(self.aligned.sub, whitespace_pattern, ' ')
+        self._apply(self.aligned.sub, edge_pattern, '')
+
+    def result(self, output=None):
+        if output is None:
+            return self.text, self.aligned.alignment()
+        # Stopped early: an error maps as a whole to the input, nothing maps to nothing.
+        return output, [(0, len(self.source), 0, len(output))] if output else []
+
+class GujaratiNormalizer:
+    """
+    Long-lived Gujarati normalizer.
+
+    Every stage pattern and translation table is compiled once in the
+    constructor and a single GujaratiTextPreprocessor is shared by all the
+    replacement callbacks, so an instance can be kept around and fed any
+    number of strings. normalize() produces the same output as the
+    original per-call normalize_text().
+
+    With single_pass=True the number stages and the punctuation cleanup are
+    folded into one combined pattern whose named alternatives keep the stage
+    priority order, so the text is scanned and rewritten once instead of once
+    per stage. Each match is dispatched to the same preprocessor handler the
+    sequential stage would have used. The scan reads the original text, while
+    each sequential stage reads the output of the ones before it; where that
+    could matter (a stage match touching another stage match, as in "૧૦-૫"
+    or "૫×૨૦", or overlapping where an earlier stage also matches) the text
+    goes through the sequential stages instead, so both modes give the same
+    output.
+
+    Abbreviations are expanded by an AbbreviationExpander (longest match, one
+    pass); pass your own to add domain lexicons, e.g.
+    AbbreviationExpander.from_tsv("medical.tsv", entries=GujaratiTextPreprocessor.abbrev_dict).
+
+    Instrumentation is opt-in: with stats=NormalizationStats() every call
+    records per-stage time, matches and bytes; without it normalize() only
+    pays for one attribute check.
+    """
+    zero_width_table = str.maketrans('', '', '\u200C\u200D')
+    zero_width_pattern = re.compile('[\u200C\u200D]')
+    punctuation_table = str.maketrans('', '', '!?\'“”",')
+
+    def __init__(self, preprocessor=None, single_pass=False, abbreviations=None, stats=None, max_input_length=None):
+        if preprocessor is None:
+            preprocessor = GujaratiTextPreprocessor()
+        if abbreviations is None:
+            abbreviations = AbbreviationExpander(preprocessor.abbrev_dict)
+        self.preprocessor = preprocessor
+        self.single_pass = single_pass
+        self.abbreviations = abbreviations
+        self.stats = stats
+        self.max_input_length = max_input_length
+
+        self.digit_comma_pattern = re.compile(r'(?<=([\u0A80-\u0AFF]|\d)),(?=([\u0A80-\u0AFF]|\d))')
+
+        # Ordered (name, pattern, replacement) stages, applied one after another.
+        # Every pattern matches in time linear in the text length: digit runs are
+        # only entered at their first digit, and runs longer than
+        # preprocessor.max_number_digits are read out first, so no handler
+        # converts a huge number.
+        self.stages = [
+            ("long_number", re.compile(r'(?<![૦૧૨૩૪૫૬૭૮૯0-9])[૦૧૨૩૪૫૬૭૮૯0-9]{%d,}' % (preprocessor.max_number_digits + 1)), preprocessor.long_number_replace),
+            ("pin", re.compile(r'(પિન:\s*)([૦૧૨૩૪૫૬૭૮૯]+)'), preprocessor.pin_replace),
+            ("date", re.compile(r'([૦૧૨૩૪૫૬૭૮૯0-9]{1,2})[/-]([૦૧૨૩૪૫૬૭૮૯0-9]{1,2})[/-]([૦૧૨૩૪૫૬૭૮૯0-9]{2,4})'), self.date_replace),
+            ("multiplication", re.compile(r'×\s*([૦૧૨૩૪૫૬૭૮૯0-9]+)'), preprocessor.multiplication_replace),
+            ("division", re.compile(r'÷\s*([૦૧૨૩૪૫૬૭૮૯0-9]+)'), preprocessor.division_replace),
+            ("currency", re.compile(r'₹\s*([૦૧૨૩૪૫૬૭૮૯0-9]+(?:\.[૦૧૨૩૪૫૬૭૮૯0-9]+)?(?:/\-)?)([^\s\d]*)'), preprocessor.currency_replace),
+            ("percent", re.compile(r'(?<![૦૧૨૩૪૫૬૭૮૯0-9])([૦૧૨૩૪૫૬૭૮૯0-9]+(?:\.[૦૧૨૩૪૫૬૭૮૯0-9]+)?)%'), preprocessor.percent_replace),
+            ("signed", re.compile(r'([+\-])\s*([૦૧૨૩૪૫૬૭૮૯0-9]+)'), preprocessor.signed_number_replace),
+            ("time", re.compile(r'\b([૦૧૨૩૪૫૬૭૮૯0-9]{1,2}):([૦૧૨૩૪૫૬૭૮૯0-9]{1,2})(\s*વાગ્યે)?'), self.time_replace),
+            ("decimal", re.compile(r'\b([૦૧૨૩૪૫૬૭૮૯0-9]+)\.([૦૧૨૩૪૫૬૭૮૯0-9]+)\b'), preprocessor.non_currency_decimal_replace),
+            ("fraction", re.compile(r'\b([૦૧૨૩૪૫૬૭૮૯0-9]+)/([૦૧૨૩૪૫૬૭૮૯0-9]+)\b'), preprocessor.fraction_replace),
+            ("ordinal", re.compile(r'(?<![\d\u0A80-\u0AFF,])([૦૧૨૩૪૫૬૭૮૯0-9]+)(મી|લો|જી|જું|મો|લા)(?![\d\u0A80-\u0AFF])'), preprocessor.ordinal_replace),
+            ("number", re.compile(r'\b([૦૧૨૩૪૫૬૭૮૯0-9,]+)\b'), preprocessor.number_replace),
+        ]
+
+        self.ellipsis_pattern = re.compile(r'\.{2,}')
+        self.punctuation_pattern = re.compile(r'[!?\'“”",]+')
+
+        # Single-pass classifier: one named alternative per stage, in stage order,
+        # followed by the punctuation cleanup.
+        self.stage_index = {name: index for index, (name, _, _) in enumerate(self.stages)}
+        alternatives = ["(?P<%s>%s)" % (name, pattern.pattern) for name, pattern, _ in self.stages]
+        alternatives.append("(?P<ellipsis>%s)" % self.ellipsis_pattern.pattern)
+        alternatives.append("(?P<punctuation>%s)" % self.punctuation_pattern.pattern)
+        self.combined_pattern = re.compile("|".join(alternatives))
+        # For each stage, a pattern matching wherever an earlier stage's pattern does.
+        # The last one matches wherever any stage does.
+        self.earlier_patterns = [re.compile("|".join("(?:%s)" % pattern.pattern for _, pattern, _ in self.stages[:index]))
+                                 if index else None for index in range(len(self.stages) + 1)]
+        # Every alternative starts with one of these characters; searching for them
+        # first lets the scan skip plain text without trying each alternative.
+        self.candidate_pattern = re.compile(r'[૦૧૨૩૪૫૬૭૮૯0-9પ×÷₹+\-.,!?\'“”"]')
+        self.digit_pattern = re.compile(r'[૦૧૨૩૪૫૬૭૮૯0-9]')
+
+        self.whitespace_pattern = re.compile(r'\s+')
+        self.kilogram_pattern = re.compile('કિલોગ્રામમ')
+        self.edge_whitespace_pattern = re.compile(r'^\s+|\s+$')
+
+    def fingerprint(self):
+        """
+        Hex digest of everything that decides the output: the options
+        (single_pass, max_input_length), the stage patterns, the abbreviation
+        entries, the preprocessor's tables and the code of the normalizer and
+        preprocessor methods. Any change to the rules or the
+        lexicon gives a new fingerprint, so it can key caches of outputs.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        _update_digest(digest, (self.single_pass, self.max_input_length,
+                                [(name, pattern) for name, pattern, _ in self.stages]))
+        _update_digest(digest, sorted(self.abbreviations.entries.items()))
+        _update_digest(digest, MONTH_NAMES)
+        for cls in type(self).__mro__[:-1] + type(self.preprocessor).__mro__[:-1]:
+            for name, value in sorted(vars(cls).items()):
+                # Skip dunders and private caches such as the number table.
+                if not name.startswith("_"):
+                    digest.update(name.encode())
+                    _update_digest(digest, value)
+        return digest.hexdigest()
+
+    def date_replace(self, match):
+        preprocessor = self.preprocessor
+
+        day_str, month_str, year_str = match.groups()
+        day = int(preprocessor.convert_gujarati_to_arabic(day_str))
+        month = int(preprocessor.convert_gujarati_to_arabic(month_str))
+        year = int(preprocessor.convert_gujarati_to_arabic(year_str))
+
+        if day == 1:
+            day_words = "પહેલી"
+        elif day == 2:
+            day_words = "બીજી"
+        elif day == 3:
+            day_words = "ત્રીજી"
+        else:
+            day_words = preprocessor.number_to_words_indian(day) + "મી"
+
+        month_words = MONTH_NAMES.get(month, month_str)
+        year_words = preprocessor.number_to_words_indian(year)
+        return day_words + " " + month_words + " " + year_words
+
+    def time_replace(self, match):
+        preprocessor = self.preprocessor
+
+        hour_str = match.group(1)
+        minute_str = match.group(2)
+        orig_hour = int(preprocessor.convert_gujarati_to_arabic(hour_str))
+        minute = int(preprocessor.convert_gujarati_to_arabic(minute_str))
+
+        if orig_hour == 0 and minute == 0:
+            return "મધરાત"
+        if orig_hour == 0:
+            return "મધરાત " + preprocessor.number_to_words_indian(minute) + " મિનિટે"
+        if orig_hour == 12 and minute == 0:
+            return "બપોર"
+        if orig_hour == 12:
+            return "બપોર " + preprocessor.number_to_words_indian(minute) + " મિનિટે"
+        if orig_hour >= 18:
+            new_hour = orig_hour - 12
+            prefix = "રાત્રે "
+        elif orig_hour > 12 and orig_hour < 18:
+            new_hour = orig_hour
+            prefix = ""
+        else:
+            new_hour = orig_hour
+            prefix = ""
+        return prefix + preprocessor.number_to_words_indian(new_hour) + " વાગ્યા " + preprocessor.number_to_words_indian(minute) + " મિનિટે"
+
+    def single_pass_replace(self, match):
+        name = match.lastgroup
+        if name == "ellipsis":
+            return ' '
+        if name == "punctuation":
+            return ''
+
+        # Re-match with the stage's own pattern so the handler sees its usual groups.
+        index = self.stage_index[name]
+        _, pattern, replacement = self.stages[index]
+        output = replacement(pattern.match(match.string, match.start()))
+
+        # Later stages and the cleanup still apply to the handler output, exactly as
+        # they would in the sequential pipeline (e.g. an unknown month left as digits).
+        # There they would also see the character before the match, so give up
+        # (None) unless the match starts the text or follows whitespace.
+        if self.digit_pattern.search(output):
+            if match.start() > 0 and not match.string[match.start() - 1].isspace():
+                return None
+            for _, later_pattern, later_replacement in self.stages[index + 1:]:
+                output = later_pattern.sub(later_replacement, output)
+        output = self.ellipsis_pattern.sub(' ', output)
+        return output.translate(self.punctuation_table)
+
+    def earlier_stage_starts(self, index, text, start, end):
+        """Whether a stage before stages[index] matches text at a position in (start, end]."""
+        earlier = self.earlier_patterns[index]
+        if earlier is None:
+            return False
+        for candidate in self.candidate_pattern.finditer(text, start + 1, end + 1):
+            if earlier.match(text, candidate.start()):
+                return True
+        return False
+
+    def stage_crosses(self, text, start, end, replacement):
+        """
+        Whether, once replacement stands in for text[start:end], a stage
+        matches text running from replacement into what follows it. Only the
+        next few characters are looked at: a cut-off window can only add
+        matches, never lose one.
+        """
+        before = text[start - 1:start]
+        boundary = len(before) + len(replacement)
+        window = before + replacement + text[end:end + 64]
+        any_stage = self.earlier_patterns[-1]
+        for candidate in self.candidate_pattern.finditer(window, len(before), boundary + 1):
+            match = any_stage.match(window, candidate.start())
+            if match is not None and match.end() > boundary:
+                return True
+        return False
+
+    def single_pass_edits(self, text):
+        """
+        The (start, end, replacement) edits of the single-pass scan, in order,
+        or None if the scan could read the text differently from the sequential
+        stages: when two stage matches touch, or a stage matches across the end
+        of a rewrite, the rewrite changes the text the other stage sees; and
+        when an earlier stage matches inside (or right after) a later stage's
+        match, the earlier stage would have rewritten that text first.
+        """
+        edits = []
+        stage_end = -1
+        pos = 0
+        while True:
+            candidate = self.candidate_pattern.search(text, pos)
+            if candidate is None:
+                break
+            start = candidate.start()
+            match = self.combined_pattern.match(text, start)
+            if match is None:
+                pos = start + 1
+                continue
+            pos = match.end()
+            index = self.stage_index.get(match.lastgroup)
+            if index is not None:
+                if start == stage_end or self.earlier_stage_starts(index, text, start, pos):
+                    return None
+                stage_end = pos
+            replacement = self.single_pass_replace(match)
+            if replacement is None or index is not None and self.stage_crosses(text, start, pos, replacement):
+                return None
+            edits.append((start, pos, replacement))
+        return edits
+
+    def single_pass_scan(self, text):
+        """Single-pass rewrite of text, or None where the sequential stages must run instead."""
+        edits = self.single_pass_edits(text)
+        return None if edits is None else apply_edits(text, edits)
+
+    def normalize(self, text):
+        """
+        Normalize and preprocess Gujarati text for TTS.
+        Processing order:
+        1. Reject input longer than max_input_length.
+        2. Unicode normalization and removal of zero‑width joiners.
+        3. Validate allowed characters.
+        4. Remove commas that occur between digits.
+        5. Expand abbreviations.
+        6. Read digit runs longer than max_number_digits digit by digit.
+        7. Process PIN codes.
+        8. Date conversion.
+        9. Multiplication/Division conversion.
+        10. Currency conversion.
+        11. Percentage conversion.
+        12. Process signed numbers.
+        13. Time conversion.
+        14. Non‑currency decimal conversion.
+        15. Fraction conversion.
+        16. Ordinal conversion.
+        17. General number conversion.
+        18. Punctuation cleanup.
+        19. Additional hack for stray suffix issues.
+        20. Normalize whitespace.
+        """
+        if self.stats is not None:
+            return self.normalize_instrumented(text)
+        return self.run(text, NormalizationRun(text))
+
+    def run(self, text, run):
+        """
+        The normalize() pipeline over text, every step applied through run:
+        a NormalizationRun applies it plainly, its subclasses also time it into
+        stats or keep the alignment. Returns run.result().
+        """
+        if self.max_input_length is not None and len(text) > self.max_input_length:
+            return run.result(INPUT_TOO_LONG_ERROR)
+
+        run.unicode("unicode", self.zero_width_table, self.zero_width_pattern)
+        if run.text.strip() == "":
+            return run.result("")
+        if not run.validate("validate", self.preprocessor.is_valid_text):
+            return run.result(INVALID_CHARACTERS_ERROR)
+
+        run.sub("digit_commas", self.digit_comma_pattern, '')
+        expander = self.abbreviations
+        run.sub("abbreviations", expander.pattern or expander.compile(), lambda match: expander.entries[match.group()])
+
+        edits = self.single_pass_edits(run.text) if self.single_pass else None
+        if edits is not None:
+            # Long digit runs through punctuation cleanup in a single scan.
+            run.edit("single_pass", edits)
+        else:
+            for name, pattern, replacement in self.stages:
+                run.sub(name, pattern, replacement)
+            run.sub("ellipsis", self.ellipsis_pattern, ' ')
+            run.delete("punctuation", self.punctuation_pattern, self.punctuation_table)
+
+        run.cut("trailing_dots", self.trailing_dots_start(run.text))
+        run.sub("suffix_fix", self.kilogram_pattern, 'કિલોગ્રામ')
+        run.squeeze("whitespace", self.whitespace_pattern, self.edge_whitespace_pattern)
+        return run.result()
+
+    def trailing_dots_start(self, text):
+        """
+        Start of the trailing whitespace/dots/whitespace run that the cleanup
+        removes, or len(text) if the text does not end in dots. Same result as
+        searching r'\s*[\.]+\s*$', without the quadratic backtracking that
+        pattern has on long runs of whitespace.
+        """
+        stripped = text.rstrip()
+        if not stripped.endswith('.'):
+            return len(text)
+        return len(stripped.rstrip('.').rstrip())
+
+    def normalize_instrumented(self, text):
+        """
+        Same steps and output as normalize(), recording each step in self.stats.
+        Stages are named after the normalize() docstring steps; in single-pass
+        mode the fused scan is recorded as "single_pass".
+        """
+        return self.run(text, InstrumentedRun(text, self.stats))
+
+    def normalize_with_alignment(self, text):
+        """
+        Normalize text exactly like normalize() and also return its alignment.
+
+        The alignment is a list of (source_start, source_end, output_start,
+        output_end) spans covering the output in order; each replaced stretch
+        maps as a whole to the input it came from, e.g. "₹૨.૫" maps to
+        "રૂપિયા બે અને પચાસ પૈસા" as one span. Unchanged text is split into
+        verbatim spans, and deleted input (punctuation, extra whitespace)
+        does not appear. Offsets refer to the text as passed in.
+        """
+        return self.run(text, AlignedRun(text))
+
+_default_normalizer = None
+
+def get_default_normalizer():
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = GujaratiNormalizer()
+    return _default_normalizer
+
+def date_replace(match):
+    return get_default_normalizer().date_replace(match)
 
 def time_replace(match):
-    preprocessor = GujaratiTextPreprocessor()
-
-    hour_str = match.group(1)
-    minute_str = match.group(2)
-    orig_hour = int(preprocessor.convert_gujarati_to_arabic(hour_str))
-    minute = int(preprocessor.convert_gujarati_to_arabic(minute_str))
-
-    if orig_hour == 0 and minute == 0:
-        return "મધરાત"
-    if orig_hour == 0:
-        return "મધરાત " + preprocessor.number_to_words_indian(minute) + " મિનિટે"
-    if orig_hour == 12 and minute == 0:
-        return "બપોર"
-    if orig_hour == 12:
-        return "બપોર " + preprocessor.number_to_words_indian(minute) + " મિનિટે"
-    if orig_hour >= 18:
-        new_hour = orig_hour - 12
-        prefix = "રાત્રે "
-    elif orig_hour > 12 and orig_hour < 18:
-        new_hour = orig_hour
-        prefix = ""
-    else:
-        new_hour = orig_hour
-        prefix = ""
-    return prefix + preprocessor.number_to_words_indian(new_hour) + " વાગ્યા " + preprocessor.number_to_words_indian(minute) + " મિનિટે"
+    return get_default_normalizer().time_replace(match)
 
 def normalize_text(text):
     """
     Normalize and preprocess Gujarati text for TTS.
-    Processing order:
-    1. Unicode normalization and removal of zero‑width joiners.
-    2. Validate allowed characters.
-    3. Remove commas that occur between digits.
-    4. Expand abbreviations.
-    5. Process PIN codes.
-    6. Date conversion.
-    7. Multiplication/Division conversion.
-    8. Currency conversion.
-    9. Percentage conversion.
-    10. Process signed numbers.
-    11. Time conversion.
-    12. Non‑currency decimal conversion.
-    13. Fraction conversion.
-    14. Ordinal conversion.
-    15. General number conversion.
-    16. Punctuation cleanup.
-    17. Additional hack for stray suffix issues.
-    18. Normalize whitespace.
+
+    Convenience wrapper around a shared GujaratiNormalizer; see
+    GujaratiNormalizer.normalize for the processing order.
     """
-    # Create an instance of GujaratiTextPreprocessor
-    preprocessor = GujaratiTextPreprocessor()
-
-    # Unicode normalization and remove zero‑width joiners.
-    text = unicodedata.normalize('NFC', text)
-    text = re.sub(r'[\u200C\u200D]', '', text)
-    
-    # Validate allowed characters.
-    if text.strip() == "":
-        return ""
-    if not preprocessor.is_valid_text(text):
-        return "[Error: Invalid characters]"
-    
-    # Remove commas between digits (Gujarati or ASCII).
-    text = re.sub(r'(?<=([\u0A80-\u0AFF]|\d)),(?=([\u0A80-\u0AFF]|\d))', '', text)
-    
-    # Expand abbreviations.
-    for abbr, full in preprocessor.abbrev_dict.items():
-        text = re.sub(re.escape(abbr), full, text)
-    
-    # Process PIN codes.
-    text = re.sub(r'(પિન:\s*)([૦૧૨૩૪૫૬૭૮૯]+)', preprocessor.pin_replace, text)
-    
-    # Date conversion.
-    text = re.sub(r'([૦૧૨૩૪૫૬૭૮૯0-9]{1,2})[/-]([૦૧૨૩૪૫૬૭૮૯0-9]{1,2})[/-]([૦૧૨૩૪૫૬૭૮૯0-9]{2,4})', date_replace, text)
-    
-    # Division conversion.
-    text = re.sub(r'×\s*([૦૧૨૩૪૫૬૭૮૯0-9]+)', preprocessor.multiplication_replace, text)
-    text = re.sub(r'÷\s*([૦૧૨૩૪૫૬૭૮૯0-9]+)', preprocessor.division_replace, text)
-    
-    # Currency conversion.
-    text = re.sub(r'₹\s*([૦૧૨૩૪૫૬૭૮૯0-9]+(?:\.[૦૧૨૩૪૫૬૭૮૯0-9]+)?(?:/\-)?)([^\s\d]*)', preprocessor.currency_replace, text)
-    
-    # Percentage conversion.
-    text = re.sub(r'([૦૧૨૩૪૫૬૭૮૯0-9]+(?:\.[૦૧૨૩૪૫૬૭૮૯0-9]+)?)%', preprocessor.percent_replace, text)
-    
-    # Process signed numbers.
-    text = re.sub(r'([+\-])\s*([૦૧૨૩૪૫૬૭૮૯0-9]+)', preprocessor.signed_number_replace, text)
-    
-    # Time conversion.
-    text = re.sub(r'\b([૦૧૨૩૪૫૬૭૮૯0-9]{1,2}):([૦૧૨૩૪૫૬૭૮૯0-9]{1,2})(\s*વાગ્યે)?', time_replace, text)
-    
-    # Non‑currency decimal conversion.
-    text = re.sub(r'\b([૦૧૨૩૪૫૬૭૮૯0-9]+)\.([૦૧૨૩૪૫૬૭૮૯0-9]+)\b', preprocessor.non_currency_decimal_replace, text)
-    
-    # Fraction conversion.
-    text = re.sub(r'\b([૦૧૨૩૪૫૬૭૮૯0-9]+)/([૦૧૨૩૪૫૬૭૮૯0-9]+)\b', preprocessor.fraction_replace, text)
-    
-    # Ordinal conversion.
-    text = re.sub(r'(?<![\d\u0A80-\u0AFF,])([૦૧૨૩૪૫૬૭૮૯0-9]+)(મી|લો|જી|જું|મો|લા)(?![\d\u0A80-\u0AFF])', preprocessor.ordinal_replace, text)
-    
-    # General number conversion.
-    text = re.sub(r'\b([૦૧૨૩૪૫૬૭૮૯0-9,]+)\b', preprocessor.number_replace, text)
-    
-    # Punctuation cleanup.
-    text = re.sub(r'\.{2,}', ' ', text)
-    text = re.sub(r'[!?\']', '', text)
-    text = re.sub(r'[“”"]', '', text)
-    text = re.sub(r',', '', text)
-    text = re.sub(r'\s*[\.]+\s*$', '', text)
-    
-    # Additional hack to fix stray extra letters.
-    text = text.replace("કિલોગ્રામમ", "કિલોગ્રામ")
-    
-    # Normalize whitespace.
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
\ No newline at end of file
+    return get_default_normalizer().normalize(text)
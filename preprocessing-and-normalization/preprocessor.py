@@ -1,4 +1,6 @@
+import functools
 import re
+from gujarati.charclass import ALLOWED, CHAR_CLASSES, GUJARATI, LATIN, SPACE, class_pattern
 
 class GujaratiTextPreprocessor:
     cardinal_dict = {
@@ -121,6 +123,59 @@ class GujaratiTextPreprocessor:
 
     fraction_map = {("1", "2"): "અડધો", ("1", "4"): "પા", ("3", "4"): "પોણો",("1", "1.5"): "દોઢ", ("1", "1.25"): "સવા", ("1", "1.75"): "પોણા બે",}
 
+    digit_translation = str.maketrans("૦૧૨૩૪૫૬૭૮૯", "0123456789")
+
+    # Character sets come from the shared classification table.
+    allowed_text_pattern = re.compile('^' + class_pattern(ALLOWED) + '*$')
+    token_split_pattern = re.compile(r'\s+')
+    latin_pattern = re.compile(class_pattern(LATIN))
+    gujarati_pattern = re.compile(class_pattern(GUJARATI))
+    # A Latin letter followed by a Gujarati one in the same word, with only other
+    # characters between them. Searched in the text and in the reversed text,
+    # it finds mixed-script words in time linear in the text.
+    mixed_script_pattern = re.compile('{latin}[^\\s{letters}]*{gujarati}'.format(
+        latin=latin_pattern.pattern, gujarati=gujarati_pattern.pattern, letters=class_pattern(LATIN | GUJARATI)[1:-1]))
+    gujarati_digits_pattern = re.compile(r'[૦૧૨૩૪૫૬૭૮૯]+')
+
+    # number_to_words_indian serves 0..small_number_limit-1 from a table built on
+    # first use and shared by all instances; larger values go through an LRU memo.
+    small_number_limit = 100000
+
+    # Digit runs longer than this are read digit by digit instead of being
+    # converted to an int, which is quadratic in the number of digits.
+    max_number_digits = 100
+
+    def __init__(self, large_number_cache_size=4096):
+        self.large_number_cache_size = large_number_cache_size
+        self.large_number_words = functools.lru_cache(maxsize=large_number_cache_size)(self.compose_number_words)
+
+    def __getstate__(self):
+        # The memo wraps a bound method and cannot be pickled; workers rebuild it.
+        state = self.__dict__.copy()
+        del state["large_number_words"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.large_number_words = functools.lru_cache(maxsize=self.large_number_cache_size)(self.compose_number_words)
+
+    def number_table(self):
+        cls = type(self)
+        table = cls.__dict__.get("_number_table")
+        if table is None:
+            table = self.build_number_table()
+            cls._number_table = table
+        return table
+
+    def build_number_table(self):
+        below_thousand = [self.compose_number_words(n) for n in range(1000)]
+        table = list(below_thousand)
+        for thousand in range(1, self.small_number_limit // 1000):
+            prefix = self.number_to_words(thousand) + " હજાર"
+            table.append(prefix)
+            table.extend(prefix + " " + below_thousand[rest] for rest in range(1, 1000))
+        return table
+
     def number_to_words(self, n):
         if n < 100:
             if n in self.cardinal_dict:
@@ -132,6 +187,11 @@ class GujaratiTextPreprocessor:
         return str(n)
 
     def number_to_words_indian(self, n):
+        if 0 <= n < self.small_number_limit:
+            return self.number_table()[n]
+        return self.large_number_words(n)
+
+    def compose_number_words(self, n):
         if n == 0:
             return self.cardinal_dict[0]
         if n < 100:
@@ -176,21 +236,42 @@ class GujaratiTextPreprocessor:
         return result
 
     def convert_gujarati_to_arabic(self, s):
-        mapping = str.maketrans("૦૧૨૩૪૫૬૭૮૯", "0123456789")
-        return s.translate(mapping)
+        return s.translate(self.digit_translation)
 
     def digit_by_digit_conversion(self, s):
         return " ".join(self.cardinal_dict[int(ch)] for ch in s)
 
     def is_valid_text(self, text):
-        allowed_pattern = r'^[\u0A80-\u0AFFA-Za-z0-9\s\.\,\!\?\%\₹:/\-\+\×÷“”"\'.₩©®™]*$'
-        if not re.match(allowed_pattern, text):
+        if not self.allowed_text_pattern.match(text):
             return False
-        tokens = re.split(r'\s+', text)
-        for token in tokens:
-            if re.search(r'[A-Za-z]', token) and re.search(r'[\u0A80-\u0AFF]', token):
-                return False
-        return True
+        if not self.latin_pattern.search(text):
+            return True
+        return not (self.mixed_script_pattern.search(text) or self.mixed_script_pattern.search(text[::-1]))
+
+    def invalid_positions(self, text):
+        """
+        Offsets of the characters that make text invalid, in order: characters
+        outside the allowed set, and the Latin letters of every word that also
+        has Gujarati letters. Empty exactly when is_valid_text(text) is true.
+        """
+        positions = []
+        word_latin = []
+        word_gujarati = False
+        for index, char in enumerate(text + " "):
+            flags = CHAR_CLASSES.get(char, 0)
+            if flags & SPACE:
+                if word_gujarati:
+                    positions.extend(word_latin)
+                word_latin = []
+                word_gujarati = False
+                continue
+            if not flags & ALLOWED:
+                positions.append(index)
+            if flags & LATIN:
+                word_latin.append(index)
+            elif flags & GUJARATI:
+                word_gujarati = True
+        return sorted(positions)
 
     def signed_number_replace(self, match):
         sign = match.group(1)
@@ -288,9 +369,11 @@ class GujaratiTextPreprocessor:
         else:
             return ""
         token_clean = token.replace(",", "")
+        if len(token_clean) > self.max_number_digits:
+            return self.digit_by_digit_conversion(token_clean)
         if token_clean == "૯૯૯":
             return "નવ નવ નવ નવ નવ"
-        if re.fullmatch(r'[૦૧૨૩૪૫૬૭૮૯]+', token_clean) and (len(token_clean) >= 10) and ("," not in token):
+        if self.gujarati_digits_pattern.fullmatch(token_clean) and (len(token_clean) >= 10) and ("," not in token):
             return self.digit_by_digit_conversion(token_clean)
         try:
             value = int(self.convert_gujarati_to_arabic(token_clean))
@@ -298,6 +381,9 @@ class GujaratiTextPreprocessor:
         except:
             return token
 
+    def long_number_replace(self, match):
+        return self.digit_by_digit_conversion(match.group())
+
     def pin_replace(self, match):
         prefix = match.group(1)
         num_str = match.group(2)
@@ -0,0 +1,141 @@
+import argparse
+import re
+import sys
+from normalizer import GujaratiNormalizer
+
+# A segment ends at a whitespace run that follows a sentence delimiter or
+# contains a line break. Runs are only entered at their first character, so
+# finding them takes linear time even in very long stretches of whitespace.
+SENTENCE_DELIMITERS = "।!?."
+WHITESPACE_RUN_PATTERN = re.compile(r'(?<!\s)\s+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Whitespace after these characters belongs to the number that follows
+# ("₹ ૫૦૦", "પિન: ૩૮૦૦૦૯", "× ૨", "+ ૧૦"), and "૧૦:૩૦ વાગ્યે" is a single
+# time expression, so none of them is a safe place to cut.
+BINDING_CHARACTERS = "₹×÷+-:"
+BINDING_SUFFIX = "વાગ્યે"
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_SEGMENT = 10000
+
+def _safe_cut(text, match, final):
+    """True/False for a whitespace run, or None if more input is needed to decide."""
+    if match.start() > 0 and text[match.start() - 1] in BINDING_CHARACTERS:
+        return False
+    rest = text[match.end():match.end() + len(BINDING_SUFFIX)]
+    if rest == BINDING_SUFFIX:
+        return False
+    if not final and BINDING_SUFFIX.startswith(rest):
+        return None
+    return True
+
+def _ends_with_abbreviation(text, end, abbreviations):
+    # Any suffix of the token counts, deliberately: the AbbreviationExpander
+    # pattern is unanchored, so normalize() also expands "તા." at the end of
+    # "હતા." ("હતારીખ") and never lets that "." end a sentence. Matching only
+    # whole tokens here would cut where normalize() does not and change the
+    # output. (The sentence tokenizer matches whole tokens; it does not expand.)
+    # Only the last `longest` characters of the token can form an abbreviation.
+    limit = max(end - abbreviations.longest, 0)
+    start = end
+    while start > limit and not text[start - 1].isspace():
+        start -= 1
+    token = text[start:end]
+    return any(token[i:] in abbreviations for i in range(len(token)))
+
+def segment_spans(text, final=False, max_segment=DEFAULT_MAX_SEGMENT, abbreviations=None):
+    """
+    Split text into segments that can be normalized independently.
+
+    Returns (spans, rest): the (start, end) spans of complete segments and the
+    offset where the unfinished tail starts. Segments end at sentence
+    delimiters or line breaks, except for a "." that closes one of the given
+    abbreviations (e.g. "ડૉ. પટેલ" stays together). A segment longer than
+    max_segment is cut at its last safe whitespace, or at max_segment if it
+    has none. With final=True the tail is returned as the last segment.
+    """
+    spans = []
+    start = 0
+    for match in WHITESPACE_RUN_PATTERN.finditer(text):
+        if not ((match.start() > 0 and text[match.start() - 1] in SENTENCE_DELIMITERS) or "\n" in match.group()):
+            continue
+        safe = _safe_cut(text, match, final)
+        if safe is None:
+            break
+        if (safe and abbreviations is not None and text[match.start() - 1] == "."
+                and _ends_with_abbreviation(text, match.start(), abbreviations)):
+            continue
+        if safe:
+            spans.append((start, match.start()))
+            start = match.end()
+
+    while len(text) - start > max_segment:
+        cut = None
+        for match in WHITESPACE_PATTERN.finditer(text, start, start + max_segment):
+            if match.start() > start and _safe_cut(text, match, True):
+                cut = match
+        if cut is None:
+            spans.append((start, start + max_segment))
+            start += max_segment
+        else:
+            spans.append((start, cut.start()))
+            start = cut.end()
+
+    if final and start < len(text):
+        spans.append((start, len(text)))
+        start = len(text)
+    return spans, start
+
+def _read_chunks(source, chunk_size):
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+def iter_normalize(source, normalizer=None, chunk_size=DEFAULT_CHUNK_SIZE, max_segment=DEFAULT_MAX_SEGMENT):
+    """
+    Normalize a file object or an iterable of strings segment by segment.
+
+    Input is read chunk_size characters at a time and only the unfinished
+    segment is kept between reads, so memory use does not depend on the input
+    size. Each normalized segment (usually one sentence) is yielded as soon as
+    it is complete; whitespace-only segments are skipped.
+    """
+    if normalizer is None:
+        normalizer = GujaratiNormalizer()
+    buffer = ""
+    for chunk in _read_chunks(source, chunk_size):
+        buffer += chunk
+        spans, rest = segment_spans(buffer, max_segment=max_segment, abbreviations=normalizer.abbreviations)
+        for start, end in spans:
+            output = normalizer.normalize(buffer[start:end])
+            if output:
+                yield output
+        buffer = buffer[rest:]
+
+    spans, _ = segment_spans(buffer, final=True, max_segment=max_segment, abbreviations=normalizer.abbreviations)
+    for start, end in spans:
+        output = normalizer.normalize(buffer[start:end])
+        if output:
+            yield output
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normalize Gujarati text from stdin to stdout, one segment per line.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-segment", type=int, default=DEFAULT_MAX_SEGMENT)
+    parser.add_argument("--single-pass", action="store_true", help="use the single-pass scanning mode")
+    args = parser.parse_args(argv)
+
+    sys.stdin.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8")
+    normalizer = GujaratiNormalizer(single_pass=args.single_pass)
+    for segment in iter_normalize(sys.stdin, normalizer, args.chunk_size, args.max_segment):
+        sys.stdout.write(segment + "\n")
+
+if __name__ == "__main__":
+    main()
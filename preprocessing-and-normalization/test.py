@@ -1,4 +1,18 @@
-from normalizer import normalize_text
+import io
+import os
+import sys
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from abbreviations import AbbreviationExpander
+from batch import normalize_batch
+from cache import CachedNormalizer
+from incremental import IncrementalNormalizer
+from instrumentation import NormalizationStats
+from normalizer import GujaratiNormalizer, normalize_text
+from preprocessor import GujaratiTextPreprocessor
+from streaming import iter_normalize
+from verbalize import verbalize_numbers
 
 test_cases = [
     ("૦૧૨૩૪૫૬૭૮૯", "શૂન્ય એક બે ત્રણ ચાર પાંચ છ સાત આઠ નવ"),
@@ -72,17 +86,240 @@ test_cases = [
     "શ્રીમાન રમેશે પહેલા માળે આવેલી બીજી ઓફિસમાં રૂપિયા પાંચ હજાર નું રોકાણ કર્યું")
 ]
 
-total_cases = 0
-cases_passed = 0
-for idx, (inp, expected) in enumerate(test_cases, 1):
-    output = normalize_text(inp)
-    print(f"Test Case {idx}:")
-    print("Input:    ", repr(inp))
-    print("Output:   ", output)
-    print("Expected: ", expected)
-    result = "PASS" if output == expected else "FAIL"
-    print("Result:   ", result, "\n")
-    total_cases += 1
-    if result == "PASS":
-        cases_passed += 1
-print(f"Passed {cases_passed}/{total_cases} cases")
\ No newline at end of file
+# Stage matches that touch: each stage reads the text as the stages before it
+# left it, so "-૫" is read before "૧૦" loses its word boundary. Single-pass
+# mode must give the sequential output.
+stage_order_cases = [
+    ("૧૦-૫", "૧૦માઈનસ પાંચ"),
+    ("૨+૩", "૨પ્લસ ત્રણ"),
+    ("૫×૨૦", "૫ગુણા વીસ"),
+    ("૧૨-૧૫ લોકો", "૧૨માઈનસ પંદર લોકો"),
+    ("૧૨૩/૦૫/૨૦૨૩", "૧ત્રેવીસમી મે બે હજાર ત્રેવીસ"),
+    ("૧૦ -૫", "દસ માઈનસ પાંચ"),
+]
+
+lexicon_tsv = "# domain lexicon\nસ.પો.\tસરકારી પોલીસ\nપો.\tપોસ્ટ\nમ્યુ.\tમ્યુઝિયમ\n"
+
+lexicon_cases = [
+    ("સ.પો. સ્ટેશન", "સરકારી પોલીસ સ્ટેશન"),
+    ("પો. ઓફિસ", "પોસ્ટ ઓફિસ"),
+    ("મ્યુ. જોયું", "મ્યુઝિયમ જોયું"),
+    ("અ.મ્યુ.કો.", "અમદાવાદ મ્યુનિસિપલ કોર્પોરેશન"),
+    ("૨ કિ.ગ્રા.", "બે કિલોગ્રામ"),
+]
+
+def lexicon_normalizer():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lexicon.tsv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(lexicon_tsv)
+        expander = AbbreviationExpander.from_tsv(path, entries=GujaratiTextPreprocessor.abbrev_dict)
+    return GujaratiNormalizer(abbreviations=expander)
+
+def run_tests(normalize, label, cases=test_cases):
+    total_cases = 0
+    cases_passed = 0
+    for idx, (inp, expected) in enumerate(cases, 1):
+        output = normalize(inp)
+        print(f"Test Case {idx} ({label}):")
+        print("Input:    ", repr(inp))
+        print("Output:   ", output)
+        print("Expected: ", expected)
+        result = "PASS" if output == expected else "FAIL"
+        print("Result:   ", result, "\n")
+        total_cases += 1
+        if result == "PASS":
+            cases_passed += 1
+    print(f"Passed {cases_passed}/{total_cases} cases ({label})")
+
+stream_text = "તા.૦૧/૦૧/૨૦૨૪ના રોજ ડૉ. પટેલે ₹૧,૨૩,૪૫૬.૫૦ ચૂકવ્યા. પિન: ૩૮૦૦૦૯ છે!\nસમય ૧૦:૩૦ વાગ્યે હતો? કિંમત ₹ ૫૦૦ છે."
+
+stream_expected = " | ".join([
+    "તારીખ પહેલી જાન્યુઆરી બે હજાર ચોવીસના રોજ ડોક્ટર પટેલે રૂપિયા એક લાખ ત્રેવીસ હજાર ચારસો છપ્પન અને પચાસ પૈસા ચૂકવ્યા",
+    "પિન: ત્રણ આઠ શૂન્ય શૂન્ય શૂન્ય નવ છે",
+    "સમય દસ વાગ્યા ત્રીસ મિનિટે હતો",
+    "કિંમત રૂપિયા પાંચસો છે",
+])
+
+# The same text read with different chunk sizes must give the same segments.
+stream_cases = [(chunk_size, stream_expected) for chunk_size in (1, 3, 7, 64, 4096)]
+
+# A word ending in an abbreviation ("હતા." ends in "તા.") is expanded by
+# normalize(), so its "." must not end a segment either: streaming stays
+# identical to normalizing the whole text.
+abbreviation_suffix_text = "તેઓ ત્યાં હતા. પછી ઘરે ગયા. કુ. મીરા આવી."
+abbreviation_suffix_segments = [normalize_text("તેઓ ત્યાં હતા. પછી ઘરે ગયા."), normalize_text("કુ. મીરા આવી.")]
+abbreviation_suffix_cases = [(chunk_size, abbreviation_suffix_segments) for chunk_size in (1, 5, 4096)]
+
+def abbreviation_suffix_output(chunk_size):
+    return list(iter_normalize(io.StringIO(abbreviation_suffix_text), chunk_size=chunk_size))
+
+def stream_output(chunk_size):
+    return " | ".join(iter_normalize(io.StringIO(stream_text), chunk_size=chunk_size))
+
+def batch_outputs():
+    inputs = [inp for inp, _ in test_cases]
+    results = normalize_batch(inputs, workers=2, chunksize=8)
+    return {inp: result["error"] or result["output"] for inp, result in zip(inputs, results)}
+
+# Oversized input and digit runs too long to convert to an int.
+limit_cases = [
+    ("કિંમત ₹૫૦૦ છે", "[Error: Input too long]"),
+    ("૧" * 101, " ".join(["એક"] * 101)),
+    ("1" * 5000 + "%", " ".join(["એક"] * 5000) + "%"),
+    ("૨" * 5000 + "મી", " ".join(["બે"] * 5000) + "મી"),
+    ("૧,," * 3000, " ".join(["એક"] * 3000)),
+]
+
+def limited_normalize(text):
+    return GujaratiNormalizer(max_input_length=12).normalize(text) if len(text) < 20 else normalize_text(text)
+
+def cache_outputs():
+    # Fill the sqlite tier in one session and read it back from a fresh one.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        with CachedNormalizer(path=path, max_entries=16) as cache:
+            for inp, _ in test_cases:
+                cache.normalize(inp)
+        with CachedNormalizer(path=path, max_entries=16) as cache:
+            outputs = {inp: cache.normalize(inp) for inp, _ in test_cases}
+            assert cache.stats()["misses"] == 0, cache.stats()
+    return outputs
+
+def shared_cache_misses():
+    # Normalizers with different fingerprints share one store without dropping each other's entries.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        with CachedNormalizer(path=path) as cache:
+            outputs = [cache.normalize(inp) for inp, _ in test_cases]
+        with CachedNormalizer(GujaratiNormalizer(single_pass=True), path=path) as cache:
+            cache.normalize(test_cases[0][0])
+        with CachedNormalizer(path=path) as cache:
+            assert [cache.normalize(inp) for inp, _ in test_cases] == outputs
+            return cache.stats()["misses"]
+
+def shared_cache_limits(text):
+    # A limit's "[Error: Input too long]" must not be served to normalizers with another limit, or none.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        outputs = []
+        for limit in (12, None, 100):
+            with CachedNormalizer(GujaratiNormalizer(max_input_length=limit), path=path) as cache:
+                outputs.append(cache.normalize(text))
+        return " | ".join(outputs)
+
+shared_limit_cases = [("કિંમત ₹૫૦૦ છે", "[Error: Input too long] | કિંમત રૂપિયા પાંચસો છે | કિંમત રૂપિયા પાંચસો છે")]
+
+# A lexicon change must not be answered from the cache.
+cache_invalidation_cases = [("ગુ. રાજ્ય", "ગુજરાત રાજ્ય")]
+
+def cache_after_lexicon_change(text):
+    cache = CachedNormalizer()
+    cache.normalize(text)
+    cache.abbreviations.add("ગુ.", "ગુજરાત")
+    return cache.normalize(text)
+
+def instrumented_outputs():
+    stats = NormalizationStats()
+    normalizer = GujaratiNormalizer(stats=stats)
+    outputs = {inp: normalizer.normalize(inp) for inp, _ in test_cases}
+    counters = stats.to_dict()
+    assert counters["total"]["calls"] == len(test_cases), counters["total"]
+    assert counters["currency"]["matches"] == sum("₹" in inp for inp, _ in test_cases if not expected_error(inp)), counters["currency"]
+    assert 'stage="currency"' in stats.to_prometheus()
+    return outputs
+
+def expected_error(inp):
+    return dict(test_cases)[inp].startswith("[Error")
+
+# Replaced stretches are shown as "source=output", verbatim text as is.
+alignment_cases = [
+    ("કિંમત ₹૨.૫ છે!", "કિંમત |₹૨.૫=રૂપિયા બે અને પચાસ પૈસા| છે"),
+    ("ડૉ. પટેલ ૧૦:૩૦ વાગ્યે", "ડૉ.=ડોક્ટર| પટેલ |૧૦:૩૦ વાગ્યે=દસ વાગ્યા ત્રીસ મિનિટે"),
+    ("  હા...  ના ", "હા|...  = |ના"),
+]
+
+def alignment_output(text):
+    output, alignment = GujaratiNormalizer().normalize_with_alignment(text)
+    pieces = []
+    for source_start, source_end, output_start, output_end in alignment:
+        source, target = text[source_start:source_end], output[output_start:output_end]
+        pieces.append(target if source == target else source + "=" + target)
+    return "|".join(pieces)
+
+# (start, end, replacement) edits applied one after another to stream_text.
+incremental_cases = [
+    ([(stream_text.index("૧/"), stream_text.index("૧/") + 1, "૨")], stream_expected.replace("પહેલી", "બીજી").replace(" | ", " ")),
+    ([(0, 0, "નમસ્તે. ")], "નમસ્તે " + stream_expected.replace(" | ", " ")),
+    ([(len(stream_text) - 1, len(stream_text), "")], stream_expected.replace(" | ", " ")),
+    ([(stream_text.index("\n"), stream_text.index("\n") + 1, " ")], " ".join(iter_normalize([stream_text.replace("\n", " ")]))),
+    ([(0, len(stream_text), "")], ""),
+    ([(0, 0, "x")], "[Error: Invalid characters] " + stream_expected.split(" | ", 1)[1].replace(" | ", " ")),
+]
+
+def incremental_output(edits):
+    editor = IncrementalNormalizer(stream_text)
+    output = editor.output
+    for start, end, replacement in edits:
+        output_start, output_end, splice = editor.edit(start, end, replacement)
+        output = output[:output_start] + splice + output[output_end:]
+    # The returned splices must rebuild the same output as a fresh run.
+    fresh = IncrementalNormalizer(editor.text).output
+    return output if output == editor.output == fresh else f"{output!r} != {fresh!r}"
+
+# Column values around every part boundary; each must read exactly as the original
+# per-number algorithm reads it.
+verbalize_values = [
+    0, 1, 9, 10, 99, 100, 101, 110, 999, 1000, 1001, 1100, 99999, 100000, 100001, 123456,
+    9999999, 10000000, 10000001, 12345678, 999999999, 1000000000, 1000000005, 1010000000,
+    1000100000, 123456789012, 10000000000000, 9223372036854775807,
+]
+verbalize_cases = [(value, GujaratiTextPreprocessor().compose_number_words(value)) for value in verbalize_values] + [
+    (123456, "એક લાખ ત્રેવીસ હજાર ચારસો છપ્પન"),
+    (1010000000, "એક અબજ એક કરોડ"),
+]
+
+# Arrays of small dtypes, which LAKH does not fit, and uint64 past the int64 range.
+verbalize_dtype_values = {"int8": [0, 7, 100, 127], "uint8": [0, 99, 255], "int16": [0, 1000, 32767],
+                          "uint16": [0, 65535], "uint64": [0, 100000, 18446744073709551615]}
+verbalize_dtype_cases = [(dtype, [GujaratiTextPreprocessor().number_to_words_indian(value) for value in values])
+                         for dtype, values in verbalize_dtype_values.items()]
+
+def verbalize_dtype_output(dtype):
+    return verbalize_numbers(np.array(verbalize_dtype_values[dtype], dtype=dtype)).tolist()
+
+def verbalize_outputs():
+    return dict(zip(verbalize_values, verbalize_numbers(verbalize_values)))
+
+# Offsets reported by invalid_positions: disallowed characters, and the Latin
+# letters of words that mix scripts.
+validation_cases = [
+    ("ગુજરાતી ભાષા સરળ છે.", []),
+    ("Dr. Shah ૧૦% ₹૫૦", []),
+    ("કિંમત § છે", [6]),
+    ("ગુજરાતીabc ok", [7, 8, 9]),
+    ("a.ક b§", [0, 5]),
+    ("x\u3000ક", []),
+]
+
+if __name__ == "__main__":
+    run_tests(normalize_text, "sequential")
+    run_tests(GujaratiNormalizer(single_pass=True).normalize, "single-pass")
+    run_tests(normalize_text, "stage order", stage_order_cases)
+    run_tests(GujaratiNormalizer(single_pass=True).normalize, "single-pass stage order", stage_order_cases)
+    run_tests(lexicon_normalizer().normalize, "TSV lexicon", lexicon_cases)
+    run_tests(batch_outputs().get, "batch")
+    run_tests(stream_output, "streaming", stream_cases)
+    run_tests(abbreviation_suffix_output, "streaming abbreviation suffix", abbreviation_suffix_cases)
+    run_tests(verbalize_outputs().get, "verbalize", verbalize_cases)
+    run_tests(verbalize_dtype_output, "verbalize dtypes", verbalize_dtype_cases)
+    run_tests(limited_normalize, "limits", limit_cases)
+    run_tests(instrumented_outputs().get, "instrumented")
+    run_tests(cache_outputs().get, "cache")
+    run_tests(cache_after_lexicon_change, "cache invalidation", cache_invalidation_cases)
+    run_tests(lambda _: shared_cache_misses(), "shared cache", [("misses after another fingerprint", 0)])
+    run_tests(shared_cache_limits, "shared cache limits", shared_limit_cases)
+    run_tests(lambda text: GujaratiNormalizer().normalize_with_alignment(text)[0], "aligned")
+    run_tests(alignment_output, "alignment spans", alignment_cases)
+    run_tests(incremental_output, "incremental", incremental_cases)
+    run_tests(GujaratiTextPreprocessor().invalid_positions, "validation", validation_cases)
\ No newline at end of file
@@ -0,0 +1,82 @@
+import numpy as np
+from preprocessor import GujaratiTextPreprocessor
+
+CRORE = 10000000
+LAKH = 100000
+
+# The high part (value // 1,00,000) below this covers a crore count under 100
+# and a lakh count, and is served from a table; above it the "અબજ" count is
+# verbalized separately.
+HIGH_TABLE_SIZE = 100 * CRORE // LAKH
+
+_tables_by_class = {}
+
+def _word_tables(preprocessor):
+    cls = type(preprocessor)
+    tables = _tables_by_class.get(cls)
+    if tables is None:
+        low = np.array(preprocessor.number_table(), dtype=object)
+        # Below-lakh words as a trailing part: a zero adds nothing ("એક લાખ").
+        low_part = low.copy()
+        low_part[0] = ""
+        tables = _tables_by_class[cls] = (low, low_part, _with_separator([_high_words(preprocessor, h) for h in range(HIGH_TABLE_SIZE)]))
+    return tables
+
+def _with_separator(words):
+    """words followed by the same words with a trailing space, for parts followed by more words."""
+    words = np.array(words, dtype=object)
+    followed = words + " "
+    followed[words == ""] = ""
+    return np.concatenate([words, followed])
+
+def _high_words(preprocessor, high):
+    """Words for the crore and lakh parts of high * 1,00,000, as compose_number_words builds them."""
+    crore, lakh = divmod(high, 100)
+    parts = []
+    if crore > 0:
+        parts.append(preprocessor.number_to_words(crore) + " કરોડ")
+    if lakh > 0:
+        parts.append(preprocessor.number_to_words(lakh) + " લાખ")
+    return " ".join(parts)
+
+def verbalize_numbers(values, preprocessor=None):
+    """
+    Verbalize a whole array of non-negative integers at once.
+
+    Returns an object array of the same shape whose strings match
+    preprocessor.number_to_words_indian() for every element. Each value is
+    split with vectorized integer arithmetic into its "અબજ", crore/lakh and
+    below-lakh parts; the last two are looked up in word tables built once per
+    preprocessor class, and only the distinct "અબજ" counts are verbalized one
+    by one.
+    """
+    if preprocessor is None:
+        preprocessor = GujaratiTextPreprocessor()
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.integer):
+        raise TypeError(f"verbalize_numbers expects an integer array, got dtype {values.dtype}")
+    if values.size and values.min() < 0:
+        raise ValueError("verbalize_numbers expects non-negative integers")
+
+    low_table, low_part_table, high_table = _word_tables(preprocessor)
+    # Widen first: LAKH does not fit small dtypes such as int8 or uint16.
+    flat = values.ravel().astype(np.uint64 if np.issubdtype(values.dtype, np.unsignedinteger) else np.int64)
+    high, low = np.divmod(flat, LAKH)
+    words = low_table[low]
+
+    large = np.flatnonzero(high)
+    if large.size:
+        billions, crore_lakh = np.divmod(high[large], HIGH_TABLE_SIZE)
+        crore_lakh = crore_lakh.astype(np.intp)
+        low = low[large]
+        # Each part picks its trailing-space variant when a later part follows.
+        words[large] = high_table[crore_lakh + HIGH_TABLE_SIZE * (low > 0)] + low_part_table[low]
+
+        huge = np.flatnonzero(billions)
+        if huge.size:
+            unique, inverse = np.unique(billions[huge], return_inverse=True)
+            billion_table = _with_separator([preprocessor.convert_crores(int(b) * 100) for b in unique])
+            followed = (crore_lakh[huge] > 0) | (low[huge] > 0)
+            huge = large[huge]
+            words[huge] = billion_table[inverse + len(unique) * followed] + words[huge]
+    return words.reshape(values.shape)
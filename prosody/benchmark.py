@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from prosody import GujaratiPhonemeDictionary, GujaratiProsodyModel, extract_phonemes
+
+PROSE = (
+    "ગુજરાતી ભાષા સરળ અને મધુર છે. તમે ગુજરાતી શીખી રહ્યા છો! "
+    "સ્વપ્ન જોયું! પક્ષી ઊડ્યું? વૃક્ષ ઊગ્યું. જ્ઞાન પ્રાપ્તિ માટે શ્રદ્ધા જરૂરી છે. "
+    "કૃષ્ણ અને રાધા નૃત્ય કરે છે. વ્યાકરણ શીખવું સહેલું છે. "
+)
+
+def best_time(func, arg, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+class DictProsodyModel(GujaratiProsodyModel):
+    # The per-phoneme dict implementation generate_prosody replaced, for comparison.
+    def generate_prosody(self, phoneme_details, sentence_type='statement'):
+        num_phonemes = len(phoneme_details)
+        enhanced = []
+        for i, phoneme in enumerate(phoneme_details):
+            position = self._determine_position_scalar(i, num_phonemes)
+            enhanced.append({
+                **phoneme,
+                'position': position,
+                'stress': self._apply_stress_pattern(position),
+                'duration': self.duration_modifiers.get(phoneme['type'], 1.0),
+                'base_pitch': 1.0
+            })
+        contour_func = self.intonation_contours.get(sentence_type, self.intonation_contours['statement'])
+        for i, phoneme in enumerate(enhanced):
+            norm_pos = i / (num_phonemes - 1) if num_phonemes > 1 else 0.5
+            phoneme['pitch'] = phoneme['base_pitch'] * contour_func(norm_pos) * phoneme['stress']
+            phoneme['pitch'] *= np.random.uniform(0.95, 1.05)
+        durations = [p['duration'] for p in enhanced]
+        pitches = [p['pitch'] for p in enhanced]
+        rhythm = {
+            'avg_duration': np.mean(durations),
+            'duration_variance': np.var(durations),
+            'avg_pitch': np.mean(pitches),
+            'pitch_range': max(pitches) - min(pitches),
+            'speech_rate': len(phoneme_details) / sum(durations)
+        }
+        return {'phonemes': enhanced, 'rhythm': rhythm, 'sentence_type': sentence_type}
+
+    def _determine_position_scalar(self, index, total):
+        if index == 0:
+            return 'initial'
+        elif index == total - 1:
+            return 'final'
+        elif index == total - 2:
+            return 'penultimate'
+        return 'medial'
+
+def sentence_details(phoneme_count):
+    # Non-punctuation phoneme details of the prose, repeated to phoneme_count.
+    _, _, details = extract_phonemes(PROSE, GujaratiPhonemeDictionary())
+    details = [detail for detail in details if detail['type'] != 'punctuation']
+    return (details * (phoneme_count // len(details) + 1))[:phoneme_count]
+
+def bench_frame(sizes=(20, 200, 2000), sentences=200):
+    model = GujaratiProsodyModel()
+    reference = DictProsodyModel()
+
+    print("=== Vectorized ProsodyFrame vs per-phoneme dicts (generate_prosody) ===")
+    for size in sizes:
+        details = sentence_details(size)
+        np.random.seed(0)
+        expected = reference.generate_prosody(details, 'question')
+        np.random.seed(0)
+        result = model.generate_prosody(details, 'question')
+        assert np.allclose([p['pitch'] for p in expected['phonemes']], [p['pitch'] for p in result['phonemes']])
+
+        batch = [details] * sentences
+        old = best_time(lambda b: [reference.generate_prosody(d, 'question') for d in b], batch) / sentences
+        new = best_time(lambda b: [model.generate_prosody(d, 'question', as_frame=True) for d in b], batch) / sentences
+        views = best_time(lambda b: [model.generate_prosody(d, 'question') for d in b], batch) / sentences
+        print(f"{size:>5} phonemes: dicts {old * 1e6:8.1f} us, frame {new * 1e6:7.1f} us ({old / new:.1f}x), "
+              f"frame + dicts {views * 1e6:8.1f} us ({old / views:.1f}x)")
+
+def bench_batch(sentence_count=2000):
+    model = GujaratiProsodyModel()
+    types = ('statement', 'question', 'exclamation')
+    rng = np.random.default_rng(0)
+    sentences = [sentence_details(int(size)) for size in rng.integers(5, 60, sentence_count)]
+    sentence_types = [types[i % len(types)] for i in range(sentence_count)]
+
+    print("=== generate_prosody_batch vs generate_prosody per sentence ===")
+    np.random.seed(0)
+    expected = [model.generate_prosody(s, t, as_frame=True) for s, t in zip(sentences, sentence_types)]
+    np.random.seed(0)
+    batch = model.generate_prosody_batch(sentences, sentence_types)
+    assert np.allclose(np.concatenate([r['phonemes'].pitch for r in expected]), batch.pitch)
+    assert np.allclose([r['rhythm']['pitch_range'] for r in expected], batch.rhythm['pitch_range'])
+
+    pairs = list(zip(sentences, sentence_types))
+    loop = best_time(lambda b: [model.generate_prosody(s, t, as_frame=True) for s, t in b], pairs)
+    batched = best_time(lambda b: model.generate_prosody_batch(sentences, sentence_types), pairs)
+    phonemes = len(batch.pitch)
+    print(f"{sentence_count} sentences, {phonemes} phonemes: per sentence {loop * 1e3:7.1f} ms, "
+          f"batch {batched * 1e3:6.1f} ms ({loop / batched:.1f}x)")
+
+def main():
+    bench_frame()
+    bench_batch()
+
+if __name__ == "__main__":
+    main()
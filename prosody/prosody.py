@@ -1,58 +1,126 @@
 import re
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+from gujarati.inventory import ipa_table
+from gujarati.memo import WordMemo
+
+# Bump whenever GujaratiPhonemeDictionary or extract_phonemes change what a
+# word extracts to; memoized extractions from older rules are then dropped.
+PHONEME_RULES_VERSION = 2
 
 class GujaratiPhonemeDictionary:
-    """Comprehensive Gujarati Phoneme Mapping"""
-    def __init__(self):
-        # Vowels 
-        self.vowels = {
-            'અ': '/ə/', 'આ': '/aː/', 
-            'ઇ': '/i/', 'ઈ': '/iː/',
-            'ઉ': '/u/', 'ઊ': '/uː/', 
-            'ઋ': '/ɾ̩/', 'ૠ': '/ɾ̩ː/',
-            'એ': '/eː/', 'ઐ': '/əi/', 
-            'ઓ': '/oː/', 'ઔ': '/əu/',
-            'અં': '/əŋ/',
-            'ા': '/aː/', 
-            'િ': '/i/', 'ી': '/iː/', 
-            'ુ': '/u/', 'ૂ': '/uː/',
-            'ૃ': '/ɾ̩/', 'ૄ': '/ɾ̩ː/', 
-            'ે': '/eː/', 'ૈ': '/əi/',
-            'ો': '/oː/', 'ૌ': '/əu/'
-        }
-        
-        # Vowel Modifiers
-        self.vowel_modifiers = {
-            'ં': '/ŋ/',   # Anusvara
-            'ઃ': '/h/',   # Visarga
-            'ઁ': '/˜/',   # Candrabindu
-            '્': None     # Virama (Halant)
-        }
-        
-        # Consonants
-        self.consonants = {
-            'ક': '/k/', 'ગ': '/ɡ/', 'ચ': '/tʃ/', 'જ': '/dʒ/',
-            'ટ': '/ʈ/', 'ડ': '/ɖ/', 
-            'ત': '/t/',
-            'દ': '/d̪/',
-            'પ': '/p/', 'બ': '/b/',
-            'ખ': '/kʰ/', 'ઘ': '/ɡʱ/',
-            'છ': '/tʃʰ/', 'ઝ': '/dʒʱ/',
-            'ઠ': '/ʈʰ/', 'ઢ': '/ɖʱ/', 'થ': '/t̪ʰ/', 'ધ': '/d̪ʱ/',
-            'ફ': '/pʰ/',
-            'ભ': '/bʱ/',
-            'મ': '/m/', 'ન': '/n/', 'ણ': '/ɳ/', 'ઙ': '/ŋ/', 'ઞ': '/ɲ/',
-            'સ': '/s/', 'શ': '/ʃ/', 'હ': '/h/', 'ષ': '/ʂ/',
-            'ય': '/j/', 'ર': '/ɾ/', 'લ': '/l/', 'વ': '/ʋ/', 'ળ': '/ɭ/'
+    """Comprehensive Gujarati Phoneme Mapping, read-only views of the shared inventory"""
+    vowels = ipa_table('vowel', 'matra')
+    vowel_modifiers = ipa_table('modifier', 'virama')    # Anusvara, visarga, candrabindu; virama maps to None
+    consonants = ipa_table('consonant')
+    digits = ipa_table('digit')
+
+
+# Phoneme positions, as ProsodyFrame.position stores them.
+POSITIONS = ('initial', 'medial', 'final', 'penultimate')
+INITIAL, MEDIAL, FINAL, PENULTIMATE = range(len(POSITIONS))
+
+class ProsodyFrame:
+    """
+    Prosody of one sentence as a struct of arrays.
+
+    position (codes into POSITIONS), stress, duration, base_pitch and pitch
+    hold one entry per phoneme of details, the phoneme dicts the frame was
+    built from; pitch is None until intonation is applied. Indexing or
+    iterating the frame gives the per-phoneme dicts generate_prosody
+    returns, built on access; to_dicts() builds them all. Those dicts are
+    copies: change the frame through its arrays (frame.duration[i] = ...).
+    """
+    def __init__(self, details: List[Dict[str, Any]], position: np.ndarray, stress: np.ndarray,
+                 duration: np.ndarray, base_pitch: np.ndarray, pitch: np.ndarray = None):
+        self.details = details
+        self.position = position
+        self.stress = stress
+        self.duration = duration
+        self.base_pitch = base_pitch
+        self.pitch = pitch
+
+    def __len__(self) -> int:
+        return len(self.details)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_dicts()[index]
+        phoneme = dict(self.details[index])
+        phoneme['position'] = POSITIONS[self.position[index]]
+        phoneme['stress'] = float(self.stress[index])
+        phoneme['duration'] = float(self.duration[index])
+        phoneme['base_pitch'] = float(self.base_pitch[index])
+        if self.pitch is not None:
+            phoneme['pitch'] = float(self.pitch[index])
+        return phoneme
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        columns = [[POSITIONS[code] for code in self.position.tolist()], self.stress.tolist(),
+                   self.duration.tolist(), self.base_pitch.tolist()]
+        names = ['position', 'stress', 'duration', 'base_pitch']
+        if self.pitch is not None:
+            columns.append(self.pitch.tolist())
+            names.append('pitch')
+        return [{**detail, **dict(zip(names, values))} for detail, values in zip(self.details, zip(*columns))]
+
+    def rhythm(self) -> Dict[str, float]:
+        duration, pitch = self.duration, self.pitch
+        return {
+            'avg_duration': duration.mean(),
+            'duration_variance': duration.var(),
+            'avg_pitch': pitch.mean(),
+            'pitch_range': pitch.max() - pitch.min(),
+            'speech_rate': len(duration) / duration.sum()
         }
-        
-        # Digits
-        self.digits = {
-            '૦': '0', '૧': '1', '૨': '2', '૩': '3', '૪': '4',
-            '૫': '5', '૬': '6', '૭': '7', '૮': '8', '૯': '9'
+
+class ProsodyBatch:
+    """
+    Prosody of many sentences as ragged (CSR) arrays.
+
+    position, stress, duration, base_pitch and pitch hold the phonemes of
+    every sentence back to back, and details their phoneme dicts; sentence i
+    spans offsets[i]:offsets[i + 1]. rhythm maps each rhythm metric to an
+    array with one value per sentence (NaN for sentences with no phonemes).
+    batch[i] is what generate_prosody(..., as_frame=True) returns for
+    sentence i, its frame viewing the batch's arrays.
+    """
+    def __init__(self, details: List[Dict[str, Any]], offsets: np.ndarray, sentence_types: List[str],
+                 position: np.ndarray, stress: np.ndarray, duration: np.ndarray, base_pitch: np.ndarray,
+                 pitch: np.ndarray, rhythm: Dict[str, np.ndarray]):
+        self.details = details
+        self.offsets = offsets
+        self.sentence_types = sentence_types
+        self.position = position
+        self.stress = stress
+        self.duration = duration
+        self.base_pitch = base_pitch
+        self.pitch = pitch
+        self.rhythm = rhythm
+
+    def __len__(self) -> int:
+        return len(self.sentence_types)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        index = range(len(self))[index]
+        start, end = self.offsets[index], self.offsets[index + 1]
+        frame = ProsodyFrame(self.details[start:end], self.position[start:end], self.stress[start:end],
+                             self.duration[start:end], self.base_pitch[start:end], self.pitch[start:end])
+        return {
+            'phonemes': frame,
+            'rhythm': {name: values[index] for name, values in self.rhythm.items()},
+            'sentence_type': self.sentence_types[index]
         }
 
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
 
 class GujaratiProsodyModel:
     """Prosody modeling for Gujarati speech"""
@@ -79,94 +147,147 @@ class GujaratiProsodyModel:
             'consonant-vowel': 1.0  # Normal duration
         }
     
+    def analyze_frame(self, phoneme_details: List[Dict[str, Any]]) -> ProsodyFrame:
+        """Position, stress and duration of every phoneme, as arrays"""
+        num_phonemes = len(phoneme_details)
+        position = self._determine_positions(np.arange(num_phonemes), num_phonemes)
+        stress = np.array([self._apply_stress_pattern(name) for name in POSITIONS])[position]
+        modifiers = self.duration_modifiers
+        duration = np.array([modifiers.get(phoneme['type'], 1.0) for phoneme in phoneme_details], dtype=float)
+        return ProsodyFrame(phoneme_details, position, stress, duration, np.ones(num_phonemes))
+    
     def analyze_sentence_structure(self, phoneme_details: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Analyze sentence structure for prosody generation"""
-        num_phonemes = len(phoneme_details)
-        enhanced_phonemes = []
-        
-        for i, phoneme in enumerate(phoneme_details):
-            position = self._determine_position(i, num_phonemes)
-            stress = self._apply_stress_pattern(position)
-            duration = self._apply_duration_modifier(phoneme['type'])
-            
-            enhanced_phonemes.append({
-                **phoneme,
-                'position': position,
-                'stress': stress,
-                'duration': duration,
-                'base_pitch': 1.0
-            })
-        
-        return enhanced_phonemes
+        return self.analyze_frame(phoneme_details).to_dicts()
     
-    def _determine_position(self, index: int, total: int) -> str:
-        """Determine phoneme position in sentence"""
-        if index == 0:
-            return 'initial'
-        elif index == total - 1:
-            return 'final'
-        elif index == total - 2:
-            return 'penultimate'
-        return 'medial'
+    def _determine_positions(self, index: np.ndarray, total) -> np.ndarray:
+        """Position codes of phonemes at index in sentences of total phonemes"""
+        position = np.full(len(index), MEDIAL, dtype=np.int8)
+        position[index == total - 2] = PENULTIMATE
+        position[index == total - 1] = FINAL
+        position[index == 0] = INITIAL
+        return position
     
     def _apply_stress_pattern(self, position: str) -> float:
         """Apply stress pattern based on position"""
         return self.stress_patterns.get(position, 1.0)
     
-    def _apply_duration_modifier(self, phoneme_type: str) -> float:
-        """Apply duration modification based on phoneme type"""
-        return self.duration_modifiers.get(phoneme_type, 1.0)
+    def _contour(self, sentence_type: str, norm_pos: np.ndarray) -> np.ndarray:
+        """Pitch multipliers of the sentence type's contour at norm_pos"""
+        contour_func = self.intonation_contours.get(sentence_type, 
+                                                  self.intonation_contours['statement'])
+        try:
+            multiplier = np.asarray(contour_func(norm_pos), dtype=float)
+        except TypeError:
+            # A contour written for scalars only (e.g. with math.sin).
+            multiplier = np.array([contour_func(x) for x in norm_pos.tolist()], dtype=float)
+        return np.broadcast_to(multiplier, norm_pos.shape)
+    
+    def apply_intonation_frame(self, frame: ProsodyFrame, sentence_type: str = 'statement') -> ProsodyFrame:
+        """Apply intonation contour to a frame's phonemes, setting its pitch"""
+        num_phonemes = len(frame)
+        norm_pos = np.arange(num_phonemes) / (num_phonemes - 1) if num_phonemes > 1 else np.full(num_phonemes, 0.5)
+        frame.pitch = frame.base_pitch * self._contour(sentence_type, norm_pos) * frame.stress
+        frame.pitch *= np.random.uniform(0.95, 1.05, num_phonemes)
+        return frame
     
     def apply_intonation(self, enhanced_phonemes: List[Dict[str, Any]], 
                         sentence_type: str = 'statement') -> List[Dict[str, Any]]:
         """Apply intonation contour to phonemes"""
-        contour_func = self.intonation_contours.get(sentence_type, 
-                                                  self.intonation_contours['statement'])
-        num_phonemes = len(enhanced_phonemes)
-        
-        for i, phoneme in enumerate(enhanced_phonemes):
-            norm_pos = i / (num_phonemes - 1) if num_phonemes > 1 else 0.5
-            pitch_multiplier = contour_func(norm_pos)
-            phoneme['pitch'] = phoneme['base_pitch'] * pitch_multiplier * phoneme['stress']
-            phoneme['pitch'] *= np.random.uniform(0.95, 1.05)
-        
+        frame = ProsodyFrame(enhanced_phonemes, np.zeros(len(enhanced_phonemes), dtype=np.int8),
+                             np.array([phoneme['stress'] for phoneme in enhanced_phonemes], dtype=float), None,
+                             np.array([phoneme['base_pitch'] for phoneme in enhanced_phonemes], dtype=float))
+        self.apply_intonation_frame(frame, sentence_type)
+        for phoneme, pitch in zip(enhanced_phonemes, frame.pitch.tolist()):
+            phoneme['pitch'] = pitch
         return enhanced_phonemes
     
     def generate_prosody(self, phoneme_details: List[Dict[str, Any]], 
-                        sentence_type: str = 'statement') -> Dict[str, Any]:
-        """Complete prosody generation pipeline"""
-        enhanced = self.analyze_sentence_structure(phoneme_details)
-        prosodic_phonemes = self.apply_intonation(enhanced, sentence_type)
-        
-        # Calculate rhythm metrics
-        durations = [p['duration'] for p in prosodic_phonemes]
-        pitches = [p['pitch'] for p in prosodic_phonemes]
-        
-        rhythm = {
-            'avg_duration': np.mean(durations),
-            'duration_variance': np.var(durations),
-            'avg_pitch': np.mean(pitches),
-            'pitch_range': max(pitches) - min(pitches),
-            'speech_rate': len(phoneme_details) / sum(durations)
-        }
-        
+                        sentence_type: str = 'statement', as_frame: bool = False) -> Dict[str, Any]:
+        """
+        Complete prosody generation pipeline
+
+        'phonemes' is a list of per-phoneme dicts; with as_frame=True it is
+        the ProsodyFrame instead, whose arrays serve synthesis directly
+        without building a dict per phoneme.
+        """
+        frame = self.apply_intonation_frame(self.analyze_frame(phoneme_details), sentence_type)
         return {
-            'phonemes': prosodic_phonemes,
-            'rhythm': rhythm,
+            'phonemes': frame if as_frame else frame.to_dicts(),
+            'rhythm': frame.rhythm(),
             'sentence_type': sentence_type
         }
-
-def process_gujarati_text(text: str, sentence_type: str = "statement") -> Dict[str, Any]:
-    """Process Gujarati text through the full pipeline"""
-    # Initialize components
-    phoneme_dict = GujaratiPhonemeDictionary()
-    prosody_model = GujaratiProsodyModel()
     
-    # Normalize text
-    normalized_text = re.sub(r'[^\u0A80-\u0AFF\s,?!]', '', text.strip())
-    normalized_text = re.sub(r'\s+', ' ', normalized_text)
+    def generate_prosody_batch(self, sentences: List[List[Dict[str, Any]]],
+                               sentence_types='statement') -> ProsodyBatch:
+        """
+        generate_prosody for many sentences in one vectorized pass
+
+        sentence_types is one type for every sentence or a type per sentence.
+        Pitch jitter is drawn in one go, so with the same random seed the
+        result equals calling generate_prosody (as_frame=True) on each
+        sentence in turn.
+        """
+        if isinstance(sentence_types, str):
+            sentence_types = [sentence_types] * len(sentences)
+        else:
+            sentence_types = list(sentence_types)
+            if len(sentence_types) != len(sentences):
+                raise ValueError(f"Got {len(sentence_types)} sentence types for {len(sentences)} sentences")
+        lengths = np.array([len(sentence) for sentence in sentences], dtype=np.int64)
+        offsets = np.zeros(len(sentences) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        details = [phoneme for sentence in sentences for phoneme in sentence]
+        num_phonemes = len(details)
+
+        # Where every phoneme sits: its sentence, its index there and the sentence's length.
+        sentence = np.repeat(np.arange(len(sentences)), lengths)
+        index = np.arange(num_phonemes) - offsets[sentence]
+        total = lengths[sentence]
+
+        position = self._determine_positions(index, total)
+        stress = np.array([self._apply_stress_pattern(name) for name in POSITIONS])[position]
+        modifiers = self.duration_modifiers
+        duration = np.array([modifiers.get(phoneme['type'], 1.0) for phoneme in details], dtype=float)
+        base_pitch = np.ones(num_phonemes)
+
+        norm_pos = np.full(num_phonemes, 0.5)
+        longer = total > 1
+        norm_pos[longer] = index[longer] / (total[longer] - 1)
+        contour = np.empty(num_phonemes)
+        kinds, kind_of_sentence = np.unique(np.array(sentence_types, dtype=object), return_inverse=True)
+        kind = kind_of_sentence.reshape(-1)[sentence]
+        for k, sentence_type in enumerate(kinds):
+            mask = kind == k
+            contour[mask] = self._contour(sentence_type, norm_pos[mask])
+        pitch = base_pitch * contour * stress
+        pitch *= np.random.uniform(0.95, 1.05, num_phonemes)
+
+        return ProsodyBatch(details, offsets, sentence_types, position, stress, duration, base_pitch, pitch,
+                            self._batch_rhythm(offsets, duration, pitch))
     
-    # Phoneme extraction
+    def _batch_rhythm(self, offsets: np.ndarray, duration: np.ndarray, pitch: np.ndarray) -> Dict[str, np.ndarray]:
+        """ProsodyFrame.rhythm of every sentence, as arrays"""
+        lengths = np.diff(offsets)
+        rhythm = {name: np.full(len(lengths), np.nan)
+                  for name in ('avg_duration', 'duration_variance', 'avg_pitch', 'pitch_range', 'speech_rate')}
+        filled = lengths > 0
+        if not filled.any():
+            return rhythm
+        starts, counts = offsets[:-1][filled], lengths[filled]
+        total_duration = np.add.reduceat(duration, starts)
+        avg_duration = total_duration / counts
+        deviation = duration - np.repeat(avg_duration, counts)
+        rhythm['avg_duration'][filled] = avg_duration
+        rhythm['duration_variance'][filled] = np.add.reduceat(deviation * deviation, starts) / counts
+        rhythm['avg_pitch'][filled] = np.add.reduceat(pitch, starts) / counts
+        rhythm['pitch_range'][filled] = np.maximum.reduceat(pitch, starts) - np.minimum.reduceat(pitch, starts)
+        rhythm['speech_rate'][filled] = counts / total_duration
+        return rhythm
+
+
+def extract_phonemes(normalized_text: str, phoneme_dict: GujaratiPhonemeDictionary) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    """Split normalized text into graphemes, phonemes and per-phoneme details"""
     characters = list(normalized_text)
     phonemes = []
     phoneme_details = []
@@ -227,6 +348,36 @@ def process_gujarati_text(text: str, sentence_type: str = "statement") -> Dict[s
                 graphemes.append(current_char)
             i += 1
     
+    return graphemes, phonemes, phoneme_details
+
+def _extract_word(word: str) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    return extract_phonemes(word, GujaratiPhonemeDictionary())
+
+# extract_phonemes of single words, shared by process_gujarati_text calls.
+# Entries are shared: callers copy what they keep.
+word_memo = WordMemo(_extract_word, capacity=50000, version=lambda: PHONEME_RULES_VERSION)
+
+def process_gujarati_text(text: str, sentence_type: str = "statement", memo: WordMemo = word_memo) -> Dict[str, Any]:
+    """Process Gujarati text through the full pipeline"""
+    # Initialize components
+    prosody_model = GujaratiProsodyModel()
+    
+    # Normalize text
+    normalized_text = re.sub(r'[^\u0A80-\u0AFF\s,?!]', '', text.strip())
+    normalized_text = re.sub(r'\s+', ' ', normalized_text)
+    
+    # Phoneme extraction, word by word through the memo: no character looks
+    # past the space after its word, so this equals extracting the whole text.
+    if memo is None:
+        graphemes, phonemes, phoneme_details = extract_phonemes(normalized_text, GujaratiPhonemeDictionary())
+    else:
+        graphemes, phonemes, phoneme_details = [], [], []
+        for word in normalized_text.split(' '):
+            word_graphemes, word_phonemes, word_details = memo(word)
+            graphemes.extend(word_graphemes)
+            phonemes.extend(word_phonemes)
+            phoneme_details.extend([dict(detail) for detail in word_details])
+    
     # Prosody modeling (excluding punctuation)
     prosody_result = prosody_model.generate_prosody(
         [p for p in phoneme_details if p['type'] != 'punctuation'],
@@ -1,5 +1,10 @@
-from prosody import process_gujarati_text
-from typing import Dict, List, Any
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import json
+import numpy as np
+from prosody import GujaratiProsodyModel, process_gujarati_text
+from typing import Dict, Any
 
 def visualize_results(results: Dict[str, Any], test_case_num: int):
     """Visualize the processing results"""
@@ -67,7 +72,110 @@ def run_test_cases():
         results = process_gujarati_text(test_case["text"], test_case["type"])
         visualize_results(results, i)
 
+def check_cases(label, cases):
+    """Print and count (name, output, expected) cases"""
+    total_cases = 0
+    cases_passed = 0
+    for idx, (name, output, expected) in enumerate(cases, 1):
+        print(f"Test Case {idx} ({label}):")
+        print("Input:    ", name)
+        result = "PASS" if output == expected else "FAIL"
+        print("Result:   ", result, "\n")
+        total_cases += 1
+        if result == "PASS":
+            cases_passed += 1
+
+    print(f"Passed {cases_passed}/{total_cases} cases ({label})")
+
+def sentence_details(texts):
+    """Non-punctuation phoneme details of every text ([] for empty texts)"""
+    return [[p for p in process_gujarati_text(text, memo=None)['phoneme_details'] if p['type'] != 'punctuation']
+            if text else [] for text in texts]
+
+def reference_prosody(model, phoneme_details, sentence_type):
+    """The original per-phoneme dict implementation of generate_prosody"""
+    total = len(phoneme_details)
+    enhanced = []
+    for i, phoneme in enumerate(phoneme_details):
+        position = 'initial' if i == 0 else 'final' if i == total - 1 else 'penultimate' if i == total - 2 else 'medial'
+        enhanced.append({**phoneme, 'position': position, 'stress': model.stress_patterns[position],
+                         'duration': model.duration_modifiers.get(phoneme['type'], 1.0), 'base_pitch': 1.0})
+    contour = model.intonation_contours[sentence_type]
+    for i, phoneme in enumerate(enhanced):
+        norm_pos = i / (total - 1) if total > 1 else 0.5
+        phoneme['pitch'] = phoneme['base_pitch'] * contour(norm_pos) * phoneme['stress']
+        phoneme['pitch'] *= np.random.uniform(0.95, 1.05)
+    durations = [p['duration'] for p in enhanced]
+    pitches = [p['pitch'] for p in enhanced]
+    rhythm = {'avg_duration': np.mean(durations), 'duration_variance': np.var(durations), 'avg_pitch': np.mean(pitches),
+              'pitch_range': max(pitches) - min(pitches), 'speech_rate': total / sum(durations)}
+    return {'phonemes': enhanced, 'rhythm': rhythm, 'sentence_type': sentence_type}
+
+def rounded(value):
+    """value with every float rounded, for comparing results computed in another order"""
+    if isinstance(value, dict):
+        return {k: rounded(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rounded(v) for v in value]
+    return round(float(value), 9) if isinstance(value, float) else value
+
+def run_frame_test_cases():
+    """Check generate_prosody's list output and its ProsodyFrame view against the original implementation"""
+    details = sentence_details(["મને ગુજરાતી ભાષા ગમે છે!"])[0]
+    model = GujaratiProsodyModel()
+    np.random.seed(3)
+    expected = reference_prosody(model, details, "exclamation")
+    np.random.seed(3)
+    result = model.generate_prosody(details, "exclamation")
+    np.random.seed(3)
+    frame = model.generate_prosody(details, "exclamation", as_frame=True)['phonemes']
+
+    phonemes = result['phonemes']
+    unchanged = rounded(phonemes)
+    phonemes[0]['duration'] = 2.5
+    list_write = phonemes[0]['duration']
+    views = [frame[i] for i in range(len(frame))]
+    frame.duration[0] = 2.5
+    frame[0]['duration'] = 9.0
+    frame_write = frame[0]['duration']
+
+    frame_cases = [
+        ("list output", type(phonemes), list),
+        ("phonemes", unchanged, rounded(expected['phonemes'])),
+        ("rhythm", rounded(result['rhythm']), rounded(expected['rhythm'])),
+        ("sentence type", result['sentence_type'], "exclamation"),
+        ("json", bool(json.dumps(result, ensure_ascii=False)), True),
+        ("list concatenation", len(phonemes + phonemes[:2]), len(details) + 2),
+        ("list writes kept", list_write, 2.5),
+        ("frame view", rounded(views), rounded(expected['phonemes'])),
+        ("frame slice", frame[2:4], views[2:4]),
+        ("frame writes through arrays", frame_write, 2.5),
+    ]
+    check_cases("frame", frame_cases)
+
+def run_batch_test_cases():
+    """Check generate_prosody_batch against generate_prosody, sentence by sentence"""
+    types = ["question", "exclamation", "statement", "statement"]
+    sentences = sentence_details(["તમે કેમ છો?", "મને ગુજરાતી ભાષા ગમે છે!", "", "આજે હવામાન સારું છે."])
+    model = GujaratiProsodyModel()
+    np.random.seed(7)
+    single = [model.generate_prosody(sentence, sentence_type) if sentence else None
+              for sentence, sentence_type in zip(sentences, types)]
+    np.random.seed(7)
+    batch = model.generate_prosody_batch(sentences, types)
+
+    batch_cases = [
+        ("offsets", batch.offsets.tolist(), np.cumsum([0] + [len(s) for s in sentences]).tolist()),
+        ("sentence types", [batch[i]['sentence_type'] for i in range(len(batch))], types),
+        ("phonemes", [batch[i]['phonemes'].to_dicts() for i in (0, 1, 3)], [single[i]['phonemes'] for i in (0, 1, 3)]),
+        ("rhythm", [rounded(batch[i]['rhythm']) for i in (0, 1, 3)], [rounded(single[i]['rhythm']) for i in (0, 1, 3)]),
+        ("empty sentence", (len(batch[2]['phonemes']), bool(np.isnan(batch.rhythm['avg_pitch'][2]))), (0, True)),
+    ]
+    check_cases("batch", batch_cases)
+
 if __name__ == "__main__":
     print("=== Gujarati Text Processing with Prosody Analysis ===")
     print("Running multiple test cases...\n")
     run_test_cases()
+    run_frame_test_cases()
+    run_batch_test_cases()
\ No newline at end of file
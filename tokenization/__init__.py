@@ -1 +1,2 @@
-from .gujarati_tokenizer import *
\ No newline at end of file
+from .gujarati_tokenizer import *
+from .corpus import *
\ No newline at end of file
@@ -0,0 +1,185 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from corpus import TokenizedCorpus, write_corpus
+from gujarati_tokenizer import AdvancedGujaratiTokenizer, IncrementalSentenceTokenizer, norm
+
+PROSE = (
+    "ગુજરાતી ભાષા સરળ અને મધુર છે. તમે ગુજરાતી શીખી રહ્યા છો! "
+    "સ્વપ્ન જોયું! પક્ષી ઊડ્યું? વૃક્ષ ઊગ્યું. જ્ઞાન પ્રાપ્તિ માટે શ્રદ્ધા જરૂરી છે. "
+    "કૃષ્ણ અને રાધા નૃત્ય કરે છે. વ્યાકરણ શીખવું સહેલું છે. ચિત્તલ પ્રાચી યશ ક્રીશ. "
+)
+
+class LinearScanTokenizer(AdvancedGujaratiTokenizer):
+    # The previous phoneme_tokenize: every combination is tried at every position.
+    def phoneme_tokenize(self, word):
+        word = norm(word)
+        tokens = []
+        i = 0
+        while i < len(word):
+            found_combo = False
+            for combo, components in self.consonant_combinations.items():
+                if word[i:].startswith(combo):
+                    tokens.extend(components)
+                    i += len(combo)
+                    found_combo = True
+                    break
+            if not found_combo:
+                tokens.append(word[i])
+                i += 1
+        return tokens
+
+def conjunct_table(size):
+    # The built-in combinations first, then consonant + virama + consonant pairs.
+    table = dict(AdvancedGujaratiTokenizer().consonant_combinations)
+    consonants = AdvancedGujaratiTokenizer().consonants
+    for first in consonants:
+        for second in consonants:
+            if len(table) >= size:
+                return table
+            table.setdefault(first + "્" + second, [first, "્", second])
+    return table
+
+def best_time(func, arg, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_phoneme_tokenize(sizes=(10, 100, 1000), paragraphs=20):
+    text = PROSE * paragraphs
+    words = [word for sentence in AdvancedGujaratiTokenizer().sentence_tokenize(text)
+             for word in AdvancedGujaratiTokenizer().word_tokenize(sentence)]
+
+    print("=== phoneme_tokenize: combination trie vs linear scan ===")
+    print(f"Words: {len(words)}")
+    for size in sizes:
+        table = conjunct_table(size)
+        tokenizers = []
+        for cls in (LinearScanTokenizer, AdvancedGujaratiTokenizer):
+            tokenizer = cls()
+            tokenizer.consonant_combinations = dict(table)
+            tokenizers.append(tokenizer)
+        linear, trie = tokenizers
+        assert [trie.phoneme_tokenize(w) for w in words] == [linear.phoneme_tokenize(w) for w in words]
+
+        linear_time = best_time(lambda ws: [linear.phoneme_tokenize(w) for w in ws], words)
+        trie_time = best_time(lambda ws: [trie.phoneme_tokenize(w) for w in ws], words)
+        print(f"{len(table):>5} combinations: linear {linear_time / len(words) * 1e6:8.2f} us/word, "
+              f"trie {trie_time / len(words) * 1e6:6.2f} us/word, {linear_time / trie_time:6.1f}x")
+
+def bench_iter_tokenize(paragraphs=(100, 1000)):
+    tokenizer = AdvancedGujaratiTokenizer()
+
+    print("\n=== iter_tokenize vs advanced_tokenize on long documents ===")
+    for count in paragraphs:
+        text = PROSE * count
+
+        start = time.perf_counter()
+        tokenizer.advanced_tokenize(text)
+        whole = time.perf_counter() - start
+        start = time.perf_counter()
+        next(tokenizer.iter_tokenize(text))
+        first = time.perf_counter() - start
+
+        tracemalloc.start()
+        tokenizer.advanced_tokenize(text)
+        whole_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        for _ in tokenizer.iter_tokenize(text):
+            pass
+        iter_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{len(text):>8} chars: first sentence after {first * 1e3:7.3f} ms (whole document {whole * 1e3:7.1f} ms), "
+              f"peak memory {iter_peak / 1e6:5.1f} MB vs {whole_peak / 1e6:5.1f} MB")
+
+def bench_feed(paragraphs=(10, 100, 1000), chunk=3):
+    print(f"\n=== IncrementalSentenceTokenizer fed {chunk} characters at a time ===")
+    for count in paragraphs:
+        text = PROSE * count
+        tokenizer = IncrementalSentenceTokenizer()
+        latencies = []
+        start = time.perf_counter()
+        for offset in range(0, len(text), chunk):
+            before = time.perf_counter()
+            tokenizer.feed(text[offset:offset + chunk])
+            latencies.append(time.perf_counter() - before)
+        tokenizer.flush()
+        elapsed = time.perf_counter() - start
+        print(f"{len(text):>8} chars: {elapsed / len(latencies) * 1e6:5.2f} us/feed on average, "
+              f"slowest {max(latencies) * 1e6:6.1f} us")
+
+def nested_size(phonemes):
+    # Lists plus the token strings they hold (each distinct string counted once).
+    strings = {id(token): sys.getsizeof(token) for word in phonemes for token in word}
+    return sys.getsizeof(phonemes) + sum(sys.getsizeof(word) for word in phonemes) + sum(strings.values())
+
+def bench_encoding(paragraphs=100):
+    tokenizer = AdvancedGujaratiTokenizer()
+    text = PROSE * paragraphs
+    phonemes = tokenizer.advanced_tokenize(text)['phonemes']
+    ids, offsets = tokenizer.encode_phonemes(phonemes)
+    assert tokenizer.decode(ids, offsets) == phonemes
+
+    encode_time = best_time(tokenizer.encode_phonemes, phonemes)
+    decode_time = best_time(lambda arrays: tokenizer.decode(*arrays), (ids, offsets))
+    print("\n=== uint16 phoneme IDs with CSR word offsets ===")
+    print(f"Words: {len(phonemes)}, tokens: {len(ids)}")
+    print(f"Nested lists:  {nested_size(phonemes) / 1e6:6.2f} MB")
+    print(f"Arrays:        {(ids.nbytes + offsets.nbytes) / 1e6:6.2f} MB")
+    print(f"Encode:        {encode_time / len(ids) * 1e9:6.1f} ns/token")
+    print(f"Decode:        {decode_time / len(ids) * 1e9:6.1f} ns/token")
+
+def bench_corpus(paragraphs=1000, samples=10000):
+    tokenizer = AdvancedGujaratiTokenizer()
+    text = PROSE * paragraphs
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.bin")
+        start = time.perf_counter()
+        write_corpus(text, path)
+        write_time = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        phonemes = [record['phonemes'] for record in tokenizer.iter_tokenize(text)]
+        tokenize_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        corpus = TokenizedCorpus(path)
+        open_time = time.perf_counter() - start
+        indices = [(index * 7919) % len(corpus) for index in range(samples)]
+        start = time.perf_counter()
+        for index in indices:
+            corpus.sentence_ids(index)
+        ids_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for index in indices:
+            corpus[index]
+        decode_time = time.perf_counter() - start
+        assert all(corpus[index] == phonemes[index] for index in indices[:100])
+
+        print("\n=== Memory-mapped tokenized corpus ===")
+        print(f"Text: {len(text)} chars, {len(corpus)} sentences, file {size / 1e6:.2f} MB")
+        print(f"Write once:            {write_time * 1e3:8.1f} ms")
+        print(f"Tokenize again:        {tokenize_time * 1e3:8.1f} ms")
+        print(f"Open:                  {open_time * 1e3:8.3f} ms")
+        print(f"Random sentence IDs:   {ids_time / samples * 1e6:8.2f} us/sentence")
+        print(f"Random sentence lists: {decode_time / samples * 1e6:8.2f} us/sentence")
+        del corpus
+
+def main():
+    bench_phoneme_tokenize()
+    bench_iter_tokenize()
+    bench_feed()
+    bench_encoding()
+    bench_corpus()
+
+if __name__ == "__main__":
+    main()
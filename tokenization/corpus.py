@@ -0,0 +1,137 @@
+import argparse
+import json
+import shutil
+import struct
+import sys
+import tempfile
+from typing import Iterable, List, Tuple, Union
+import numpy as np
+from tokenization.gujarati_tokenizer import PHONEME_VOCABULARY, AdvancedGujaratiTokenizer
+
+# File layout, every section starting at a multiple of 8 bytes:
+#   header            CORPUS_HEADER below
+#   vocabulary        JSON list of the token strings, UTF-8
+#   tokens            uint16[token_count], little-endian
+#   word offsets      int64[word_count + 1], into tokens
+#   sentence offsets  int64[sentence_count + 1], into words
+CORPUS_MAGIC = b"GUJTOKCP"
+CORPUS_VERSION = 1
+CORPUS_HEADER = struct.Struct("<8sIIQQQQQQQQ")
+
+def _align(position: int) -> int:
+    return -position % 8
+
+def write_corpus(source: Union[str, Iterable[str]], path: str, tokenizer: AdvancedGujaratiTokenizer = None,
+                 chunk_size: int = 64 * 1024) -> Tuple[int, int, int]:
+    # Tokenize source (a string, a text file object or an iterable of strings,
+    # as for iter_tokenize) sentence by sentence into a corpus file at path.
+    # Offsets are spooled to temporary files, so memory use does not grow with
+    # the corpus. Returns (sentence_count, word_count, token_count).
+    if tokenizer is None:
+        tokenizer = AdvancedGujaratiTokenizer()
+    vocabulary = json.dumps(list(PHONEME_VOCABULARY), ensure_ascii=False).encode("utf-8")
+    vocabulary_start = CORPUS_HEADER.size + _align(CORPUS_HEADER.size)
+    tokens_start = vocabulary_start + len(vocabulary) + _align(vocabulary_start + len(vocabulary))
+
+    token_count = word_count = sentence_count = 0
+    with open(path, "wb") as out, tempfile.TemporaryFile() as words, tempfile.TemporaryFile() as sentences:
+        out.write(b"\0" * vocabulary_start)
+        out.write(vocabulary)
+        out.write(b"\0" * (tokens_start - out.tell()))
+        words.write(np.zeros(1, dtype="<i8").tobytes())
+        sentences.write(np.zeros(1, dtype="<i8").tobytes())
+        for record in tokenizer.iter_tokenize(source, chunk_size):
+            ids, offsets = tokenizer.encode_phonemes(record['phonemes'])
+            out.write(ids.astype("<u2").tobytes())
+            words.write((offsets[1:] + token_count).astype("<i8").tobytes())
+            token_count += len(ids)
+            word_count += len(offsets) - 1
+            sentence_count += 1
+            sentences.write(np.array([word_count], dtype="<i8").tobytes())
+
+        out.write(b"\0" * _align(out.tell()))
+        word_offsets_start = out.tell()
+        words.seek(0)
+        shutil.copyfileobj(words, out)
+        sentence_offsets_start = out.tell()
+        sentences.seek(0)
+        shutil.copyfileobj(sentences, out)
+
+        out.seek(0)
+        out.write(CORPUS_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, 0, vocabulary_start, len(vocabulary),
+                                     tokens_start, token_count, word_offsets_start, word_count,
+                                     sentence_offsets_start, sentence_count))
+    return sentence_count, word_count, token_count
+
+class TokenizedCorpus:
+    # Read-only view of a corpus written by write_corpus. The arrays are
+    # numpy.memmap views of the file, so opening is O(1), sentences are read
+    # on access, and processes opening the same file share it through the
+    # page cache.
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(CORPUS_HEADER.size)
+            if len(header) < CORPUS_HEADER.size:
+                raise ValueError(f"{path} is not a tokenized corpus (file too short)")
+            (magic, version, _, vocabulary_start, vocabulary_size, tokens_start, token_count,
+             word_offsets_start, word_count, sentence_offsets_start, sentence_count) = CORPUS_HEADER.unpack(header)
+            if magic != CORPUS_MAGIC:
+                raise ValueError(f"{path} is not a tokenized corpus")
+            if version != CORPUS_VERSION:
+                raise ValueError(f"{path} has corpus format version {version}, expected {CORPUS_VERSION}")
+            f.seek(vocabulary_start)
+            self.vocabulary = tuple(json.loads(f.read(vocabulary_size).decode("utf-8")))
+        self._vocabulary_array = np.array(self.vocabulary, dtype=object)
+        self.tokens = self._map("<u2", tokens_start, token_count)
+        self.word_offsets = self._map("<i8", word_offsets_start, word_count + 1)
+        self.sentence_offsets = self._map("<i8", sentence_offsets_start, sentence_count + 1)
+
+    def _map(self, dtype: str, offset: int, count: int) -> np.ndarray:
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        # A plain ndarray view of the map slices much faster than np.memmap itself.
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=(count,)).view(np.ndarray)
+
+    def __len__(self) -> int:
+        return len(self.sentence_offsets) - 1
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_offsets) - 1
+
+    def sentence_ids(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        # (ids, offsets) of one sentence, as encode_phonemes returns them; ids is
+        # a view of the file.
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sentence {index} is out of range ({len(self)} sentences)")
+        first, last = int(self.sentence_offsets[index]), int(self.sentence_offsets[index + 1])
+        offsets = np.array(self.word_offsets[first:last + 1])
+        start, end = int(offsets[0]), int(offsets[-1])
+        return self.tokens[start:end], offsets - start
+
+    def __getitem__(self, index: int) -> List[List[str]]:
+        # The phoneme tokens of each word of one sentence.
+        ids, offsets = self.sentence_ids(index)
+        tokens = self._vocabulary_array[np.asarray(ids, dtype=np.intp)].tolist()
+        bounds = offsets.tolist()
+        return [tokens[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tokenize a Gujarati text file into a memory-mappable corpus file.")
+    parser.add_argument("input", help="UTF-8 text file, or - for stdin")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        sys.stdin.reconfigure(encoding="utf-8")
+        counts = write_corpus(sys.stdin, args.output, chunk_size=args.chunk_size)
+    else:
+        with open(args.input, encoding="utf-8") as source:
+            counts = write_corpus(source, args.output, chunk_size=args.chunk_size)
+    sentence_count, word_count, token_count = counts
+    print(f"Wrote {sentence_count} sentences, {word_count} words, {token_count} tokens to {args.output}")
+
+if __name__ == "__main__":
+    main()
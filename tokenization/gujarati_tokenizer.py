@@ -1,10 +1,35 @@
+import itertools
 import re
 import unicodedata
-from typing import List, Dict, Union
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+import numpy as np
+from gujarati.inventory import TOKEN_IDS, TOKEN_VOCABULARY, UNKNOWN_ID, graphemes
 
 def norm(s: str) -> str:
     return unicodedata.normalize('NFC', s)
 
+# Abbreviations whose final "." does not end a sentence.
+DEFAULT_ABBREVIATIONS = (
+    'ડૉ.', 'શ્રી.', 'શ્રીમતી.', 'પ્રો.', 'કુ.', 'ગુ.યુની.', 'કિ.મી.', 'ગ્રા.', 'કિ.ગ્રા.', 'તા.', 'અ.મ્યુ.કો.',
+)
+
+# Stripped from the front of a token before it is compared with the abbreviations.
+OPENING_PUNCTUATION = '"\'“‘«([{'
+
+# iter_tokenize cuts a streamed sentence that grows past this many characters.
+DEFAULT_MAX_SENTENCE = 10000
+
+# The tokenizer's grapheme groups, from the shared inventory.
+VOWELS = graphemes("vowel")
+MATRAS = graphemes("matra")
+CONSONANTS = graphemes("consonant")
+
+# Phoneme token IDs are the inventory's token IDs, so graphemes keep one ID
+# across stages.
+PHONEME_VOCABULARY = TOKEN_VOCABULARY
+PHONEME_IDS = TOKEN_IDS
+_VOCABULARY_ARRAY = np.array(PHONEME_VOCABULARY, dtype=object)
+
 class AdvancedGujaratiTokenizer:
     def __init__(self):
         self.SENTENCE_DELIMITERS = r'[।!?.]'
@@ -15,16 +40,11 @@ class AdvancedGujaratiTokenizer:
         self.visarg = 'ઃ'
         self.viram = '્'
         
-        self.vowels = ['અ', 'આ', 'ઇ', 'ઈ', 'ઉ', 'ઊ', 'ઋ', 'એ', 'ઐ', 'ઓ', 'ઔ']
-        self.matra = ['ા', 'િ', 'ી', 'ુ', 'ૂ', 'ૃ', 'ે', 'ૈ', 'ો', 'ૌ']
-        self.all_vowels = self.vowels + self.matra
+        self.vowels = VOWELS
+        self.matra = MATRAS
+        self.all_vowels = VOWELS + MATRAS
         
-        self.consonants = [
-            'ક', 'ખ', 'ગ', 'ઘ', 'ચ', 'છ', 'જ', 'ઝ', 'ટ', 'ઠ',
-            'ડ', 'ઢ', 'ણ', 'ત', 'થ', 'દ', 'ધ', 'ન', 'પ', 'ફ',
-            'બ', 'ભ', 'મ', 'ય', 'ર', 'લ', 'વ', 'શ', 'ષ', 'સ',
-            'હ', 'ળ', 'ઞ'
-        ]
+        self.consonants = CONSONANTS
 
         self.consonant_combinations = {
             'ક્ષ': ['ક', '્', 'ષ'],
@@ -37,6 +57,9 @@ class AdvancedGujaratiTokenizer:
             'ન્ન': ['ન', '્', 'ન'],
             'પ્ર': ['પ', '્', 'ર'],
         }
+        # Built from consonant_combinations on first use; call
+        # compile_combinations() after editing that dict directly.
+        self.combination_trie = None
 
     def sentence_tokenize(self, text: str) -> List[str]:
         sentences = re.split(self.SENTENCE_DELIMITERS, text)
@@ -47,33 +70,46 @@ class AdvancedGujaratiTokenizer:
         words = re.split(r'\s+', cleaned_text)
         return [word.strip() for word in words if word.strip()]
     
+    def add_combination(self, combo: str, components: List[str]) -> None:
+        self.consonant_combinations[combo] = components
+        self.combination_trie = None
+
+    def compile_combinations(self) -> Dict:
+        # Character trie over the combinations; the components of a combination
+        # are stored under the None key of the node where it ends.
+        trie = {}
+        for combo, components in self.consonant_combinations.items():
+            node = trie
+            for char in norm(combo):
+                node = node.setdefault(char, {})
+            node.setdefault(None, components)
+        self.combination_trie = trie
+        return trie
+
     def phoneme_tokenize(self, word: str) -> List[str]:
         word = norm(word)
+        trie = self.combination_trie
+        if trie is None:
+            trie = self.compile_combinations()
         tokens = []
+        length = len(word)
         i = 0
-        while i < len(word):
-            found_combo = False
-            for combo, components in self.consonant_combinations.items():
-                if word[i:].startswith(combo):
-                    tokens.extend(components)
-                    i += len(combo)
-                    found_combo = True
-                    break
-            if not found_combo:
-                char = word[i]
-                if char == self.anusvar:
-                    tokens.append('ં')
-                elif char == self.viram:
-                    tokens.append('્')
-                elif char in self.matra:
-                    tokens.append(char)
-                elif char in self.consonants:
-                    tokens.append(char)
-                elif char in self.vowels:
-                    tokens.append(char)
-                else:
-                    tokens.append(char)
+        while i < length:
+            # Longest combination starting at i, if any.
+            node = trie.get(word[i])
+            components = None
+            j = i
+            while node is not None:
+                j += 1
+                if None in node:
+                    components, end = node[None], j
+                node = node.get(word[j]) if j < length else None
+            if components is None:
+                tokens.append(word[i])
                 i += 1
+            else:
+                tokens.extend(components)
+                i = end
         
         return tokens
 
@@ -87,4 +123,179 @@ class AdvancedGujaratiTokenizer:
             'sentences': sentences,
             'words': words,
             'phonemes': [self.phoneme_tokenize(word) for word in words],
-        }
\ No newline at end of file
+        }
+
+    def encode(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        # The phonemes of advanced_tokenize(text), encoded as by encode_phonemes.
+        words = [word for sentence in self.sentence_tokenize(text) for word in self.word_tokenize(sentence)]
+        return self.encode_phonemes([self.phoneme_tokenize(word) for word in words])
+
+    def encode_phonemes(self, phonemes: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        # (ids, offsets): one uint16 array of PHONEME_IDS for all words, and the
+        # CSR offsets of each word, so word i is ids[offsets[i]:offsets[i + 1]].
+        lengths = np.fromiter(map(len, phonemes), dtype=np.int64, count=len(phonemes))
+        offsets = np.zeros(len(phonemes) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        get = PHONEME_IDS.get
+        ids = np.fromiter((get(token, UNKNOWN_ID) for word in phonemes for token in word),
+                          dtype=np.uint16, count=int(offsets[-1]))
+        return ids, offsets
+
+    def decode(self, ids: np.ndarray, offsets: np.ndarray) -> List[List[str]]:
+        tokens = _VOCABULARY_ARRAY[np.asarray(ids, dtype=np.intp)].tolist()
+        bounds = np.asarray(offsets).tolist()
+        return [tokens[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def iter_tokenize(self, source: Union[str, Iterable[str]], chunk_size: int = 64 * 1024,
+                      max_sentence: int = DEFAULT_MAX_SENTENCE) -> Iterator[Dict[str, Any]]:
+        # Yields one record per sentence, as soon as its delimiter has been read:
+        # {'sentence', 'span', 'words', 'word_spans', 'phonemes'}, where spans are
+        # (start, end) offsets into the whole source. source is a string, a file
+        # object read chunk_size characters at a time, or an iterable of strings.
+        # The sentences, words and phonemes are those of advanced_tokenize, except
+        # that a streamed sentence longer than max_sentence characters is cut at
+        # its last whitespace (or at max_sentence if it has none).
+        delimiter = re.compile(self.SENTENCE_DELIMITERS)
+        ignore = re.compile(self.IGNORE_CHARS)
+        if isinstance(source, str):
+            yield from self._tokenize_sentences(source, 0, delimiter, ignore)
+            return
+        if hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), '')
+        else:
+            chunks = source
+
+        # Chunks read since the last delimiter are kept in a list and joined once,
+        # and only each new chunk is searched for delimiters, so a long stretch
+        # without one costs linear time.
+        pending = []
+        pending_length = 0
+        offset = 0
+        for chunk in chunks:
+            cut = None
+            for match in delimiter.finditer(chunk):
+                cut = match.end()
+            if cut is not None:
+                text = ''.join(pending) + chunk[:cut]
+                yield from self._tokenize_sentences(text, offset, delimiter, ignore)
+                offset += len(text)
+                chunk = chunk[cut:]
+                pending = []
+                pending_length = 0
+            pending.append(chunk)
+            pending_length += len(chunk)
+            if pending_length > max_sentence:
+                text = ''.join(pending)
+                while len(text) > max_sentence:
+                    cut = max_sentence
+                    while cut > 0 and not text[cut].isspace():
+                        cut -= 1
+                    if cut == 0:
+                        cut = max_sentence
+                    yield from self._tokenize_sentences(text[:cut], offset, delimiter, ignore)
+                    offset += cut
+                    text = text[cut:]
+                pending = [text]
+                pending_length = len(text)
+        yield from self._tokenize_sentences(''.join(pending), offset, delimiter, ignore)
+
+    def _tokenize_sentences(self, text: str, offset: int, delimiter, ignore) -> Iterator[Dict[str, Any]]:
+        start = 0
+        ends = ((match.start(), match.end()) for match in delimiter.finditer(text))
+        for end, next_start in itertools.chain(ends, [(len(text), len(text))]):
+            piece = text[start:end]
+            sentence = piece.strip()
+            if sentence:
+                sentence_start = start + len(piece) - len(piece.lstrip())
+                words, word_spans = self._words_with_spans(sentence, offset + sentence_start, ignore)
+                yield {
+                    'sentence': sentence,
+                    'span': (offset + sentence_start, offset + sentence_start + len(sentence)),
+                    'words': words,
+                    'word_spans': word_spans,
+                    'phonemes': [self.phoneme_tokenize(word) for word in words],
+                }
+            start = next_start
+
+    def _words_with_spans(self, sentence: str, offset: int, ignore) -> Tuple[List[str], List[Tuple[int, int]]]:
+        words = []
+        spans = []
+        for match in re.finditer(r'\S+', sentence):
+            word = ignore.sub('', match.group())
+            if not word:
+                continue
+            # The span leaves out ignored characters at either end of the token.
+            start, end = match.span()
+            while ignore.match(sentence, start, start + 1):
+                start += 1
+            while ignore.match(sentence, end - 1, end):
+                end -= 1
+            words.append(word)
+            spans.append((offset + start, offset + end))
+        return words, spans
+
+class IncrementalSentenceTokenizer:
+    # Splits text that arrives in chunks into sentences. feed() returns the
+    # sentences finished by the new chunk and keeps only the unfinished tail;
+    # flush() returns what is left at the end of the input. Sentences are
+    # stripped and lose their delimiter, as in sentence_tokenize.
+    #
+    # "।", "!" and "?" end a sentence as soon as they arrive. A "." only ends one
+    # when whitespace (or the end of the input) follows it and it does not close
+    # one of the abbreviations, so "૩.૫", "અ.મ્યુ.કો." and "ડૉ. પટેલ" stay whole;
+    # a "." that ends a chunk waits for the next character.
+    DELIMITER_PATTERN = re.compile(r'[।!?.]')
+
+    def __init__(self, abbreviations: Iterable[str] = DEFAULT_ABBREVIATIONS):
+        self.abbreviations = frozenset(abbreviations)
+        self.buffer = ''
+        self.scanned = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        self.buffer += chunk
+        return self._split(final=False)
+
+    def flush(self) -> List[str]:
+        sentences = self._split(final=True)
+        tail = self.buffer.strip()
+        if tail:
+            sentences.append(tail)
+        self.buffer = ''
+        self.scanned = 0
+        return sentences
+
+    def _split(self, final: bool) -> List[str]:
+        buffer = self.buffer
+        sentences = []
+        start = 0
+        position = self.scanned
+        for match in self.DELIMITER_PATTERN.finditer(buffer, self.scanned):
+            end = match.end()
+            position = end
+            if match.group() == '.':
+                if end == len(buffer) and not final:
+                    position = match.start()
+                    break
+                if end < len(buffer) and not buffer[end].isspace():
+                    continue
+                if self._ends_with_abbreviation(buffer, end):
+                    continue
+            sentence = buffer[start:match.start()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = end
+        else:
+            position = len(buffer)
+        self.buffer = buffer[start:]
+        self.scanned = position - start
+        return sentences
+
+    def _ends_with_abbreviation(self, text: str, end: int) -> bool:
+        # The whole token must be an abbreviation, once opening quotes and
+        # brackets are stripped: "હતા." and "કરતા." end sentences even though
+        # they end in "તા.". (The normalizer's streaming matches suffixes
+        # instead, because its expander rewrites "હતા." too.)
+        start = end
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+        return text[start:end].lstrip(OPENING_PUNCTUATION) in self.abbreviations
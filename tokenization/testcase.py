@@ -1,12 +1,20 @@
-from gujarati_tokenizer import AdvancedGujaratiTokenizer
+import io
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from benchmark import PROSE
+from corpus import TokenizedCorpus, write_corpus
+from gujarati_tokenizer import AdvancedGujaratiTokenizer, IncrementalSentenceTokenizer
 
-def run_tests(test_cases):
-    tokenizer = AdvancedGujaratiTokenizer()
+def run_tests(test_cases, tokenize=None):
+    if tokenize is None:
+        tokenize = AdvancedGujaratiTokenizer().advanced_tokenize
     total_cases = 0
     cases_passed = 0
 
     for idx, (input_text, expected) in enumerate(test_cases, 1):
-        output = tokenizer.advanced_tokenize(input_text)
+        output = tokenize(input_text)
         print(f"Test Case {idx}:")
         print("Input:    ", repr(input_text))
         print("Output:   ", output)
@@ -139,5 +147,104 @@ def main():
     
     run_tests(test_cases)
 
+    # A longer combination wins over the one it starts with.
+    tokenizer = AdvancedGujaratiTokenizer()
+    tokenizer.add_combination('ક્ષ્મ', ['ક્ષ્મ'])
+    run_tests([
+        (
+            "લક્ષ્મી પક્ષી",
+            {
+                "sentences": ["લક્ષ્મી પક્ષી"],
+                "words": ["લક્ષ્મી", "પક્ષી"],
+                "phonemes": [
+                    ["લ", "ક્ષ્મ", "ી"],
+                    ["પ", "ક", "્", "ષ", "ી"]
+                ],
+            }
+        )
+    ], tokenizer.advanced_tokenize)
+
+    # Sentence records with offsets, read from a stream in small chunks.
+    run_tests([
+        (
+            "સ્વપ્ન જોયું! (પક્ષી) ઊડ્યું?",
+            [
+                ("સ્વપ્ન જોયું", (0, 12), ["સ્વપ્ન", "જોયું"], [(0, 6), (7, 12)]),
+                ("(પક્ષી) ઊડ્યું", (14, 28), ["પક્ષી", "ઊડ્યું"], [(15, 20), (22, 28)])
+            ]
+        )
+    ], iter_tokenize_spans)
+
+    # A streamed sentence longer than max_sentence is cut at its last whitespace.
+    run_tests([
+        (
+            "ગુજરાતી ભાષા સરળ અને મધુર છે. તમે શીખો",
+            [("ગુજરાતી", (0, 7)), ("ભાષા સરળ", (8, 16)), ("અને મધુર", (17, 25)), ("છે", (26, 28)), ("તમે શીખો", (30, 38))]
+        ),
+        ("અઅઅઅઅઅઅઅઅઅઅઅઅઅ બ", [("અઅઅઅઅઅઅઅઅઅ", (0, 10)), ("અઅઅઅ બ", (10, 16))]),
+    ], capped_sentences)
+
+    # Text fed three characters at a time: decimals and abbreviations keep their ".".
+    run_tests([
+        (
+            "ડૉ. પટેલ આવ્યા. તેમણે ૩.૫ કિ.મી. ચાલ્યું! અ.મ્યુ.કો. ની ઓફિસ ક્યાં છે? હા।ના",
+            ["ડૉ. પટેલ આવ્યા", "તેમણે ૩.૫ કિ.મી. ચાલ્યું", "અ.મ્યુ.કો. ની ઓફિસ ક્યાં છે", "હા", "ના"]
+        ),
+        ("ભાષા મીઠી છે.", ["ભાષા મીઠી છે"]),
+        # Only whole tokens are abbreviations: "હતા." and "કરતા." end in "તા." but end sentences.
+        ("તેઓ ત્યાં હતા. પછી ઘરે ગયા. ", ["તેઓ ત્યાં હતા", "પછી ઘરે ગયા"]),
+        ("તેઓ કામ કરતા. \"ડૉ. પટેલ\" આવ્યા.", ["તેઓ કામ કરતા", "\"ડૉ. પટેલ\" આવ્યા"]),
+    ], fed_sentences)
+
+    # Without abbreviations, fed sentences are those of sentence_tokenize.
+    run_tests([
+        (PROSE * 3, AdvancedGujaratiTokenizer().sentence_tokenize(PROSE * 3)),
+    ], fed_sentences)
+
+    # Phonemes encoded to token IDs and CSR word offsets, then decoded back.
+    run_tests([
+        (
+            "વૃક્ષ ઊગ્યું. Dr. Shah ઙ",
+            [["વ", "ૃ", "ક", "્", "ષ"], ["ઊ", "ગ", "્", "ય", "ુ", "ં"], ["D", "r"], ["S", "h", "a", "h"], ["ઙ"]]
+        ),
+    ], round_trip)
+
+    # Sentences written to a corpus file and read back through numpy.memmap.
+    run_tests([
+        (
+            "તમે ગુજરાતી શીખી રહ્યા છો. (,). ભાષા મીઠી છે!",
+            [[["ત", "મ", "ે"], ["ગ", "ુ", "જ", "ર", "ા", "ત", "ી"], ["શ", "ી", "ખ", "ી"], ["ર", "હ", "્", "ય", "ા"], ["છ", "ો"]],
+             [],
+             [["ભ", "ા", "ષ", "ા"], ["મ", "ી", "ઠ", "ી"], ["છ", "ે"]]]
+        ),
+    ], corpus_sentences)
+
+def iter_tokenize_spans(text):
+    records = AdvancedGujaratiTokenizer().iter_tokenize(io.StringIO(text), chunk_size=4)
+    return [(r['sentence'], r['span'], r['words'], r['word_spans']) for r in records]
+
+def capped_sentences(text):
+    records = AdvancedGujaratiTokenizer().iter_tokenize(io.StringIO(text), chunk_size=4, max_sentence=10)
+    return [(r['sentence'], r['span']) for r in records]
+
+def fed_sentences(text):
+    tokenizer = IncrementalSentenceTokenizer()
+    sentences = []
+    for start in range(0, len(text), 3):
+        sentences.extend(tokenizer.feed(text[start:start + 3]))
+    return sentences + tokenizer.flush()
+
+def round_trip(text):
+    tokenizer = AdvancedGujaratiTokenizer()
+    ids, offsets = tokenizer.encode(text)
+    return tokenizer.decode(ids, offsets)
+
+def corpus_sentences(text):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.bin")
+        write_corpus(io.StringIO(text), path, chunk_size=5)
+        corpus = TokenizedCorpus(path)
+        return [corpus[index] for index in range(len(corpus))]
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
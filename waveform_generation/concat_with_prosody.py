@@ -2,9 +2,6 @@ import os
 import re
 import string
 import numpy as np
-import librosa
-import soundfile as sf
-import scipy.signal
 from prosody.prosody import process_gujarati_text  
 
 class ConcatenativeSynthesizer:
@@ -51,6 +48,8 @@ class ConcatenativeSynthesizer:
             raise ValueError(f"No audio found for phoneme '{phoneme}'")
         
         filepath = os.path.join(self.phoneme_audio_dir, filename + '.wav')
+        # The audio libraries are imported on first use, so text-only callers never load them.
+        import librosa
         try:
             audio, sr = librosa.load(filepath, sr=self.sr)
             return audio, sr
@@ -66,6 +65,7 @@ class ConcatenativeSynthesizer:
         :param duration_factor: Duration modifier.
         :return: Modified audio segment.
         """
+        import librosa
         semitone_shift = 12 * np.log2(target_pitch) if target_pitch > 0 else 0
         pitched_audio = librosa.effects.pitch_shift(audio, sr=self.sr, n_steps=semitone_shift)
         rate = 1 / duration_factor if duration_factor != 0 else 1.0
@@ -102,6 +102,7 @@ class ConcatenativeSynthesizer:
         This example adds a simple reverb effect, amplitude modulation,
         and a low-pass filter.
         """
+        import scipy.signal
         ir_duration = 0.1  
         ir_length = int(self.sr * ir_duration)
         impulse_response = np.zeros(ir_length)
@@ -170,6 +171,8 @@ class ConcatenativeSynthesizer:
         :param output_path: File path to save synthesized audio.
         :param sentence_type: Sentence type for prosody.
         """
+        import librosa
+        import soundfile as sf
         synthesized_audio = self.synthesize_word(word, sentence_type)
         synthesized_audio = librosa.util.normalize(synthesized_audio)
         sf.write(output_path, synthesized_audio, self.sr)
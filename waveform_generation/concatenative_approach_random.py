@@ -1,8 +1,5 @@
 import os
 import numpy as np
-import soundfile as sf
-import librosa
-import scipy.signal
 
 class ConcatenativeSynthesizer:
     def __init__(self, phoneme_audio_dir):
@@ -31,6 +28,8 @@ class ConcatenativeSynthesizer:
             raise ValueError(f"No audio found for phoneme {phoneme}")
         
         filepath = os.path.join(self.phoneme_audio_dir, filename + '.wav')
+        # The audio libraries are imported on first use, so importing this module stays cheap.
+        import librosa
         
         try:
             audio, sr = librosa.load(filepath, sr=self.sr)
@@ -46,6 +45,7 @@ class ConcatenativeSynthesizer:
         :param semitones: Number of semitones to shift (can be positive or negative)
         :return: Pitch-shifted audio
         """
+        import librosa
         return librosa.effects.pitch_shift(audio, sr=self.sr, n_steps=semitones)
     
     def _apply_prosody_modifications(self, audio):
@@ -117,6 +117,8 @@ class ConcatenativeSynthesizer:
         :param word: Word to synthesize
         :param output_path: Path to save synthesized audio
         """
+        import librosa
+        import soundfile as sf
         synthesized_audio = self.synthesize_word(word)
         
         synthesized_audio = librosa.util.normalize(synthesized_audio)